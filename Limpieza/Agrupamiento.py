@@ -0,0 +1,274 @@
+import os
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from rapidfuzz import fuzz, process
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from Limpieza.Bloqueo import IndiceBloqueo, VERSION_LLAVES, MUESTRA_RECALL
+from Limpieza.Coincidencias import MAXIMO_CELDAS
+
+# === Agrupamiento de nombres sobre un grafo de similitud ===
+# Las similitudes se calculan una sola vez como lista de aristas (i, j, similitud)
+# con similitud >= umbral. Con bloqueo solo se comparan los pares que comparten una
+# llave de Bloqueo.py (puede perder pares: el recall de las aristas se mide sobre
+# una muestra de nombres y se registra en el log); sin bloqueo, el valor por
+# defecto, se recorre la matriz completa por lotes y los grupos son los de la
+# comparación de todos contra todos.
+# Sobre esas aristas se forman los grupos en una sola pasada:
+#   - MODO_LIDERES: cada nombre se une al primer grupo cuyo nombre clave (el
+#     primero del grupo) tiene similitud >= umbral con él; si no hay ninguno, abre
+#     un grupo nuevo. Es la regla que usaba LimpiezaNombresFinal.
+#   - MODO_COMPONENTES: componentes conexas (unión transitiva). Con umbrales bajos
+#     encadena nombres distintos en grupos muy grandes.
+#
+# El grafo se puede guardar con las aristas por encima del umbral más bajo de
+# interés; los agrupamientos a cualquier umbral mayor (o un barrido de umbrales)
+# se obtienen filtrando esas aristas, sin volver a calcular similitudes. Un grafo
+# guardado sirve para cualquier umbral mayor o igual al suyo, siempre que sea del
+# mismo conjunto de nombres y con el mismo bloqueo (y versión de sus llaves).
+MODO_LIDERES = "lideres"
+MODO_COMPONENTES = "componentes"
+COLUMNAS_GRAFO = ["Nombre A", "Nombre B", "Similitud"]
+
+
+def aristas_similitud(nombres, umbral, scorer=fuzz.ratio, bloqueo=False, workers=-1):
+    """
+    Devuelve un DataFrame (i, j, similitud) con los pares i < j de 'nombres' cuya
+    similitud es >= umbral. 'i' y 'j' son posiciones en la lista.
+    """
+    nombres = np.asarray(list(nombres), dtype=object)
+    origenes, destinos, similitudes = [], [], []
+
+    if bloqueo:
+        indice = IndiceBloqueo(nombres)
+        registrar_recall_aristas(nombres, umbral, indice, scorer=scorer, workers=workers)
+        for i, nombre in enumerate(nombres):
+            posiciones = indice.candidatos_de(nombre)
+            posiciones = posiciones[posiciones > i]
+            if len(posiciones) == 0:
+                continue
+            puntajes = process.cdist([nombre], nombres[posiciones], scorer=scorer, score_cutoff=umbral,
+                                     dtype=np.float32, workers=workers)[0]
+            encontrados = puntajes >= umbral
+            origenes.append(np.full(encontrados.sum(), i, dtype=np.int64))
+            destinos.append(posiciones[encontrados])
+            similitudes.append(puntajes[encontrados])
+    elif len(nombres):
+        lote = max(1, MAXIMO_CELDAS // len(nombres))
+        for inicio in range(0, len(nombres), lote):
+            matriz = process.cdist(nombres[inicio:inicio + lote], nombres, scorer=scorer, score_cutoff=umbral,
+                                   dtype=np.float32, workers=workers)
+            filas, columnas = np.nonzero(matriz >= umbral)
+            filas += inicio
+            superiores = columnas > filas
+            origenes.append(filas[superiores])
+            destinos.append(columnas[superiores])
+            similitudes.append(matriz[filas[superiores] - inicio, columnas[superiores]])
+
+    if not origenes:
+        return pd.DataFrame({"i": np.empty(0, np.int64), "j": np.empty(0, np.int64),
+                             "similitud": np.empty(0, np.float32)})
+    return pd.DataFrame({
+        "i": np.concatenate(origenes).astype(np.int64),
+        "j": np.concatenate(destinos).astype(np.int64),
+        "similitud": np.concatenate(similitudes),
+    })
+
+
+def registrar_recall_aristas(nombres, umbral, indice, scorer=fuzz.ratio, workers=-1, cantidad=MUESTRA_RECALL):
+    """
+    Recall de las aristas con bloqueo: para una muestra fija de nombres, fracción de
+    sus pares con similitud >= umbral (búsqueda exhaustiva) que comparten bloque.
+    Lo registra en el log y devuelve un dict.
+    """
+    nombres = np.asarray(nombres, dtype=object)
+    muestra = np.unique(np.linspace(0, len(nombres) - 1, min(cantidad, len(nombres))).astype(np.int64))
+    tamaño_lote = max(1, MAXIMO_CELDAS // max(1, len(nombres)))
+    pares = encontrados = comparaciones = 0
+    for inicio in range(0, len(muestra), tamaño_lote):
+        lote = muestra[inicio:inicio + tamaño_lote]
+        matriz = process.cdist(nombres[lote], nombres, scorer=scorer, score_cutoff=umbral,
+                               dtype=np.float32, workers=workers)
+        for fila, i in enumerate(lote):
+            vecinos = np.nonzero(matriz[fila] >= umbral)[0]
+            vecinos = vecinos[vecinos != i]
+            candidatos = indice.candidatos_de(nombres[i])
+            pares += len(vecinos)
+            encontrados += int(np.isin(vecinos, candidatos).sum())
+            comparaciones += len(candidatos)
+    reporte = {
+        "muestra": int(len(muestra)),
+        "umbral": umbral,
+        "pares_exhaustivos": pares,
+        "pares_bloqueo": encontrados,
+        "recall": encontrados / pares if pares else 1.0,
+        "fraccion_comparaciones": comparaciones / max(1, len(muestra) * len(nombres)),
+    }
+    logging.info(
+        f"Recall de las aristas con bloqueo (muestra de {reporte['muestra']} nombres, umbral {umbral}): "
+        f"{reporte['recall']:.4f} ({encontrados} de {pares} pares), "
+        f"{reporte['fraccion_comparaciones']:.2%} de las comparaciones"
+    )
+    return reporte
+
+
+def etiquetar_componentes(cantidad, aristas):
+    """
+    Etiqueta de grupo por nombre (componentes conexas del grafo de aristas). Los
+    grupos se numeran en el orden de aparición de su primer nombre.
+    """
+    if cantidad == 0:
+        return np.empty(0, dtype=np.int64)
+    grafo = coo_matrix(
+        (np.ones(len(aristas), dtype=np.int8), (aristas["i"].to_numpy(), aristas["j"].to_numpy())),
+        shape=(cantidad, cantidad),
+    )
+    _, etiquetas = connected_components(grafo, directed=False)
+    # Renumerar según el primer nombre de cada componente
+    _, primera_aparicion = np.unique(etiquetas, return_index=True)
+    orden = np.argsort(np.argsort(primera_aparicion))
+    return orden[etiquetas]
+
+
+def etiquetar_lideres(cantidad, aristas):
+    """
+    Etiqueta de grupo por nombre con la regla de líderes: recorriendo los nombres en
+    orden, cada uno se une al primer líder (nombre que abrió un grupo) con el que
+    tiene arista; si no tiene ninguno, se vuelve líder de un grupo nuevo.
+    """
+    grupo = np.arange(cantidad, dtype=np.int64)
+    es_lider = np.ones(cantidad, dtype=bool)
+    if len(aristas):
+        # Vecinos anteriores de cada nombre, ordenados por posición
+        orden = np.lexsort((aristas["i"].to_numpy(), aristas["j"].to_numpy()))
+        anteriores = aristas["i"].to_numpy()[orden]
+        destinos = aristas["j"].to_numpy()[orden]
+        nodos, inicios = np.unique(destinos, return_index=True)
+        finales = np.append(inicios[1:], len(destinos))
+        # Los nombres sin vecinos anteriores siempre son líderes
+        for j, inicio, fin in zip(nodos, inicios, finales):
+            vecinos = anteriores[inicio:fin]
+            lideres = vecinos[es_lider[vecinos]]
+            if len(lideres):
+                grupo[j] = lideres[0]
+                es_lider[j] = False
+    # Numerar los grupos en el orden de su líder
+    _, etiquetas = np.unique(grupo, return_inverse=True)
+    return etiquetas
+
+
+# Función para construir el grafo de similitud de una lista de nombres
+def construir_grafo(nombres, umbral_minimo, scorer=fuzz.ratio, bloqueo=False):
+    """
+    Aristas (Nombre A, Nombre B, Similitud) entre los nombres distintos de la lista
+    con similitud >= umbral_minimo. 'Nombre A' aparece antes que 'Nombre B'.
+    """
+    unicos = pd.unique(pd.Series(list(nombres), dtype=object))
+    aristas = aristas_similitud(unicos, umbral_minimo, scorer=scorer, bloqueo=bloqueo)
+    logging.info(f"Aristas de similitud >= {umbral_minimo}: {len(aristas)} entre {len(unicos)} nombres distintos")
+    return pd.DataFrame({
+        "Nombre A": unicos[aristas["i"].to_numpy()],
+        "Nombre B": unicos[aristas["j"].to_numpy()],
+        "Similitud": aristas["similitud"].to_numpy(),
+    })
+
+
+def _huella_nombres(nombres, bloqueo):
+    """
+    Identifica el conjunto de nombres y el bloqueo con los que se construyó el grafo
+    (el umbral se guarda aparte: el grafo sirve para cualquier umbral mayor).
+    """
+    llaves = f"bloqueo v{VERSION_LLAVES}" if bloqueo else "sin bloqueo"
+    texto = "\n".join(sorted(set(nombres))) + f"\n{llaves}"
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def obtener_grafo(nombres, umbral_minimo, ruta=None, bloqueo=False):
+    """
+    Devuelve el grafo de similitud de los nombres con las aristas >= umbral_minimo.
+    Si 'ruta' tiene un grafo guardado para el mismo conjunto de nombres y bloqueo, con
+    un umbral menor o igual, se lee y se filtra; si no, se construye y se guarda ahí
+    (Parquet).
+    """
+    huella = _huella_nombres(nombres, bloqueo)
+    if ruta and os.path.exists(ruta):
+        metadatos = pq.read_schema(ruta).metadata or {}
+        if (metadatos.get(b"huella", b"").decode() == huella
+                and float(metadatos.get(b"umbral_minimo", b"inf")) <= umbral_minimo):
+            logging.info(f"Usando el grafo de similitud guardado en {ruta}")
+            grafo = pd.read_parquet(ruta)
+            return grafo[grafo["Similitud"] >= umbral_minimo].reset_index(drop=True)
+
+    grafo = construir_grafo(nombres, umbral_minimo, bloqueo=bloqueo)
+    if ruta:
+        tabla = pa.Table.from_pandas(grafo, preserve_index=False)
+        tabla = tabla.replace_schema_metadata({
+            **(tabla.schema.metadata or {}),
+            b"huella": huella.encode(),
+            b"umbral_minimo": str(umbral_minimo).encode(),
+        })
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        pq.write_table(tabla, temporal)
+        os.replace(temporal, ruta)
+        logging.info(f"Grafo de similitud guardado en {ruta}")
+    return grafo
+
+
+def agrupar_desde_grafo(nombres, grafo, umbral, modo=MODO_LIDERES):
+    """
+    Agrupa los nombres (en el orden de la lista) usando solo las aristas del grafo con
+    similitud >= umbral entre nombres de la lista. Devuelve la etiqueta de cada nombre.
+    """
+    posiciones, unicos = pd.factorize(pd.Series(list(nombres), dtype=object))
+    indice = pd.Index(unicos)
+    aristas = grafo[grafo["Similitud"] >= umbral]
+    i = indice.get_indexer(aristas["Nombre A"])
+    j = indice.get_indexer(aristas["Nombre B"])
+    validas = (i >= 0) & (j >= 0)
+    i, j = i[validas], j[validas]
+    # Orientar cada arista según el orden de esta lista
+    aristas = pd.DataFrame({"i": np.minimum(i, j), "j": np.maximum(i, j), "similitud": aristas["Similitud"].to_numpy()[validas]})
+    if modo == MODO_COMPONENTES:
+        etiquetas = etiquetar_componentes(len(unicos), aristas)
+    else:
+        etiquetas = etiquetar_lideres(len(unicos), aristas)
+    return etiquetas[posiciones]
+
+
+def estadisticas_grupos(etiquetas, umbral=None):
+    """Resumen de tamaños de grupo de un agrupamiento."""
+    tamaños = np.bincount(etiquetas) if len(etiquetas) else np.empty(0, dtype=np.int64)
+    resumen = {
+        "nombres": int(len(etiquetas)),
+        "grupos": int(len(tamaños)),
+        "grupos_unitarios": int((tamaños == 1).sum()),
+        "nombres_agrupados": int(tamaños[tamaños > 1].sum()),
+        "tamaño_maximo": int(tamaños.max()) if len(tamaños) else 0,
+        "tamaño_medio": float(tamaños.mean()) if len(tamaños) else 0.0,
+        "tamaño_p99": float(np.percentile(tamaños, 99)) if len(tamaños) else 0.0,
+    }
+    if umbral is not None:
+        resumen = {"umbral": umbral, **resumen}
+    return resumen
+
+
+def barrido_umbrales(nombres, grafo, umbrales, modo=MODO_LIDERES):
+    """Estadísticas de tamaño de grupo para cada umbral, todas a partir del mismo grafo."""
+    return pd.DataFrame([
+        estadisticas_grupos(agrupar_desde_grafo(nombres, grafo, umbral, modo=modo), umbral)
+        for umbral in sorted(umbrales, reverse=True)
+    ])
+
+
+def agrupar(nombres, umbral, scorer=fuzz.ratio, bloqueo=False, modo=MODO_LIDERES):
+    """
+    Agrupa los nombres con similitud >= umbral según el modo. Los nombres repetidos se
+    comparan una sola vez y quedan en el mismo grupo. Devuelve la etiqueta de grupo de
+    cada nombre, numerada en el orden en que aparece el primer nombre de cada grupo.
+    """
+    grafo = construir_grafo(nombres, umbral, scorer=scorer, bloqueo=bloqueo)
+    return agrupar_desde_grafo(nombres, grafo, umbral, modo=modo)
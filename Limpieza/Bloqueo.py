@@ -0,0 +1,214 @@
+import re
+import json
+import logging
+import argparse
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+from Limpieza.Coincidencias import mejores_coincidencias
+from Limpieza.Normalizacion import nombre_sin_coma
+
+# Configuración de logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# === Índice de bloqueo ===
+# Antes de calcular similitudes, cada nombre se compara solo contra los
+# candidatos con los que comparte al menos una llave de bloqueo:
+#   - primer apellido (primera palabra que no es partícula) y segundo apellido,
+#   - iniciales de los dos primeros apellidos + banda de longitud,
+#   - llave fonética del primer apellido,
+#   - firma de palabras ordenadas (el mismo nombre con otro orden),
+#   - prefijo y sufijo de las letras del nombre (para nombres mal separados,
+#     como 'MARTINEZALEJANDRO', donde las palabras no sirven como llave).
+# Así el número de comparaciones crece con el tamaño de los bloques y no con el
+# producto de las dos listas. El reporte de recall compara contra la búsqueda
+# exhaustiva de Coincidencias.mejores_coincidencias; cuando una etapa usa el
+# bloqueo, el recall se mide sobre una muestra de MUESTRA_RECALL consultas y se
+# registra en el log.
+# Versión de las llaves de bloqueo: aumentarla al cambiar llaves_bloqueo o sus
+# parámetros, para que los grafos guardados con las llaves anteriores se reconstruyan
+VERSION_LLAVES = 1
+PARTICULAS = {"DE", "DEL", "LA", "LAS", "LOS", "Y", "E", "DA", "DI", "VAN", "VON", "MC", "MAC"}
+ANCHO_BANDA = 5
+LARGO_PREFIJO = 4
+LARGO_SUFIJO = 6
+MUESTRA_RECALL = 2000
+
+# Reemplazos de la llave fonética (español), en orden
+_REGLAS_FONETICAS = [
+    (re.compile(r"[^A-Z]"), ""),
+    (re.compile(r"QU"), "K"),
+    (re.compile(r"CH"), "X"),
+    (re.compile(r"LL"), "Y"),
+    (re.compile(r"C(?=[EI])"), "S"),
+    (re.compile(r"G(?=[EI])"), "J"),
+    (re.compile(r"C"), "K"),
+    (re.compile(r"Z"), "S"),
+    (re.compile(r"V"), "B"),
+    (re.compile(r"W"), "U"),
+    (re.compile(r"H"), ""),
+    (re.compile(r"Y"), "I"),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+
+def clave_fonetica(palabra):
+    """Llave fonética simplificada: primera letra y consonantes, tras igualar sonidos del español."""
+    for patron, reemplazo in _REGLAS_FONETICAS:
+        palabra = patron.sub(reemplazo, palabra)
+    if not palabra:
+        return ""
+    return palabra[0] + re.sub(r"(.)\1+", r"\1", re.sub(r"[AEIOU]", "", palabra[1:]))
+
+
+def llaves_bloqueo(nombre):
+    """Devuelve las llaves de bloqueo de un nombre ('APELLIDOS, NOMBRES' o sin coma)."""
+    palabras = nombre.upper().replace(",", " ").split()
+    if not palabras:
+        return []
+    apellidos = [palabra for palabra in palabras if palabra not in PARTICULAS] or palabras
+    banda = len("".join(palabras)) // ANCHO_BANDA
+    iniciales = "".join(apellido[0] for apellido in apellidos[:2])
+    llaves = [
+        f"p:{apellidos[0]}",
+        f"i:{iniciales}:{banda}",
+        f"f:{clave_fonetica(apellidos[0])}",
+        f"s:{' '.join(sorted(palabras))}",
+    ]
+    # Segundo apellido: recupera los errores en la primera letra del primero
+    if len(apellidos) > 2:
+        llaves.append(f"m:{apellidos[1]}")
+    letras = re.sub(r"[^A-Z]", "", "".join(palabras))
+    if letras:
+        llaves.append(f"a:{letras[:LARGO_PREFIJO]}")
+        llaves.append(f"z:{letras[-LARGO_SUFIJO:]}")
+    return llaves
+
+
+class IndiceBloqueo:
+    """Índice llave de bloqueo → posiciones de los candidatos que la tienen."""
+
+    def __init__(self, candidatos):
+        self.candidatos = list(candidatos)
+        bloques = defaultdict(list)
+        for posicion, candidato in enumerate(self.candidatos):
+            for llave in llaves_bloqueo(candidato):
+                bloques[llave].append(posicion)
+        self.bloques = {llave: np.array(posiciones, dtype=np.int64) for llave, posiciones in bloques.items()}
+
+    def candidatos_de(self, nombre):
+        """Posiciones (ordenadas) de los candidatos que comparten alguna llave con el nombre."""
+        bloques = [self.bloques[llave] for llave in llaves_bloqueo(nombre) if llave in self.bloques]
+        if not bloques:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(bloques))
+
+    def mejores_coincidencias(self, consultas, umbral=0, scorer=fuzz.ratio):
+        """
+        Igual que Coincidencias.mejores_coincidencias, pero cada consulta se compara
+        solo con los candidatos de sus bloques. Devuelve (índices, similitudes, comparaciones).
+        """
+        consultas = list(consultas)
+        indices = np.full(len(consultas), -1, dtype=np.int64)
+        puntajes = np.zeros(len(consultas), dtype=np.float32)
+        comparaciones = 0
+        resultados = {}
+        for i, consulta in enumerate(consultas):
+            if consulta not in resultados:
+                posiciones = self.candidatos_de(consulta)
+                comparaciones += len(posiciones)
+                mejor = process.extractOne(
+                    consulta, [self.candidatos[p] for p in posiciones],
+                    scorer=scorer, score_cutoff=umbral,
+                )
+                # extractOne sobre una lista devuelve (candidato, similitud, posición en la lista)
+                resultados[consulta] = (posiciones[mejor[2]], mejor[1]) if mejor else (-1, 0)
+            indices[i], puntajes[i] = resultados[consulta]
+        return indices, puntajes, comparaciones
+
+
+# Función para medir el recall del bloqueo contra la búsqueda exhaustiva
+def reporte_recall(consultas, candidatos, umbral, scorer=fuzz.ratio, indice=None):
+    """
+    Compara el bloqueo contra la búsqueda exhaustiva y devuelve un dict con:
+    consultas con coincidencia en la búsqueda exhaustiva, cuántas obtienen el mismo
+    candidato con bloqueo (recall), cuántas obtienen la misma similitud y la
+    fracción de comparaciones que se hacen respecto a la búsqueda exhaustiva.
+    """
+    consultas = list(dict.fromkeys(consultas))
+    candidatos = list(candidatos)
+    exhaustivo, puntaje_exhaustivo = mejores_coincidencias(consultas, candidatos, umbral, scorer=scorer)
+    indice = indice or IndiceBloqueo(candidatos)
+    bloqueado, puntaje_bloqueado, comparaciones = indice.mejores_coincidencias(consultas, umbral, scorer=scorer)
+
+    con_coincidencia = exhaustivo >= 0
+    total = int(con_coincidencia.sum())
+    conservadas = int((con_coincidencia & (bloqueado == exhaustivo)).sum())
+    misma_similitud = int((con_coincidencia & np.isclose(puntaje_exhaustivo, puntaje_bloqueado)).sum())
+    return {
+        "consultas": len(consultas),
+        "candidatos": len(candidatos),
+        "umbral": umbral,
+        "coincidencias_exhaustivas": total,
+        "coincidencias_bloqueo": conservadas,
+        "recall": conservadas / total if total else 1.0,
+        "misma_similitud": misma_similitud / total if total else 1.0,
+        "fraccion_comparaciones": comparaciones / max(1, len(consultas) * len(candidatos)),
+    }
+
+
+def muestra_consultas(consultas, cantidad=MUESTRA_RECALL):
+    """Muestra fija (espaciada de manera uniforme) de las consultas distintas."""
+    unicas = list(dict.fromkeys(consultas))
+    if len(unicas) <= cantidad:
+        return unicas
+    return [unicas[i] for i in np.linspace(0, len(unicas) - 1, cantidad).astype(np.int64)]
+
+
+def registrar_recall(consultas, candidatos, umbral, scorer=fuzz.ratio, indice=None, cantidad=MUESTRA_RECALL):
+    """Mide el recall del bloqueo sobre una muestra de las consultas y lo registra en el log."""
+    reporte = reporte_recall(muestra_consultas(consultas, cantidad), candidatos, umbral, scorer=scorer, indice=indice)
+    logging.info(
+        f"Recall del bloqueo (muestra de {reporte['consultas']} consultas, umbral {umbral}): "
+        f"{reporte['recall']:.4f} ({reporte['coincidencias_bloqueo']} de {reporte['coincidencias_exhaustivas']}), "
+        f"{reporte['fraccion_comparaciones']:.2%} de las comparaciones"
+    )
+    return reporte
+
+
+# Función para buscar coincidencias con o sin bloqueo
+def buscar_coincidencias(consultas, candidatos, umbral, bloqueo=False, scorer=fuzz.ratio, descripcion=None):
+    """
+    Mejor candidato de cada consulta, como Coincidencias.mejores_coincidencias:
+    devuelve (índices, similitudes). Con bloqueo cada consulta se compara solo con
+    los candidatos de sus bloques y se registra el recall medido sobre una muestra.
+    """
+    if not bloqueo:
+        return mejores_coincidencias(consultas, candidatos, umbral, scorer=scorer, descripcion=descripcion)
+    consultas, candidatos = list(consultas), list(candidatos)
+    indice = IndiceBloqueo(candidatos)
+    indices, puntajes, comparaciones = indice.mejores_coincidencias(consultas, umbral, scorer=scorer)
+    logging.info(f"Comparaciones con bloqueo: {comparaciones} de {len(set(consultas)) * len(candidatos)}")
+    registrar_recall(consultas, candidatos, umbral, scorer=scorer, indice=indice)
+    return indices, puntajes
+
+
+def _leer_nombres(ruta):
+    # Misma normalización que LimpiezaNombres antes de buscar coincidencias
+    return [nombre_sin_coma(nombre) for nombre in pd.read_csv(ruta)["NOMBRE DEL INVESTIGADOR"].dropna().astype(str)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall del índice de bloqueo contra la búsqueda exhaustiva.")
+    parser.add_argument("consultas", help="CSV con la columna 'NOMBRE DEL INVESTIGADOR' a buscar")
+    parser.add_argument("candidatos", help="CSV con la columna 'NOMBRE DEL INVESTIGADOR' de candidatos")
+    parser.add_argument("--umbral", type=float, default=85)
+    args = parser.parse_args()
+
+    reporte = reporte_recall(_leer_nombres(args.consultas), _leer_nombres(args.candidatos), args.umbral)
+    print(json.dumps(reporte, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
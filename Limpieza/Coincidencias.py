@@ -0,0 +1,58 @@
+import numpy as np
+from tqdm import tqdm
+from rapidfuzz import fuzz, process
+
+# === Coincidencias por lotes ===
+# En lugar de una tarea por nombre (que copia la lista completa de candidatos a
+# cada proceso), las similitudes se calculan con process.cdist: una matriz
+# consultas × candidatos por lote, calculada en C++ con varios hilos sobre la
+# misma lista de candidatos. El tamaño del lote se ajusta para que la matriz no
+# pase de MAXIMO_CELDAS valores (float32), sin importar cuántos candidatos haya.
+MAXIMO_CELDAS = 25_000_000
+
+
+def mejores_coincidencias(consultas, candidatos, umbral=0, scorer=fuzz.ratio, workers=-1, descripcion=None):
+    """
+    Busca el candidato más parecido a cada consulta.
+
+    Devuelve dos arreglos alineados con 'consultas': el índice del mejor candidato
+    (-1 si ninguno alcanza el umbral) y su similitud. En empates gana el primer
+    candidato, como en process.extractOne. Las consultas repetidas se calculan una
+    sola vez. Con 'descripcion' se muestra una barra de progreso (consultas/s).
+    """
+    consultas = list(consultas)
+    candidatos = list(candidatos)
+
+    # Consultas distintas y posición de cada consulta original entre ellas
+    unicas = list(dict.fromkeys(consultas))
+    posicion = {consulta: i for i, consulta in enumerate(unicas)}
+    indices = np.full(len(unicas), -1, dtype=np.int64)
+    puntajes = np.zeros(len(unicas), dtype=np.float32)
+
+    if unicas and candidatos:
+        lote = max(1, MAXIMO_CELDAS // len(candidatos))
+        progreso = tqdm(total=len(unicas), desc=descripcion, unit="nombres", disable=descripcion is None)
+        for inicio in range(0, len(unicas), lote):
+            # Los puntajes menores a score_cutoff quedan en 0
+            matriz = process.cdist(
+                unicas[inicio:inicio + lote], candidatos, scorer=scorer,
+                score_cutoff=umbral, dtype=np.float32, workers=workers,
+            )
+            mejores = matriz.argmax(axis=1)
+            valores = matriz[np.arange(len(mejores)), mejores]
+            encontrados = valores >= umbral
+            fin = inicio + len(mejores)
+            indices[inicio:fin] = np.where(encontrados, mejores, -1)
+            puntajes[inicio:fin] = np.where(encontrados, valores, 0)
+            progreso.update(len(mejores))
+        progreso.close()
+
+    orden = np.fromiter((posicion[consulta] for consulta in consultas), dtype=np.int64, count=len(consultas))
+    return indices[orden], puntajes[orden]
+
+
+def nombres_sin_coincidencia(nombres, candidatos, umbral, scorer=fuzz.ratio, workers=-1):
+    """Devuelve, en su orden original, los nombres sin ningún candidato con similitud >= umbral."""
+    nombres = list(nombres)
+    indices, _ = mejores_coincidencias(nombres, candidatos, umbral, scorer=scorer, workers=workers)
+    return [nombre for nombre, indice in zip(nombres, indices) if indice < 0]
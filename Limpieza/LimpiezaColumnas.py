@@ -1,6 +1,12 @@
 import os
-import pandas as pd
+import json
+import hashlib
 import logging
+import argparse
+import csv
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
 
 # Configuración básica del logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -9,6 +15,8 @@ logger = logging.getLogger(__name__)
 # Ruta de las carpetas
 ruta_carpeta = "dataset"
 ruta_guardado = "datasetMD"
+# Manifiesto con el hash de cada Excel ya convertido
+ARCHIVO_MANIFIESTO = "manifiesto_conversion.json"
 
 # Crear la carpeta de salida si no existe
 os.makedirs(ruta_guardado, exist_ok=True)
@@ -96,54 +104,256 @@ def procesar_archivo(df: pd.DataFrame, año: int) -> pd.DataFrame:
         df = df.drop(columns=[col for col in columnas_eliminar if col in df.columns], errors="ignore")
     return df
 
-# Funcion Principal
-def main():
+# Función para obtener el hash de un archivo
+def hash_archivo(ruta: str) -> str:
+    """SHA-256 del contenido del archivo."""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
 
-    # Procesar los archivos
-    for archivo in os.listdir(ruta_carpeta):
-        if archivo.startswith("Investigadores_vigentes_20") and archivo.endswith(".xlsx"):
-            ruta_archivo = os.path.join(ruta_carpeta, archivo)
+def leer_manifiesto(ruta: str) -> dict:
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-            try:
-                # Extraer el año del nombre del archivo
-                año = int(archivo.split("_")[-1].split(".")[0])
-                logger.info(f"Procesando archivo: {archivo}, Año: {año}")
+def guardar_manifiesto(manifiesto: dict, ruta: str) -> None:
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta)
 
-                # Leer archivo en un DataFrame
-                df = pd.read_excel(ruta_archivo)
+# Función para convertir un archivo de un año (se ejecuta en un proceso del pool)
+def convertir_archivo(ruta_archivo: str, año: int, ruta_guardar: str) -> str:
+    """Lee el Excel de un año, aplica los cambios de columnas y lo guarda como CSV."""
+    logger.info(f"Procesando archivo: {os.path.basename(ruta_archivo)}, Año: {año}")
 
-                # Cambiar los nombres de las columnas
-                df = cambiar_nombres_columnas(df, columnas_cambio)
+    # Leer archivo en un DataFrame
+    df = pd.read_excel(ruta_archivo)
 
-                # Agregar columnas faltantes si es necesario
-                if str(año) in columnas_faltantes_por_año:
-                    columnas_faltantes = columnas_faltantes_por_año[str(año)]
-                    df = agregar_columnas_faltantes(df, columnas_faltantes)
+    # Cambiar los nombres de las columnas
+    df = cambiar_nombres_columnas(df, columnas_cambio)
 
-                # Mover columnas en 2021 y 2022
-                if año in [2021, 2022]:
-                    for columna, destino in columnas_a_mover.items():
-                        df = mover_columna(df, columna, destino)
+    # Agregar columnas faltantes si es necesario
+    if str(año) in columnas_faltantes_por_año:
+        columnas_faltantes = columnas_faltantes_por_año[str(año)]
+        df = agregar_columnas_faltantes(df, columnas_faltantes)
 
-                # Procesar el archivo según el año
-                df = procesar_archivo(df, año)
+    # Mover columnas en 2021 y 2022
+    if año in [2021, 2022]:
+        for columna, destino in columnas_a_mover.items():
+            df = mover_columna(df, columna, destino)
 
-                # Guardar el archivo procesado
-                nombre_salida = f"{archivo.replace('.xlsx', '.csv')}"
-                ruta_guardar = os.path.join(ruta_guardado, nombre_salida)
-                df.to_csv(ruta_guardar, index=False, encoding='utf-8-sig')
-                logger.info(f"Archivo procesado y guardado: {nombre_salida}")
-            except Exception as e:
-                logger.error(f"Error procesando {archivo}: {e}")
+    # Procesar el archivo según el año
+    df = procesar_archivo(df, año)
 
-    # Comparar columnas entre archivos
+    # Guardar el archivo procesado
+    df.to_csv(ruta_guardar, index=False, encoding='utf-8-sig')
+    return ruta_guardar
+
+# ----------------------- Lectura en streaming ---------------------------------
+# En modo streaming el Excel se recorre fila por fila (openpyxl en modo
+# read_only) y el CSV se escribe por bloques, de modo que la memoria no crece
+# con el tamaño del padrón. El orden y nombre de las columnas de salida se
+# obtiene aplicando los mismos pasos de arriba a un DataFrame vacío con el
+# encabezado del archivo; las columnas descartadas no se llegan a leer.
+# Como pandas decide el tipo de cada columna con todos sus valores (fechas,
+# números con nulos), antes de escribir se hace una primera pasada sobre las
+# celdas para que el CSV sea idéntico byte a byte al de convertir_archivo.
+TAMAÑO_BLOQUE = 10000
+
+def _encabezado_excel(fila: tuple) -> list:
+    """Nombres de columna como los genera pd.read_excel (vacías → 'Unnamed: i', repetidas → 'X.1')."""
+    # Las celdas vacías al final del encabezado no son columnas
+    fila = list(fila)
+    while fila and fila[-1] is None:
+        fila.pop()
+    encabezado, vistos = [], {}
+    for i, valor in enumerate(fila):
+        nombre = f"Unnamed: {i}" if valor is None else str(valor)
+        if nombre in vistos:
+            vistos[nombre] += 1
+            nombre = f"{nombre}.{vistos[nombre]}"
+        else:
+            vistos[nombre] = 0
+        encabezado.append(nombre)
+    return encabezado
+
+def plan_columnas(encabezado: list, año: int) -> list:
+    """
+    Devuelve [(columna de salida, posición en el Excel o None)] aplicando los pasos
+    de conversión a un DataFrame vacío. None indica una columna agregada: el AÑO
+    (se llena con el año) o una columna faltante (queda vacía).
+    """
+    df = pd.DataFrame(columns=encabezado)
+    df = cambiar_nombres_columnas(df, columnas_cambio)
+    if str(año) in columnas_faltantes_por_año:
+        df = agregar_columnas_faltantes(df, columnas_faltantes_por_año[str(año)])
+    if año in [2021, 2022]:
+        for columna, destino in columnas_a_mover.items():
+            df = mover_columna(df, columna, destino)
+    df = procesar_archivo(df, año)
+
+    renombradas = [columnas_cambio.get(columna, columna) for columna in encabezado]
+    posiciones = {}
+    for i, columna in enumerate(renombradas):
+        posiciones.setdefault(columna, i)
+    plan = []
+    for columna in df.columns:
+        if columna == "AÑO" and año > 2014:
+            plan.append((columna, None))
+        else:
+            plan.append((columna, posiciones.get(columna)))
+    return plan
+
+# Textos que pd.read_excel lee como nulos (valores por defecto de na_values)
+VALORES_NULOS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+}
+
+def _es_nulo(valor) -> bool:
+    return valor is None or (isinstance(valor, str) and valor in VALORES_NULOS)
+
+# Rango de fechas que cabe en datetime64[ns]; fuera de él pandas deja la columna como object
+_FECHA_MINIMA = pd.Timestamp.min.to_pydatetime(warn=False)
+_FECHA_MAXIMA = pd.Timestamp.max.to_pydatetime(warn=False)
+
+# Formato de una columna numérica que pandas lee como float64
+FLOTANTE = "float"
+
+def _es_numero(valor) -> bool:
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+def formatos_columnas(filas, posiciones: list) -> dict:
+    """
+    Recorre las filas de datos y devuelve, por posición de columna, cómo escribe
+    pandas sus valores en el CSV cuando eso depende de toda la columna:
+      - Números: si hay algún nulo o algún decimal, pandas lee la columna como
+        float64 y escribe también los enteros con '.0' (FLOTANTE).
+      - Fechas: si todos los valores no vacíos son fechas dentro del rango de
+        datetime64[ns], escribe solo la fecha cuando todas son medianoche (-1) o la
+        hora con 0, 3 o 6 decimales en los segundos según la mayor precisión de la
+        columna. Si no, la columna queda como object y cada fecha se escribe con
+        str() (None).
+    Las filas vacías intermedias cuentan como nulos; las del final no.
+    """
+    estado = {}
+    usadas = [posicion for posicion in dict.fromkeys(posiciones) if posicion is not None]
+    con_nulos = set()
+    vacias = 0
+    for fila in filas:
+        # Como en pd.read_excel, solo las filas sin ninguna celda son filas vacías
+        if all(valor is None for valor in fila):
+            vacias += 1
+            continue
+        if vacias:
+            con_nulos.update(usadas)
+            vacias = 0
+        for posicion in usadas:
+            valor = fila[posicion] if posicion < len(fila) else None
+            if _es_nulo(valor):
+                con_nulos.add(posicion)
+                continue
+            columna = estado.setdefault(posicion, {"fechas": False, "numeros": False, "decimal": False,
+                                                   "object": False, "hora": False, "decimales": 0})
+            if isinstance(valor, datetime):
+                columna["fechas"] = True
+                columna["object"] |= not (_FECHA_MINIMA <= valor <= _FECHA_MAXIMA)
+                columna["hora"] |= valor.time() != datetime.min.time()
+                decimales = 6 if valor.microsecond % 1000 else 3 if valor.microsecond else 0
+                columna["decimales"] = max(columna["decimales"], decimales)
+            elif _es_numero(valor):
+                columna["numeros"] = True
+                columna["decimal"] |= isinstance(valor, float) and not valor.is_integer()
+            else:
+                columna["object"] = True
+
+    formatos = {}
+    for posicion, columna in estado.items():
+        if columna["fechas"]:
+            if columna["object"] or columna["numeros"]:
+                formatos[posicion] = None
+            else:
+                formatos[posicion] = columna["decimales"] if columna["hora"] else -1
+        elif columna["numeros"] and not columna["object"] and (columna["decimal"] or posicion in con_nulos):
+            formatos[posicion] = FLOTANTE
+    return formatos
+
+def _texto_fecha(valor: datetime, decimales) -> str:
+    """Fecha como la escribe pandas (ver formatos_columnas)."""
+    if decimales is None:
+        return str(valor)
+    if decimales < 0:
+        return valor.strftime('%Y-%m-%d')
+    texto = valor.strftime('%Y-%m-%d %H:%M:%S')
+    return texto + f".{valor.microsecond:06d}"[:decimales + 1] if decimales else texto
+
+def _valor_celda(valor, formato=None):
+    """Formato de la celda en el CSV: nulos vacíos, enteros sin decimales y números y fechas según su columna."""
+    if _es_nulo(valor):
+        return ''
+    if formato == FLOTANTE and _es_numero(valor):
+        return float(valor)
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    if isinstance(valor, datetime):
+        return _texto_fecha(valor, formato)
+    return valor
+
+def convertir_archivo_streaming(ruta_archivo: str, año: int, ruta_guardar: str) -> str:
+    """Versión en streaming de convertir_archivo: memoria constante sin importar el número de filas."""
+    # openpyxl solo se necesita en modo streaming (pd.read_excel lo carga por su cuenta)
+    from openpyxl import load_workbook
+    logger.info(f"Procesando archivo (streaming): {os.path.basename(ruta_archivo)}, Año: {año}")
+    libro = load_workbook(ruta_archivo, read_only=True, data_only=True)
+    try:
+        filas = libro.worksheets[0].iter_rows(values_only=True)
+        plan = plan_columnas(_encabezado_excel(next(filas, ())), año)
+        posiciones = [posicion for _, posicion in plan]
+        año_fijo = [columna == "AÑO" and posicion is None for columna, posicion in plan]
+
+        # Primera pasada: formato de las columnas cuyo tipo en pandas depende de todos sus valores
+        formatos = formatos_columnas(libro.worksheets[0].iter_rows(min_row=2, values_only=True), posiciones)
+
+        temporal = f"{ruta_guardar}.tmp"
+        with open(temporal, 'w', encoding='utf-8-sig', newline='') as f:
+            escritor = csv.writer(f, lineterminator='\n')
+            escritor.writerow([columna for columna, _ in plan])
+            bloque = []
+            vacias = 0
+            for fila in filas:
+                # Como en pd.read_excel: las filas vacías intermedias se conservan y las finales no
+                if all(valor is None for valor in fila):
+                    vacias += 1
+                    continue
+                for _ in range(vacias):
+                    bloque.append([año if fijo else '' for fijo in año_fijo])
+                vacias = 0
+                bloque.append([
+                    año if fijo else ('' if posicion is None or posicion >= len(fila) else _valor_celda(fila[posicion], formatos.get(posicion)))
+                    for posicion, fijo in zip(posiciones, año_fijo)
+                ])
+                if len(bloque) >= TAMAÑO_BLOQUE:
+                    escritor.writerows(bloque)
+                    bloque = []
+            escritor.writerows(bloque)
+        os.replace(temporal, ruta_guardar)
+    finally:
+        libro.close()
+    return ruta_guardar
+
+# Función para comparar los esquemas de los CSV (solo se leen los encabezados)
+def comparar_esquemas(carpeta: str) -> bool:
     columnas_archivos = {}
-    for archivo in os.listdir(ruta_guardado):
+    for archivo in sorted(os.listdir(carpeta)):
         if archivo.endswith(".csv"):
-            ruta_archivo = os.path.join(ruta_guardado, archivo)
+            ruta_archivo = os.path.join(carpeta, archivo)
             try:
-                df = pd.read_csv(ruta_archivo)
-                columnas_archivos[archivo] = list(df.columns)
+                columnas_archivos[archivo] = list(pd.read_csv(ruta_archivo, nrows=0, encoding='utf-8-sig').columns)
             except Exception as e:
                 logger.error(f"Error leyendo {archivo}: {e}")
 
@@ -151,10 +361,69 @@ def main():
     nombres_columnas_unicos = set(tuple(columnas) for columnas in columnas_archivos.values())
     if len(nombres_columnas_unicos) == 1:
         logger.info("✅ Todos los archivos tienen las mismas columnas.")
-    else:
-        logger.warning("❌ Los archivos tienen diferentes esquemas de columnas.")
-        for archivo, columnas in columnas_archivos.items():
-            logger.info(f"{archivo}: {columnas}")
+        return True
+    logger.warning("❌ Los archivos tienen diferentes esquemas de columnas.")
+    for archivo, columnas in columnas_archivos.items():
+        logger.info(f"{archivo}: {columnas}")
+    return False
+
+# Funcion Principal
+def main(procesos: int = None, completo: bool = False, streaming: bool = False):
+    """
+    Convierte a CSV los Excel de cada año en un pool de procesos (un año por tarea).
+    Los años cuyo Excel no cambió desde la última ejecución (mismo hash en el
+    manifiesto y CSV de salida presente) se omiten, salvo con completo=True.
+    Con streaming=True cada Excel se lee fila por fila (memoria constante).
+    """
+    convertir = convertir_archivo_streaming if streaming else convertir_archivo
+    ruta_manifiesto = os.path.join(ruta_guardado, ARCHIVO_MANIFIESTO)
+    manifiesto = {} if completo else leer_manifiesto(ruta_manifiesto)
+
+    # Archivos pendientes: nuevos o con contenido distinto al registrado
+    pendientes = {}
+    for archivo in sorted(os.listdir(ruta_carpeta)):
+        if archivo.lower().startswith("investigadores_vigentes_20") and archivo.endswith(".xlsx"):
+            ruta_archivo = os.path.join(ruta_carpeta, archivo)
+            try:
+                # Extraer el año del nombre del archivo
+                año = int(archivo.split("_")[-1].split(".")[0])
+            except ValueError:
+                logger.error(f"No se pudo obtener el año de {archivo}")
+                continue
+            # Mismo nombre de salida sin importar las mayúsculas del Excel
+            ruta_guardar = os.path.join(ruta_guardado, f"Investigadores_vigentes_{año}.csv")
+            sha = hash_archivo(ruta_archivo)
+            entrada = manifiesto.get(archivo)
+            if entrada and entrada['sha256'] == sha and os.path.exists(ruta_guardar):
+                continue
+            pendientes[archivo] = (ruta_archivo, año, ruta_guardar, sha)
+
+    logger.info(f"Archivos a convertir: {len(pendientes)}")
+    if pendientes:
+        procesos = procesos or min(len(pendientes), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            tareas = {
+                pool.submit(convertir, ruta_archivo, año, ruta_guardar): archivo
+                for archivo, (ruta_archivo, año, ruta_guardar, _) in pendientes.items()
+            }
+            for tarea in as_completed(tareas):
+                archivo = tareas[tarea]
+                try:
+                    ruta_guardar = tarea.result()
+                    manifiesto[archivo] = {'sha256': pendientes[archivo][3], 'salida': os.path.basename(ruta_guardar)}
+                    logger.info(f"Archivo procesado y guardado: {os.path.basename(ruta_guardar)}")
+                except Exception as e:
+                    manifiesto.pop(archivo, None)
+                    logger.error(f"Error procesando {archivo}: {e}")
+        guardar_manifiesto(manifiesto, ruta_manifiesto)
+
+    # Comparar columnas entre archivos
+    comparar_esquemas(ruta_guardado)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Convierte los Excel del SNII a CSV.")
+    parser.add_argument('--procesos', type=int, default=None, help="Número de procesos (por defecto, uno por año hasta el número de núcleos).")
+    parser.add_argument('--completo', action='store_true', help="Convertir todos los años aunque no hayan cambiado.")
+    parser.add_argument('--streaming', action='store_true', help="Leer los Excel fila por fila (para equipos con poca memoria).")
+    args = parser.parse_args()
+    main(args.procesos, args.completo, args.streaming)
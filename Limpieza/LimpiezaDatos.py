@@ -1,8 +1,10 @@
 import os
 import re
 import logging
-import unicodedata
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from Limpieza.Normalizacion import limpiar_nombre, normalizar_nombre, normalizar_lista, normalizar_serie
 
 # Configuración de logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -10,58 +12,40 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 # Configuración
 CONFIG = {
     "directorio_datasets": "datasetMD",
-    "archivo_salida": "datasetMD.csv",
+    "archivo_salida": "datasetMD.parquet",
     "archivo_nombres": "Limpieza/nombres_investigadores.csv",
     "archivo_nombres_limpios": "Limpieza/Nombres_Limpios.csv",
     "archivo_nombres_descartados": "Limpieza/Nombres_Descartados.csv",
 }
 
-# Diccionario de equivalencias
-equivalencias = {
-    "Ð": "Ñ",
-    ";": "Ñ",
-    "▄": "Ü",
-    "_": "Ü",
-    "Þ": "Ü",
-    "0": "O",
-    "¬": ".",
-    "╚": "È",
-    "+": "È",
-    "¦": "É",
-    "Ì": "Í",
-    "Ò": "Ó",
-    "/": " ",
-    "\\": "Ü",
-    "(": "",
-    ")": "",
-    "[": "",
-    "]": "",
-    "*": "",
-    "7": "",
-    ":": ""
-}
+# Esquema del archivo combinado: los padrones se leen como texto y cada bloque se
+# convierte a estos tipos antes de escribirse, así las etapas siguientes no tienen
+# que volver a inferirlos. Las columnas con pocos valores distintos se guardan
+# como categorías (diccionario) y el CVU como entero con nulos. Las columnas de
+# los padrones que no están en el esquema se agregan al final como texto.
+TAMAÑO_BLOQUE = 50000
+_CATEGORIA = pa.dictionary(pa.int32(), pa.string())
+ESQUEMA_COMBINADO = pa.schema([
+    ("AÑO", pa.int16()),
+    ("CVU", pa.int64()),
+    ("NOBILIS", _CATEGORIA),
+    ("NOMBRE DEL INVESTIGADOR", pa.string()),
+    ("NIVEL", _CATEGORIA),
+    ("FECHA DE INICIO DE VIGENCIA", pa.string()),
+    ("FECHA DE FIN DE VIGENCIA", pa.string()),
+    ("ÁREA DEL CONOCIMIENTO", _CATEGORIA),
+    ("DISCIPLINA", _CATEGORIA),
+    ("SUBDISCIPLINA", pa.string()),
+    ("ESPECIALIDAD", pa.string()),
+    ("INSTITUCIÓN DE ADSCRIPCIÓN", _CATEGORIA),
+    ("DEPENDENCIA", pa.string()),
+    ("ENTIDAD FEDERATIVA", _CATEGORIA),
+    ("PAÍS", _CATEGORIA),
+])
+# Los enteros se leen como tipos con nulos de pandas (no como float)
+TIPOS_PANDAS = {pa.int16(): pd.Int16Dtype(), pa.int64(): pd.Int64Dtype()}
 
 # === Funciones de utilidad ===
-def limpiar_nombre(nombre):
-    """Limpia y normaliza un nombre."""
-    if pd.notna(nombre) and isinstance(nombre, str):
-        nombre = normalizar_nombre(nombre) # Normalizar caracteres
-        nombre = re.sub(r'\s*,\s*', ',', nombre.strip())
-        nombre = re.sub(r'^-', '', nombre)  # Quitar guiones iniciales
-        return nombre
-    return None
-
-def normalizar_nombre(nombre):
-    """Normaliza caracteres en un nombre."""
-    if pd.notna(nombre) and isinstance(nombre, str):
-        nombre = unicodedata.normalize('NFKD', nombre).encode('ascii', 'ignore').decode('ascii')
-        nombre = nombre.replace("Ñ", "N")
-        # Aplicar equivalencias del diccionario
-        for caracter, reemplazo in equivalencias.items():
-            nombre = nombre.replace(caracter, reemplazo)
-        return nombre
-    return None
-
 def verificar_separacion(nombre):
     """Verifica si un nombre tiene separación por coma."""
     return isinstance(nombre, str) and ',' in nombre
@@ -76,10 +60,45 @@ def verifica_caracteres(nombre):
 def procesar_dataframe(df):
     """Limpia nombres en el DataFrame."""
     if "NOMBRE DEL INVESTIGADOR" in df.columns:
-        df["NOMBRE DEL INVESTIGADOR"] = df["NOMBRE DEL INVESTIGADOR"].apply(limpiar_nombre)
+        # Los nombres se repiten entre años: solo se limpia cada nombre distinto
+        df["NOMBRE DEL INVESTIGADOR"] = normalizar_serie(df["NOMBRE DEL INVESTIGADOR"], limpiar_nombre)
     return df
 
 
+def esquema_archivos(archivos):
+    """Esquema combinado más las columnas de los archivos que no están en él (como texto)."""
+    extras = []
+    for archivo in archivos:
+        for columna in pd.read_csv(archivo, dtype=str, nrows=0).columns:
+            if columna not in ESQUEMA_COMBINADO.names and columna not in extras:
+                extras.append(columna)
+    if extras:
+        logging.warning(f"Columnas fuera del esquema combinado (se guardan como texto): {extras}")
+    return pa.schema(list(ESQUEMA_COMBINADO) + [pa.field(columna, pa.string()) for columna in extras])
+
+
+def tipar_bloque(df, esquema=ESQUEMA_COMBINADO):
+    """Convierte un bloque leído como texto a una tabla Arrow con el esquema dado."""
+    extras = [col for col in df.columns if col not in esquema.names]
+    if extras:
+        raise ValueError(f"Columnas fuera del esquema del archivo combinado: {extras}")
+    faltantes = [col for col in esquema.names if col not in df.columns]
+    df = df.reindex(columns=esquema.names)
+    # Las columnas que el archivo no trae quedan como texto nulo (reindex las crea como float)
+    df[faltantes] = df[faltantes].astype(object)
+    df["AÑO"] = pd.to_numeric(df["AÑO"], errors="coerce").astype("Int16")
+    # CVU no numérico ('-', notas al pie del padrón) queda como nulo
+    cvu = pd.to_numeric(df["CVU"], errors="coerce")
+    df["CVU"] = cvu.where(cvu % 1 == 0).astype("Int64")
+    return pa.Table.from_pandas(df, schema=esquema, preserve_index=False)
+
+
+def leer_combinado(ruta=None, columnas=None):
+    """Lee el archivo combinado con sus tipos (categorías, AÑO y CVU enteros con nulos)."""
+    tabla = pq.read_table(ruta or CONFIG["archivo_salida"], columns=columnas)
+    return tabla.to_pandas(types_mapper=TIPOS_PANDAS.get)
+
+
 def guardar_archivo(df, ruta, mensaje):
     """Guarda un DataFrame en un archivo CSV."""
     df.to_csv(ruta, index=False)
@@ -88,25 +107,40 @@ def guardar_archivo(df, ruta, mensaje):
 
 # Proceso principal
 def combinar_archivos():
-    """Combina todos los archivos CSV del directorio."""
+    """
+    Combina todos los archivos CSV del directorio en un solo Parquet (con todas las
+    columnas de los archivos). Cada archivo se lee por bloques y se escribe en cuanto
+    se limpia, por lo que la memoria no crece con el número de años. Devuelve un
+    DataFrame con los nombres únicos.
+    """
     ruta_directorio = CONFIG["directorio_datasets"]
-    archivos = [os.path.join(ruta_directorio, f) for f in os.listdir(ruta_directorio) if f.endswith(".csv")]
-
-    # Combinar archivos sin procesar más allá de limpieza básica
-    dataframes = [procesar_dataframe(pd.read_csv(archivo)) for archivo in archivos]
-    df_combinado = pd.concat(dataframes, ignore_index=True)
-
-    # Guardar archivo combinado
-    guardar_archivo(df_combinado, CONFIG["archivo_salida"], "Archivo combinado guardado como datasetMD.csv.")
-
-    return df_combinado
+    archivos = sorted(os.path.join(ruta_directorio, f) for f in os.listdir(ruta_directorio) if f.endswith(".csv"))
+    ruta_salida = CONFIG["archivo_salida"]
+    temporal = f"{ruta_salida}.{os.getpid()}.tmp"
+
+    # El esquema se fija antes de escribir: se leen primero los encabezados
+    esquema = esquema_archivos(archivos)
+    nombres = set()
+    filas = 0
+    with pq.ParquetWriter(temporal, esquema) as escritor:
+        for archivo in archivos:
+            for bloque in pd.read_csv(archivo, dtype=str, chunksize=TAMAÑO_BLOQUE):
+                bloque = procesar_dataframe(bloque)
+                nombres.update(bloque["NOMBRE DEL INVESTIGADOR"].dropna().unique())
+                escritor.write_table(tipar_bloque(bloque, esquema))
+                filas += len(bloque)
+            logging.info(f"Archivo agregado: {archivo}")
+    os.replace(temporal, ruta_salida)
+    logging.info(f"Archivo combinado guardado como {ruta_salida} ({filas} filas).")
+
+    return pd.DataFrame({"NOMBRE DEL INVESTIGADOR": list(nombres)})
 
 
 def limpiar_nombres(df):
     """Procesa la lista de nombres para dejar solo los válidos."""
     # Extraer nombres únicos
     nombres_unicos = df["NOMBRE DEL INVESTIGADOR"].dropna().unique()
-    nombres_unicos = [normalizar_nombre(nombre) for nombre in nombres_unicos]
+    nombres_unicos = normalizar_lista(nombres_unicos, normalizar_nombre)
     df_nombres = pd.DataFrame({"NOMBRE DEL INVESTIGADOR": sorted(nombres_unicos)})
 
     # Guardar nombres únicos
@@ -141,9 +175,9 @@ def limpiar_nombres(df):
 
 def main():
     logging.info(" Combinando archivos ")
-    df_combinado = combinar_archivos()
+    nombres = combinar_archivos()
     logging.info(" Procesando nombres ")
-    limpiar_nombres(df_combinado)
+    limpiar_nombres(nombres)
     logging.info(" Proceso completado. ")
 
 if __name__ == "__main__":
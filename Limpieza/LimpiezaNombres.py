@@ -1,19 +1,15 @@
 import csv
 import logging
+import argparse
 from tqdm import tqdm
-from rapidfuzz import fuzz, process
-from multiprocessing import Pool, cpu_count
+from Limpieza.Normalizacion import nombre_sin_coma
+from Limpieza.Bloqueo import buscar_coincidencias
 
 # Configuración de logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-def normalizar_nombre_limpio(nombre):
-    """
-    Elimina la coma en los nombres de la lista Nombres_Limpios.csv
-    """
-    if ',' in nombre:
-        return nombre.replace(',', ' ').strip().upper()
-    return nombre.strip().upper()
+# Elimina la coma en los nombres de la lista Nombres_Limpios.csv
+normalizar_nombre_limpio = nombre_sin_coma
 
 
 def leer_nombres_limpios(ruta):
@@ -28,27 +24,17 @@ def leer_nombres_limpios(ruta):
             nombres_limpios.append(nombre_normalizado)
     return nombres_limpios
 
-def comparar_nombre(args):
+def buscar_no_encontrados(nombres, nombres_limpios, umbral_similitud, bloqueo=False):
     """
-    Función para calcular similitud entre un nombre descartado y la lista de nombres limpios
+    Devuelve los nombres sin coincidencia en nombres_limpios. Con bloqueo solo se
+    comparan los candidatos que comparten alguna llave de bloqueo.
     """
-    nombre_descartado, nombres_limpios, umbral_similitud = args
-    # Usar process.extractOne para buscar la mejor coincidencia
-    coincidencia, similitud,_ = process.extractOne(
-        nombre_descartado, nombres_limpios, scorer=fuzz.ratio
-    )
-
-    # Convertir similitud a float por si no lo es
-    similitud = float(similitud)
+    indices, _ = buscar_coincidencias(nombres, nombres_limpios, umbral_similitud, bloqueo=bloqueo)
+    return [nombre for nombre, indice in zip(nombres, indices) if indice < 0]
 
-    # logging.info(f"Comparando: {nombre_descartado} -> {coincidencia} (Similitud: {similitud}%)")
-    if similitud >= umbral_similitud:
-        return None  # Coincidencia encontrada, no lo incluimos en no encontrados
-    return nombre_descartado  # No encontrado
-
-def procesar_descartados(ruta_descartados, nombres_limpios, ruta_no_encontrados, umbral_similitud):
+def procesar_descartados(ruta_descartados, nombres_limpios, ruta_no_encontrados, umbral_similitud, bloqueo=False):
     """
-    Procesar nombres descartados con multiprocessing
+    Procesar nombres descartados comparándolos por lotes contra los nombres limpios
     """
     nombres_descartados = []
     with open(ruta_descartados, newline='', encoding='utf-8') as csvfile:
@@ -56,23 +42,10 @@ def procesar_descartados(ruta_descartados, nombres_limpios, ruta_no_encontrados,
         for row in tqdm(reader, desc="Leyendo nombres descartados"):
             nombre_normalizado = normalizar_nombre_limpio(row['NOMBRE DEL INVESTIGADOR'])
             nombres_descartados.append((nombre_normalizado))
-        
-        # Preparar argumentos para multiprocessing
-        argumentos = [
-            (nombre_descartado, nombres_limpios, umbral_similitud)
-            for nombre_descartado in nombres_descartados
-        ]
-        
-        # Usar multiprocessing para calcular similitudes en paralelo
-        with Pool(cpu_count()) as pool:
-            resultados = list(tqdm(
-                pool.imap(comparar_nombre, argumentos),
-                total=len(argumentos),
-                desc="Comparando nombres descartados"
-            ))
-        
-        # Filtrar los nombres no encontrados
-        no_encontrados = [nombre for nombre in resultados if nombre is not None]
+
+    # Similitudes por lotes (multihilo); se conservan los que no tienen coincidencia
+    logging.info(f"Comparando {len(nombres_descartados)} nombres descartados")
+    no_encontrados = buscar_no_encontrados(nombres_descartados, nombres_limpios, umbral_similitud, bloqueo)
 
     # Guardar los nombres no encontrados en un nuevo archivo CSV
     with open(ruta_no_encontrados, mode='w', newline='', encoding='utf-8') as csvfile:
@@ -100,7 +73,8 @@ def reformatear_nombre(nombre):
 
     return nombre
 
-def procesar_nombres_no_encontrados(ruta_no_encontrados, nombres_limpios, ruta_no_encontrados_actualizada, umbral_similitud):
+def procesar_nombres_no_encontrados(ruta_no_encontrados, nombres_limpios, ruta_no_encontrados_actualizada, umbral_similitud,
+                                    bloqueo=False):
     """
     Procesa nuevamente los nombres no encontrados, aplicando el formato APELLIDO NOMBRE
     """
@@ -113,22 +87,9 @@ def procesar_nombres_no_encontrados(ruta_no_encontrados, nombres_limpios, ruta_n
             nombre_reformateado = reformatear_nombre(nombre)
             nombres_descartados.append((nombre_reformateado))
 
-    # Preparar argumentos para multiprocessing
-    argumentos = [
-        (nombre_descartado, nombres_limpios, umbral_similitud)
-        for nombre_descartado in nombres_descartados
-    ]
-
-    # Usar multiprocessing para calcular similitudes en paralelo
-    with Pool(cpu_count()) as pool:
-        resultados = list(tqdm(
-            pool.map(comparar_nombre, argumentos),
-            total=len(argumentos),
-            desc="Reprocesando nombres no encontrados"
-            )) 
-
-    # Filtrar los nombres no encontrados
-    no_encontrados_actualizados = [nombre for nombre in resultados if nombre is not None]
+    # Similitudes por lotes (multihilo); se conservan los que siguen sin coincidencia
+    logging.info(f"Reprocesando {len(nombres_descartados)} nombres no encontrados")
+    no_encontrados_actualizados = buscar_no_encontrados(nombres_descartados, nombres_limpios, umbral_similitud, bloqueo)
 
     # Guardar los nuevos nombres no encontrados en un archivo CSV
     with open(ruta_no_encontrados_actualizada, mode='w', newline='', encoding='utf-8') as csvfile:
@@ -145,16 +106,25 @@ ruta_nombres_no_encontrados = 'Limpieza/Nombres_No_Encontrados.csv'
 ruta_nombres_no_encontrados_2 = 'Limpieza/Nombres_No_Encontrados_Actualizados.csv'
 umbral_similitud = 85
 
-def main():
+def main(bloqueo=True):
+    """
+    Busca los nombres descartados entre los nombres limpios. Con bloqueo (por defecto)
+    cada nombre se compara solo contra los candidatos de sus bloques (ver
+    Limpieza/Bloqueo.py) y se registra el recall medido sobre una muestra.
+    """
     logging.info("Procesando archivo.")
     nombres_limpios = leer_nombres_limpios(ruta_nombres_limpios)
     logging.info("Procesando nombres.")
-    procesar_descartados(ruta_nombres_descartados, nombres_limpios, ruta_nombres_no_encontrados, umbral_similitud)
+    procesar_descartados(ruta_nombres_descartados, nombres_limpios, ruta_nombres_no_encontrados, umbral_similitud, bloqueo)
     logging.info(f"El archivo {ruta_nombres_no_encontrados} ha sido generado.")
     logging.info("Procesando archivo de nombres no encontrados.")
-    procesar_nombres_no_encontrados(ruta_nombres_no_encontrados, nombres_limpios, ruta_nombres_no_encontrados_2, umbral_similitud)
+    procesar_nombres_no_encontrados(ruta_nombres_no_encontrados, nombres_limpios, ruta_nombres_no_encontrados_2,
+                                    umbral_similitud, bloqueo)
     logging.info("Proceso completado.")
     logging.info(f"El archivo {ruta_nombres_no_encontrados_2} ha sido generado.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Busca los nombres descartados entre los nombres limpios.")
+    parser.add_argument("--bloqueo", action=argparse.BooleanOptionalAction, default=True,
+                        help="Comparar solo contra los candidatos de los mismos bloques (por defecto, sí)")
+    main(parser.parse_args().bloqueo)
\ No newline at end of file
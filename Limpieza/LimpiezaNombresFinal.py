@@ -1,48 +1,42 @@
 import csv
 import logging
-from tqdm import tqdm
-from rapidfuzz import fuzz, process
+import argparse
 from collections import defaultdict
-from multiprocessing import Pool, cpu_count
+from Limpieza.Normalizacion import nombre_comparacion, normalizar_lista
+from Limpieza.Agrupamiento import (agrupar, agrupar_desde_grafo, obtener_grafo, estadisticas_grupos,
+                                   barrido_umbrales, MODO_LIDERES)
 
 # Configuración de logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-def normalizar_nombre(nombre):
-    """
-    Normaliza un nombre para comparación (internamente), pero no modifica el formato original.
-    """
-    return nombre.replace(',', '').strip().upper()
+# Normaliza un nombre para comparación (internamente), pero no modifica el formato original.
+normalizar_nombre = nombre_comparacion
 
-def comparar_nombres(args):
-    """
-    Función para calcular similitud entre un nombre y el resto de nombres.
-    """
-    nombre_normalizado, lista_nombres_normalizados = args
-    similares = process.extract(nombre_normalizado, lista_nombres_normalizados, scorer=fuzz.ratio, limit=10)
-    return similares
+# Regla de agrupamiento sobre las aristas de similitud (ver Limpieza/Agrupamiento.py)
+modo_agrupamiento = MODO_LIDERES
+# Grafo de similitud guardado (aristas por encima del umbral más bajo usado)
+ruta_grafo = 'Limpieza/grafo_similitud.parquet'
 
-def agrupar_nombres_similares(nombres_originales, nombres_normalizados, umbral_similitud):
+def agrupar_nombres_similares(nombres_originales, nombres_normalizados, umbral_similitud, grafo=None, bloqueo=False):
     """
-    Agrupa nombres similares utilizando su forma normalizada.
+    Agrupa nombres similares utilizando su forma normalizada. Las similitudes se
+    calculan una sola vez y los grupos se forman sobre esas aristas;
+    si se da un grafo ya calculado, se usan sus aristas con similitud >= umbral.
     """
     logging.info("Agrupando nombres similares.")
+    if grafo is None:
+        etiquetas = agrupar(nombres_normalizados, umbral_similitud, bloqueo=bloqueo, modo=modo_agrupamiento)
+    else:
+        etiquetas = agrupar_desde_grafo(nombres_normalizados, grafo, umbral_similitud, modo=modo_agrupamiento)
+    logging.info(f"Estadísticas de grupos: {estadisticas_grupos(etiquetas, umbral_similitud)}")
+
+    # La clave de cada grupo es su primer nombre (los grupos quedan en orden de aparición)
     grupos = defaultdict(list)
+    claves = {}
+    for etiqueta, nombre_original, nombre_normalizado in zip(etiquetas, nombres_originales, nombres_normalizados):
+        clave = claves.setdefault(etiqueta, (nombre_original, nombre_normalizado))
+        grupos[clave].append((nombre_original, nombre_normalizado))
 
-    # tqdm para visualización del progreso
-    for nombre_original, nombre_normalizado in tqdm(zip(nombres_originales, nombres_normalizados),
-                                                    total=len(nombres_originales),
-                                                    desc="Agrupando nombres"):
-        grupo_asignado = False
-        for clave_original, clave_normalizada in list(grupos.keys()):
-            similitud = fuzz.ratio(nombre_normalizado, clave_normalizada)
-            if similitud >= umbral_similitud:  # Si la similitud es mayor al umbral, los agrupo
-                grupos[(clave_original, clave_normalizada)].append((nombre_original, nombre_normalizado))
-                grupo_asignado = True
-                break
-        if not grupo_asignado:
-            grupos[(nombre_original, nombre_normalizado)].append((nombre_original, nombre_normalizado))
-    
     logging.info(f"Total de grupos formados: {len(grupos)}")
     return grupos
 
@@ -60,37 +54,39 @@ def seleccionar_nombre_representativo(grupos):
     logging.info(f"Total de nombres representativos seleccionados: {len(nombres_limpios)}")
     return nombres_limpios
 
-def procesar_nombres(ruta_archivo, umbral_similitud=85):
+def leer_nombres(ruta_archivo):
     """
-    Procesa los nombres de un archivo CSV, agrupando nombres similares y seleccionando el representativo.
+    Lee la columna 'NOMBRE DEL INVESTIGADOR' de un archivo CSV.
     """
-    logging.info(f"Procesando archivo: {ruta_archivo} con umbral: {umbral_similitud}")
-    nombres_originales = []
-    nombres_normalizados = []
     with open(ruta_archivo, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            nombre_original = row['NOMBRE DEL INVESTIGADOR']
-            nombres_originales.append(nombre_original)
-            nombres_normalizados.append(normalizar_nombre(nombre_original))
+        return [row['NOMBRE DEL INVESTIGADOR'] for row in csv.DictReader(csvfile)]
 
+def depurar_nombres(nombres_originales, umbral_similitud, grafo=None, bloqueo=False):
+    """
+    Agrupa los nombres similares y devuelve el nombre representativo de cada grupo.
+    """
+    nombres_normalizados = normalizar_lista(nombres_originales, normalizar_nombre)
     logging.info(f"Total de nombres cargados: {len(nombres_originales)}")
 
-    # Usar multiprocessing para comparar los nombres
-    logging.info("Iniciando comparación de nombres utilizando...")
-    with Pool(cpu_count()) as pool:
-        argumentos = [(nombre_normalizado, nombres_normalizados) for nombre_normalizado in nombres_normalizados]
-
-        # tqdm para visualización del progreso
-        resultados = list(tqdm(pool.imap(comparar_nombres, argumentos), 
-                               total=len(argumentos), 
-                               desc="Comparando nombres"))
-
     # Agrupar los nombres similares
-    grupos = agrupar_nombres_similares(nombres_originales, nombres_normalizados, umbral_similitud)
+    grupos = agrupar_nombres_similares(nombres_originales, nombres_normalizados, umbral_similitud, grafo, bloqueo)
     # Seleccionar un nombre representativo para cada grupo
-    nombres_limpios = seleccionar_nombre_representativo(grupos)
-    return nombres_limpios
+    return seleccionar_nombre_representativo(grupos)
+
+def procesar_nombres(ruta_archivo, umbral_similitud=85, grafo=None, bloqueo=False):
+    """
+    Procesa los nombres de un archivo CSV, agrupando nombres similares y seleccionando el representativo.
+    """
+    logging.info(f"Procesando archivo: {ruta_archivo} con umbral: {umbral_similitud}")
+    return depurar_nombres(leer_nombres(ruta_archivo), umbral_similitud, grafo, bloqueo)
+
+def grafo_de_nombres(nombres_originales, umbral_minimo, bloqueo=False):
+    """
+    Grafo de similitud (guardado en ruta_grafo) de los nombres normalizados, con las
+    aristas de similitud >= umbral_minimo.
+    """
+    nombres_normalizados = normalizar_lista(nombres_originales, normalizar_nombre)
+    return obtener_grafo(nombres_normalizados, umbral_minimo, ruta_grafo, bloqueo=bloqueo)
 
 def guardar_nombres_limpios(nombres_limpios, ruta_salida):
     """
@@ -105,22 +101,50 @@ def guardar_nombres_limpios(nombres_limpios, ruta_salida):
             writer.writerow({'NOMBRE DEL INVESTIGADOR': nombre})
 
 
-def main():
-    ruta_entrada  = 'Limpieza/Nombres_LimpiosCompleto.csv'
-    ruta_intermedia = 'Limpieza/Nombres_Limpios_85.csv'
-    ruta_salida = 'Nombres_Limpios_Final.csv'
-    umbral1 = 85
-    umbral2 = 75
-    
+def main(umbrales=(85, 75), ruta_entrada='Limpieza/Nombres_LimpiosCompleto.csv',
+         ruta_intermedia='Limpieza/Nombres_Limpios_85.csv', ruta_salida='Nombres_Limpios_Final.csv', bloqueo=False):
+    """
+    Depura los nombres en pasadas sucesivas (una por umbral, cada una sobre los
+    representativos de la anterior). Las similitudes se calculan una sola vez, con
+    el umbral más bajo, y todas las pasadas usan ese grafo.
+
+    Sin bloqueo por defecto: con umbral 75 el bloqueo pierde alrededor del 6 % de
+    los pares similares y cambia los grupos. Con bloqueo=True se registra el recall
+    de las aristas medido sobre una muestra.
+    """
+    umbral1, umbral2 = umbrales
+
+    nombres_originales = leer_nombres(ruta_entrada)
+    grafo = grafo_de_nombres(nombres_originales, min(umbrales), bloqueo)
+
     logging.info(f"Primera limpieza con umbral de: {umbral1}")
-    nombres_limpios_85 = procesar_nombres(ruta_entrada, umbral1)
+    nombres_limpios_85 = depurar_nombres(nombres_originales, umbral1, grafo)
     guardar_nombres_limpios(nombres_limpios_85, ruta_intermedia)
     logging.info("Primera limpieza completada")
 
     logging.info(f"Segunda limpieza con umbral de: {umbral2}")
-    nombres_limpios_75 = procesar_nombres(ruta_intermedia, umbral2)
+    nombres_limpios_75 = depurar_nombres(nombres_limpios_85, umbral2, grafo)
     guardar_nombres_limpios(nombres_limpios_75, ruta_salida)
     logging.info("Segunda limpieza completada")
 
+def barrido(umbrales, ruta_entrada='Limpieza/Nombres_LimpiosCompleto.csv', bloqueo=False):
+    """
+    Estadísticas de tamaño de grupo de una sola pasada para cada umbral, calculadas
+    sobre el mismo grafo de similitud.
+    """
+    nombres_originales = leer_nombres(ruta_entrada)
+    grafo = grafo_de_nombres(nombres_originales, min(umbrales), bloqueo)
+    nombres_normalizados = normalizar_lista(nombres_originales, normalizar_nombre)
+    return barrido_umbrales(nombres_normalizados, grafo, umbrales, modo=modo_agrupamiento)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Agrupa nombres similares y selecciona un representativo por grupo.")
+    parser.add_argument("--barrido", type=float, nargs="+", metavar="UMBRAL",
+                        help="Solo mostrar las estadísticas de grupos para estos umbrales")
+    parser.add_argument("--bloqueo", action=argparse.BooleanOptionalAction, default=False,
+                        help="Comparar solo los pares que comparten una llave de bloqueo (por defecto, no)")
+    args = parser.parse_args()
+    if args.barrido:
+        print(barrido(args.barrido, bloqueo=args.bloqueo).to_string(index=False))
+    else:
+        main(bloqueo=args.bloqueo)
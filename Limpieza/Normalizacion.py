@@ -0,0 +1,93 @@
+import re
+import unicodedata
+from functools import lru_cache
+import pandas as pd
+
+# === Normalización de nombres ===
+# Funciones compartidas por todas las etapas de la limpieza. Cada función trabaja
+# sobre un solo texto y guarda sus resultados en una caché LRU acotada; para
+# columnas completas se usa normalizar_serie, que procesa solo los valores
+# únicos y luego los vuelve a asignar a cada fila.
+TAMAÑO_CACHE = 200_000
+
+# Diccionario de equivalencias (caracteres mal codificados en los padrones)
+equivalencias = {
+    "Ð": "Ñ",
+    ";": "Ñ",
+    "▄": "Ü",
+    "_": "Ü",
+    "Þ": "Ü",
+    "0": "O",
+    "¬": ".",
+    "╚": "È",
+    "+": "È",
+    "¦": "É",
+    "Ì": "Í",
+    "Ò": "Ó",
+    "/": " ",
+    "\\": "Ü",
+    "(": "",
+    ")": "",
+    "[": "",
+    "]": "",
+    "*": "",
+    "7": "",
+    ":": ""
+}
+
+# Tabla de traducción compilada: un solo recorrido del texto en lugar de un
+# replace por equivalencia (ningún reemplazo produce otra llave del diccionario)
+TABLA_EQUIVALENCIAS = str.maketrans(equivalencias)
+
+@lru_cache(maxsize=TAMAÑO_CACHE)
+def quitar_acentos(texto):
+    """Descompone el texto (NFKD) y descarta lo que no es ASCII."""
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+
+@lru_cache(maxsize=TAMAÑO_CACHE)
+def normalizar_nombre(nombre):
+    """Normaliza caracteres en un nombre."""
+    if pd.notna(nombre) and isinstance(nombre, str):
+        return quitar_acentos(nombre).replace("Ñ", "N").translate(TABLA_EQUIVALENCIAS)
+    return None
+
+@lru_cache(maxsize=TAMAÑO_CACHE)
+def limpiar_nombre(nombre):
+    """Limpia y normaliza un nombre."""
+    if pd.notna(nombre) and isinstance(nombre, str):
+        nombre = normalizar_nombre(nombre)  # Normalizar caracteres
+        nombre = re.sub(r'\s*,\s*', ',', nombre.strip())
+        nombre = re.sub(r'^-', '', nombre)  # Quitar guiones iniciales
+        return nombre
+    return None
+
+def nombre_sin_coma(nombre):
+    """Reemplaza la coma por un espacio y pasa a mayúsculas ('APELLIDOS NOMBRES')."""
+    return nombre.replace(',', ' ').strip().upper()
+
+def nombre_comparacion(nombre):
+    """Forma del nombre que se usa para comparar: sin coma y en mayúsculas."""
+    return nombre.replace(',', '').strip().upper()
+
+@lru_cache(maxsize=TAMAÑO_CACHE)
+def limpiar_texto(texto):
+    """Quita acentos, caracteres no imprimibles, dígitos y palabras de una letra."""
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = ''.join(c for c in texto if not unicodedata.combining(c) and c.isprintable())
+    texto = re.sub(r'\d+', '', texto)
+    return ' '.join(word for word in texto.split() if len(word) > 1)
+
+# === API por lotes ===
+def normalizar_lista(nombres, funcion=normalizar_nombre):
+    """Aplica la función a una lista de nombres calculando cada valor distinto una sola vez."""
+    mapa = {nombre: funcion(nombre) for nombre in dict.fromkeys(nombres)}
+    return [mapa[nombre] for nombre in nombres]
+
+def normalizar_serie(serie, funcion=normalizar_nombre):
+    """
+    Aplica la función a una Serie de pandas: se normalizan solo los valores únicos
+    (sin nulos) y el resultado se asigna a cada fila con map.
+    """
+    unicos = serie.dropna().unique()
+    mapa = {valor: funcion(valor) for valor in unicos}
+    return serie.map(mapa)
@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import logging
+import argparse
+import pandas as pd
+from Limpieza.LimpiezaDatos import leer_combinado
+
+# Configuración de logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# === Perfil de columnas ===
+# Resumen por columna de un dataset: tipo de pandas, tipos de Python presentes
+# (sin contar nulos), proporción de nulos, cardinalidad y, en columnas de texto,
+# cuántos valores son números escritos como texto. Todo se calcula sobre los
+# valores distintos (value_counts, en C) y no celda por celda; el tipo de cada
+# columna se detecta primero con infer_dtype y solo las columnas que resultan
+# mixtas se revisan celda por celda (value_counts junta 1, 1.0 y True en una
+# sola llave, así que sus conteos no sirven para contar tipos).
+TIPOS_MIXTOS = {"mixed", "mixed-integer", "mixed-integer-float"}
+# Nombre del tipo de Python para cada resultado de infer_dtype
+TIPOS_PYTHON = {
+    "string": "str",
+    "integer": "int",
+    "floating": "float",
+    "decimal": "Decimal",
+    "boolean": "bool",
+    "datetime": "datetime",
+    "datetime64": "datetime",
+    "date": "date",
+    "bytes": "bytes",
+}
+
+
+def perfilar_columna(serie):
+    """Devuelve el perfil (dict serializable en JSON) de una columna."""
+    # Valores distintos y número de celdas de cada uno (los nulos son el resto)
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.cat.remove_unused_categories()
+        valores = serie.cat.categories
+        conteos = serie.value_counts(dropna=True).reindex(valores).to_numpy()
+        inferido = pd.api.types.infer_dtype(valores, skipna=True)
+    else:
+        conteos_serie = serie.value_counts(dropna=True)
+        valores = conteos_serie.index
+        conteos = conteos_serie.to_numpy()
+        # Sobre la columna y no sobre los valores distintos: [1, 1.0, True] es mixta
+        inferido = pd.api.types.infer_dtype(serie, skipna=True)
+    filas = len(serie)
+    nulos = filas - int(conteos.sum())
+    perfil = {
+        "dtype": str(serie.dtype),
+        "tipo_inferido": inferido,
+        "nulos": nulos,
+        "proporcion_nulos": nulos / filas if filas else 0.0,
+        "cardinalidad": len(valores),
+    }
+
+    # Conteo de celdas por tipo de Python: solo se recorre celda por celda si es mixto
+    if inferido in TIPOS_MIXTOS and isinstance(serie.dtype, pd.CategoricalDtype):
+        # Las categorías son los valores de las celdas: basta con sus conteos
+        tipos = pd.Series(conteos, index=[type(valor).__name__ for valor in valores]).groupby(level=0).sum()
+        perfil["tipos"] = {tipo: int(cantidad) for tipo, cantidad in tipos.items()}
+    elif inferido in TIPOS_MIXTOS:
+        tipos = serie.dropna().map(lambda valor: type(valor).__name__).value_counts()
+        perfil["tipos"] = {tipo: int(cantidad) for tipo, cantidad in tipos.items()}
+    else:
+        perfil["tipos"] = {TIPOS_PYTHON.get(inferido, inferido): int(conteos.sum())} if len(valores) else {}
+    perfil["tipos_mixtos"] = len(perfil["tipos"]) > 1
+
+    # Números escritos como texto (p. ej. CVU leído como cadena)
+    if inferido in TIPOS_MIXTOS or inferido == "string":
+        textos = pd.Series(valores, dtype=object)
+        es_texto = textos.map(type) == str
+        numericos = pd.to_numeric(textos[es_texto].str.strip(), errors="coerce").notna().to_numpy()
+        perfil["numeros_en_texto"] = int(conteos[es_texto.to_numpy()][numericos].sum())
+    else:
+        perfil["numeros_en_texto"] = 0
+    return perfil
+
+
+# Función para perfilar un DataFrame completo
+def perfilar(df, origen=None):
+    """Perfil del DataFrame: número de filas y el perfil de cada columna."""
+    perfil = {
+        "filas": int(len(df)),
+        "columnas": {str(columna): perfilar_columna(df[columna]) for columna in df.columns},
+    }
+    if origen is not None:
+        perfil = {"origen": origen, **perfil}
+    return perfil
+
+
+def verificar_perfil(perfil, permitir_mixtos=(), maximo_nulos=None, columnas_requeridas=()):
+    """
+    Revisa el perfil contra las reglas de la etapa y devuelve la lista de problemas
+    encontrados (vacía si pasa): columnas requeridas ausentes, columnas con tipos
+    mixtos no permitidas y, si se indica, columnas con más nulos que maximo_nulos.
+    """
+    problemas = []
+    columnas = perfil["columnas"]
+    for columna in columnas_requeridas:
+        if columna not in columnas:
+            problemas.append(f"Falta la columna '{columna}'")
+    for columna, datos in columnas.items():
+        if datos["tipos_mixtos"] and columna not in permitir_mixtos:
+            problemas.append(f"Columna '{columna}' con tipos mixtos: {datos['tipos']}")
+        if maximo_nulos is not None and datos["proporcion_nulos"] > maximo_nulos:
+            problemas.append(f"Columna '{columna}' con {datos['proporcion_nulos']:.1%} de nulos")
+    return problemas
+
+
+def guardar_perfil(perfil, ruta):
+    """Guarda el perfil como JSON (escritura atómica)."""
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(perfil, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta)
+
+
+def _leer_dataset(ruta):
+    if ruta.endswith(".parquet"):
+        return leer_combinado(ruta)
+    return pd.read_csv(ruta, low_memory=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de columnas de un dataset (JSON) con verificación de tipos y nulos.")
+    parser.add_argument("ruta", help="Archivo CSV o Parquet")
+    parser.add_argument("--salida", help="Ruta del reporte JSON (por defecto se imprime)")
+    parser.add_argument("--permitir-mixtos", nargs="*", default=[], metavar="COLUMNA",
+                        help="Columnas en las que se aceptan tipos mixtos")
+    parser.add_argument("--maximo-nulos", type=float, help="Proporción máxima de nulos por columna")
+    args = parser.parse_args()
+
+    perfil = perfilar(_leer_dataset(args.ruta), origen=os.path.basename(args.ruta))
+    if args.salida:
+        guardar_perfil(perfil, args.salida)
+        logging.info(f"Perfil guardado en {args.salida}")
+    else:
+        print(json.dumps(perfil, ensure_ascii=False, indent=2))
+
+    problemas = verificar_perfil(perfil, args.permitir_mixtos, args.maximo_nulos)
+    for problema in problemas:
+        logging.error(problema)
+    # Código de salida distinto de cero para detener el proceso si no pasa
+    sys.exit(1 if problemas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import os
+import re
+import glob
+import json
+import time
+import hashlib
+import inspect
+import logging
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from Limpieza.LimpiezaColumnas import hash_archivo, leer_manifiesto, guardar_manifiesto
+
+# Configuración de logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# === Ejecución incremental de la limpieza ===
+# Cada etapa declara sus archivos de entrada y de salida (rutas o patrones glob).
+# Las dependencias se obtienen de esas declaraciones: una etapa depende de las
+# etapas que producen alguno de sus archivos de entrada. Antes de ejecutar una
+# etapa se calcula su llave: SHA-256 del contenido de sus entradas, del código de
+# su módulo (y de los módulos de Limpieza que importa) y de sus parámetros. Si la
+# llave es la registrada en el manifiesto y las salidas siguen como se dejaron,
+# la etapa se omite. Las llaves se calculan cuando terminan las etapas anteriores,
+# así que si una etapa se vuelve a ejecutar pero sus salidas no cambian, las
+# siguientes tampoco se ejecutan. Las etapas listas se ejecutan en un pool de
+# procesos, varias a la vez si no dependen entre sí.
+RUTA_MANIFIESTO = "Limpieza/manifiesto_pipeline.json"
+_IMPORTS_LIMPIEZA = re.compile(r"^\s*(?:from|import)\s+Limpieza\.(\w+)", re.MULTILINE)
+
+# Estados de una etapa en el plan
+EJECUTAR = "ejecutar"
+AL_DIA = "al día"
+PENDIENTE = "pendiente"
+NO_SELECCIONADA = "no seleccionada"
+
+
+class Etapa:
+    """Etapa de la limpieza: función a ejecutar, sus parámetros y sus archivos de entrada y salida."""
+
+    def __init__(self, nombre, funcion, entradas=(), salidas=(), parametros=None):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.entradas = list(entradas)
+        self.salidas = list(salidas)
+        self.parametros = dict(parametros or {})
+
+    def ejecutar(self):
+        """Ejecuta la etapa (en un proceso del pool) y devuelve su duración en segundos."""
+        inicio = time.perf_counter()
+        self.funcion(**self.parametros)
+        return time.perf_counter() - inicio
+
+
+def expandir(patrones):
+    """Archivos existentes (ordenados) de cada ruta o patrón."""
+    return {patron: sorted(glob.glob(patron)) for patron in patrones}
+
+
+def archivos_codigo(funcion):
+    """Archivo del módulo de la función y de los módulos de Limpieza que importa (recursivo)."""
+    carpeta = os.path.dirname(inspect.getsourcefile(funcion))
+    pendientes = [inspect.getsourcefile(funcion)]
+    archivos = set()
+    while pendientes:
+        ruta = pendientes.pop()
+        if ruta in archivos or not os.path.exists(ruta):
+            continue
+        archivos.add(ruta)
+        with open(ruta, encoding="utf-8") as f:
+            modulos = _IMPORTS_LIMPIEZA.findall(f.read())
+        pendientes.extend(os.path.join(carpeta, f"{modulo}.py") for modulo in modulos)
+    return sorted(archivos)
+
+
+def huella_archivo(ruta, cache):
+    """
+    SHA-256 del archivo. El cache (del manifiesto) guarda el hash con el tamaño y la
+    fecha de modificación, así que los archivos que no cambiaron no se vuelven a leer.
+    """
+    estado = os.stat(ruta)
+    entrada = cache.get(ruta)
+    if entrada and entrada["tamaño"] == estado.st_size and entrada["mtime_ns"] == estado.st_mtime_ns:
+        return entrada["sha256"]
+    sha = hash_archivo(ruta)
+    cache[ruta] = {"tamaño": estado.st_size, "mtime_ns": estado.st_mtime_ns, "sha256": sha}
+    return sha
+
+
+def llave_etapa(etapa, cache):
+    """Llave de la etapa: contenido de las entradas, código y parámetros."""
+    contenido = {
+        "entradas": {patron: {ruta: huella_archivo(ruta, cache) for ruta in rutas}
+                     for patron, rutas in expandir(etapa.entradas).items()},
+        "codigo": {os.path.basename(ruta): huella_archivo(ruta, cache) for ruta in archivos_codigo(etapa.funcion)},
+        "parametros": etapa.parametros,
+    }
+    texto = json.dumps(contenido, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def huellas_salidas(etapa, cache):
+    """Hash de cada archivo de salida de la etapa."""
+    return {ruta: huella_archivo(ruta, cache) for rutas in expandir(etapa.salidas).values() for ruta in rutas}
+
+
+def salidas_al_dia(etapa, registro, cache):
+    """Las salidas registradas existen sin cambios y cada salida declarada tiene al menos un archivo."""
+    if any(not rutas for rutas in expandir(etapa.salidas).values()):
+        return False
+    return all(os.path.exists(ruta) and huella_archivo(ruta, cache) == sha
+               for ruta, sha in registro.get("salidas", {}).items())
+
+
+# Función para obtener las dependencias entre etapas
+def dependencias(etapas):
+    """
+    Etapas anteriores de cada etapa (las que producen alguna de sus entradas). Las
+    etapas deben venir en un orden en que cada una aparece después de las que usa.
+    """
+    productores = {}
+    for etapa in etapas:
+        for salida in etapa.salidas:
+            if salida in productores:
+                raise ValueError(f"'{salida}' es salida de '{productores[salida]}' y de '{etapa.nombre}'")
+            productores[salida] = etapa.nombre
+
+    anteriores, vistas = {}, set()
+    for etapa in etapas:
+        anteriores[etapa.nombre] = {productores[entrada] for entrada in etapa.entradas if entrada in productores}
+        posteriores = anteriores[etapa.nombre] - vistas
+        if posteriores:
+            raise ValueError(f"La etapa '{etapa.nombre}' usa salidas de etapas posteriores: {sorted(posteriores)}")
+        vistas.add(etapa.nombre)
+    return anteriores
+
+
+def seleccionar(etapas, solo=None, desde=None):
+    """
+    Nombres de las etapas a considerar: todas, solo las indicadas o, con 'desde',
+    esa etapa y todas las que dependen de ella.
+    """
+    nombres = [etapa.nombre for etapa in etapas]
+    for nombre in list(solo or []) + ([desde] if desde else []):
+        if nombre not in nombres:
+            raise ValueError(f"Etapa desconocida: '{nombre}'. Etapas: {', '.join(nombres)}")
+    seleccion = set(solo) if solo else set(nombres)
+    if desde:
+        anteriores = dependencias(etapas)
+        descendientes = {desde}
+        for nombre in nombres:
+            if anteriores[nombre] & descendientes:
+                descendientes.add(nombre)
+        seleccion &= descendientes
+    return seleccion
+
+
+def planear(etapas, seleccion, forzar=False, ruta_manifiesto=RUTA_MANIFIESTO):
+    """
+    Estado de cada etapa sin ejecutar nada: EJECUTAR, AL_DIA, PENDIENTE (depende de
+    una etapa que se va a ejecutar, así que su llave aún no se conoce) o NO_SELECCIONADA.
+    """
+    manifiesto = leer_manifiesto(ruta_manifiesto)
+    cache = manifiesto.setdefault("archivos", {})
+    anteriores = dependencias(etapas)
+    plan = {}
+    for etapa in etapas:
+        if etapa.nombre not in seleccion:
+            plan[etapa.nombre] = NO_SELECCIONADA
+        elif any(plan[anterior] in (EJECUTAR, PENDIENTE) for anterior in anteriores[etapa.nombre]):
+            plan[etapa.nombre] = PENDIENTE
+        elif forzar:
+            plan[etapa.nombre] = EJECUTAR
+        else:
+            registro = manifiesto.get("etapas", {}).get(etapa.nombre, {})
+            al_dia = registro.get("llave") == llave_etapa(etapa, cache) and salidas_al_dia(etapa, registro, cache)
+            plan[etapa.nombre] = AL_DIA if al_dia else EJECUTAR
+    return plan
+
+
+def ejecutar(etapas, seleccion, jobs=1, forzar=False, ruta_manifiesto=RUTA_MANIFIESTO):
+    """
+    Ejecuta las etapas seleccionadas que no están al día, hasta 'jobs' a la vez.
+    Las etapas no seleccionadas se toman como ya ejecutadas. Si una etapa falla, las
+    que dependen de ella no se ejecutan. Devuelve los nombres de las etapas con error.
+    """
+    manifiesto = leer_manifiesto(ruta_manifiesto)
+    cache = manifiesto.setdefault("archivos", {})
+    registros = manifiesto.setdefault("etapas", {})
+    anteriores = dependencias(etapas)
+    pendientes = [etapa for etapa in etapas if etapa.nombre in seleccion]
+    terminadas = {etapa.nombre for etapa in etapas if etapa.nombre not in seleccion}
+    fallidas = set()
+
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as pool:
+        en_curso = {}
+        while pendientes or en_curso:
+            # Lanzar las etapas cuyas etapas anteriores ya terminaron (en orden de declaración)
+            for etapa in list(pendientes):
+                if anteriores[etapa.nombre] & fallidas:
+                    pendientes.remove(etapa)
+                    fallidas.add(etapa.nombre)
+                    logging.error(f"[{etapa.nombre}] No se ejecuta: falló una etapa anterior")
+                elif anteriores[etapa.nombre] <= terminadas:
+                    pendientes.remove(etapa)
+                    llave = llave_etapa(etapa, cache)
+                    registro = registros.get(etapa.nombre, {})
+                    if not forzar and registro.get("llave") == llave and salidas_al_dia(etapa, registro, cache):
+                        logging.info(f"[{etapa.nombre}] Al día, se omite")
+                        terminadas.add(etapa.nombre)
+                        continue
+                    logging.info(f"[{etapa.nombre}] Ejecutando")
+                    en_curso[pool.submit(etapa.ejecutar)] = (etapa, llave)
+            if not en_curso:
+                # Las omitidas pueden haber liberado otras etapas
+                continue
+
+            listas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for tarea in listas:
+                etapa, llave = en_curso.pop(tarea)
+                try:
+                    duracion = tarea.result()
+                    faltantes = [patron for patron, rutas in expandir(etapa.salidas).items() if not rutas]
+                    if faltantes:
+                        raise FileNotFoundError(f"No se generaron las salidas: {', '.join(faltantes)}")
+                except Exception as e:
+                    logging.error(f"[{etapa.nombre}] Error: {e}")
+                    registros.pop(etapa.nombre, None)
+                    fallidas.add(etapa.nombre)
+                else:
+                    registros[etapa.nombre] = {"llave": llave, "salidas": huellas_salidas(etapa, cache)}
+                    terminadas.add(etapa.nombre)
+                    logging.info(f"[{etapa.nombre}] Terminada en {duracion:.1f} s")
+                guardar_manifiesto(manifiesto, ruta_manifiesto)
+
+    guardar_manifiesto(manifiesto, ruta_manifiesto)
+    return sorted(fallidas)
@@ -1,5 +1,6 @@
-import pandas as pd
 import logging
+import numpy as np
+import pandas as pd
 from tqdm import tqdm
 from rapidfuzz import process, fuzz
 
@@ -7,17 +8,19 @@ from rapidfuzz import process, fuzz
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger()
 
-# Lista para nombres no emparejados
-nombres_no_emparejados = []
+# Rutas de los archivos
+ruta_dataset = "Limpieza/datasetF.csv"
+ruta_nombres_limpios = "Nombres_Limpios_Final.csv"
+ruta_dataset_sin = "Limpieza/datasetSIN.csv"
+umbral_similitud = 85
 
-def separar(dataset_sin):
-    """Separar apellidos y nombres para ambos datasets."""
-    logger.info("Separando apellidos y nombres...")
-    dataset_sin[["APELLIDOS", "NOMBRES"]] = dataset_sin["NOMBRE DEL INVESTIGADOR"].str.split(",", expand=True)
-    nombres_limpios[["APELLIDOS", "NOMBRES"]] = nombres_limpios["NOMBRE DEL INVESTIGADOR"].str.split(",", expand=True)
+def separar(df):
+    """Separar apellidos y nombres (en la primera coma) de la columna NOMBRE DEL INVESTIGADOR."""
+    partes = df["NOMBRE DEL INVESTIGADOR"].str.split(",", n=1, expand=True).reindex(columns=[0, 1])
+    return df.assign(APELLIDOS=partes[0], NOMBRES=partes[1])
 
 
-def procesar_nombres_faltantes():
+def procesar_nombres_faltantes(dataset, ruta_sin=ruta_dataset_sin):
     """Creamos el archivo datasetSIN que contiene los nombres que les hace falta un nombre de búsqueda en el dataset Final."""
     # Filtra las filas donde la columna INVESTIGADOR este vacia
     filtro = dataset['INVESTIGADOR'].isna() | (dataset['INVESTIGADOR'] == "")
@@ -31,68 +34,104 @@ def procesar_nombres_faltantes():
     nombres_unicos = datos_con_coma["NOMBRE DEL INVESTIGADOR"].drop_duplicates().sort_values()
 
     # Guarda los resultados en un CSV
-    nombres_unicos.to_csv("Limpieza/datasetSIN.csv", index=False, header=True, encoding='utf-8-sig')
-    print("Los nombres únicos se han guardado en 'datasetSIN.csv'.")
-
-def analizar_similitudes(fila, nombres_limpios):
-    """Función para analizar similitudes."""
-    try:
-        # Buscar coincidencias exactas o parciales en apellidos
-        coincidencias = nombres_limpios.loc[
-            nombres_limpios["APELLIDOS"] == fila["APELLIDOS"]
-        ]
-
-        if coincidencias.empty:
-            # No hay coincidencia en apellidos, añadir directamente
-            logging.debug(f"No se encontró coincidencia para: {fila['NOMBRE DEL INVESTIGADOR']}")
-            nombres_no_emparejados.append(fila["NOMBRE DEL INVESTIGADOR"])
-        else:
-            # Analizar coincidencia de nombres
-            mejor_coincidencia = process.extractOne(
-                fila["NOMBRES"],
-                coincidencias["NOMBRES"],
-                scorer=fuzz.ratio
-            )
-
-            if mejor_coincidencia and mejor_coincidencia[1] < 85:
-                # Si la similitud en nombres es baja, añadir a no emparejados
-                logging.debug(f"Similitud baja en nombres para: {fila['NOMBRE DEL INVESTIGADOR']}.")
-                nombres_no_emparejados.append(fila["NOMBRE DEL INVESTIGADOR"])
-    except Exception as e:
-        logger.error(f"Error al procesar la fila: {fila['NOMBRE DEL INVESTIGADOR']} - {e}")
-
-def procesar_archivo():
+    nombres_unicos.to_csv(ruta_sin, index=False, header=True, encoding='utf-8-sig')
+    logger.info(f"Los nombres únicos se han guardado en '{ruta_sin}'.")
+
+
+def indice_apellidos(nombres_limpios):
+    """
+    Índice APELLIDOS → lista de NOMBRES de los nombres limpios, construido una sola vez.
+    Un apellido sin ningún nombre de pila conserva su entrada (lista vacía).
+    """
+    indice = {}
+    for apellidos, nombres in zip(nombres_limpios["APELLIDOS"], nombres_limpios["NOMBRES"]):
+        if not isinstance(apellidos, str):
+            continue
+        candidatos = indice.setdefault(apellidos, [])
+        if isinstance(nombres, str):
+            candidatos.append(nombres)
+    return indice
+
+
+def analizar_similitudes(dataset_sin, nombres_limpios, umbral=umbral_similitud):
+    """
+    Busca cada nombre de datasetSIN entre los nombres limpios con los mismos apellidos
+    y devuelve un DataFrame con los que no tienen coincidencia (MOTIVO y SIMILITUD).
+    Los nombres de pila se comparan por lotes dentro de cada grupo de apellidos.
+    """
+    indice = indice_apellidos(nombres_limpios)
+    apellidos = dataset_sin["APELLIDOS"]
+
+    # No hay coincidencia en apellidos, añadir directamente
+    sin_apellidos = ~apellidos.isin(indice.keys()).to_numpy()
+
+    # Filas (posiciones) con nombre de pila por cada grupo de apellidos conocido
+    grupos = {}
+    for posicion, (apellido, nombre) in enumerate(zip(apellidos, dataset_sin["NOMBRES"])):
+        if not sin_apellidos[posicion] and isinstance(nombre, str) and indice[apellido]:
+            grupos.setdefault(apellido, []).append(posicion)
+
+    # Mejor similitud de cada nombre de pila contra los del mismo apellido
+    similitud = np.full(len(dataset_sin), np.inf)
+    comparaciones = 0
+    nombres = dataset_sin["NOMBRES"].to_numpy()
+    for apellido, posiciones in tqdm(grupos.items(), desc="Procesando apellidos"):
+        matriz = process.cdist(nombres[posiciones].tolist(), indice[apellido], scorer=fuzz.ratio,
+                               dtype=np.float64, workers=-1)
+        comparaciones += matriz.size
+        similitud[posiciones] = matriz.max(axis=1)
+    logger.info(f"Comparaciones de nombres dentro de los grupos de apellidos: {comparaciones}")
+
+    # Si la similitud en nombres es baja, añadir a no emparejados
+    similitud_baja = similitud < umbral
+    motivo = np.where(sin_apellidos, "Sin apellidos", "Similitud baja")
+    no_emparejados = sin_apellidos | similitud_baja
+    return pd.DataFrame({
+        "NOMBRE DEL INVESTIGADOR": dataset_sin["NOMBRE DEL INVESTIGADOR"].to_numpy()[no_emparejados],
+        "MOTIVO": motivo[no_emparejados],
+        "SIMILITUD": np.where(sin_apellidos, 0.0, similitud)[no_emparejados],
+    })
+
+
+def procesar_archivo(nombres_limpios, ruta_sin=ruta_dataset_sin, ruta_salida=ruta_nombres_limpios):
     """Función principal."""
-    dataset_sin = pd.read_csv("Limpieza/datasetSIN.csv", header=None, names=["NOMBRE DEL INVESTIGADOR"])
+    dataset_sin = pd.read_csv(ruta_sin)
     # Separamos los nombres
-    separar(dataset_sin)
+    dataset_sin = separar(dataset_sin)
+    nombres_limpios = separar(nombres_limpios)
 
-    # Iterar por cada fila en datasetSIN con barra de progreso
-    logging.info("Iniciando el proceso de comparación.")
-    for _, fila in tqdm(dataset_sin.iterrows(), total=dataset_sin.shape[0], desc="Procesando filas"):
-        analizar_similitudes(fila, nombres_limpios)
+    logger.info("Iniciando el proceso de comparación.")
+    no_emparejados = analizar_similitudes(dataset_sin, nombres_limpios)
+    logger.info(f"Nombres sin coincidencia: {len(no_emparejados)}")
 
     # Combinar nombres no emparejados con la lista limpia existente
-    logging.info("Combinando los nombres no emparejados con la lista existente.")
+    logger.info("Combinando los nombres no emparejados con la lista existente.")
     nombres_actualizados = pd.concat([
         nombres_limpios[["NOMBRE DEL INVESTIGADOR"]],
-        pd.DataFrame(nombres_no_emparejados, columns=["NOMBRE DEL INVESTIGADOR"])
+        no_emparejados[["NOMBRE DEL INVESTIGADOR"]]
     ]).drop_duplicates().sort_values(by="NOMBRE DEL INVESTIGADOR")
 
     # Guardar el resultado final
-    logging.info("Guardando el archivo final.")
-    nombres_actualizados.to_csv("Nombres_Limpios_Final.csv", index=False, header=True, encoding='utf-8-sig')
-
-    logging.info("El proceso ha terminado. Los nombres actualizados se han guardado en 'Nombres_Limpios_Final.csv'.")
-
-def main():
-    procesar_nombres_faltantes()
-    procesar_archivo()
+    logger.info("Guardando el archivo final.")
+    nombres_actualizados.to_csv(ruta_salida, index=False, header=True, encoding='utf-8-sig')
+
+    logger.info(f"El proceso ha terminado. Los nombres actualizados se han guardado en '{ruta_salida}'.")
+    return nombres_actualizados
+
+def main(ruta_entrada=ruta_dataset, ruta_nombres=ruta_nombres_limpios, ruta_salida=ruta_nombres_limpios,
+         ruta_sin=ruta_dataset_sin):
+    """
+    Agrega a la lista de nombres limpios los nombres del dataset que no tienen
+    coincidencia. Por defecto la lista se actualiza en el mismo archivo; con
+    ruta_salida distinta de ruta_nombres la lista de entrada no se modifica.
+    """
+    # Cargar los archivos
+    logger.info("Cargando los archivos...")
+    dataset = pd.read_csv(ruta_entrada, low_memory=False)
+    nombres_limpios = pd.read_csv(ruta_nombres)
+
+    procesar_nombres_faltantes(dataset, ruta_sin)
+    procesar_archivo(nombres_limpios, ruta_sin, ruta_salida)
 
 if __name__ == "__main__":
-   # Cargar los archivos
-   logger.info("Cargando los archivos...")
-   dataset = pd.read_csv("datasetF.csv")
-   nombres_limpios = pd.read_csv("Nombres_Limpios_Final.csv")
-
-   main()
\ No newline at end of file
+    main()
@@ -1,7 +1,10 @@
+import time
 import logging
-from tqdm import tqdm
+import argparse
 import pandas as pd
-from rapidfuzz import process, fuzz
+from Limpieza.LimpiezaDatos import leer_combinado
+from Limpieza.Bloqueo import buscar_coincidencias
+from Limpieza.Perfil import perfilar, verificar_perfil, guardar_perfil
 
 # Configuración de logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -9,7 +12,11 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 def cargar_archivos(dataset_path, nombres_path):
     """Carga los archivos CSV y retorna los DataFrames."""
     logging.info(f"Cargando archivo {dataset_path}...")
-    dataset_dm = pd.read_csv(dataset_path, low_memory=False)
+    # El combinado de LimpiezaDatos es un Parquet con tipos declarados
+    if dataset_path.endswith(".parquet"):
+        dataset_dm = leer_combinado(dataset_path)
+    else:
+        dataset_dm = pd.read_csv(dataset_path, low_memory=False)
     logging.info(f"Archivo {dataset_path} cargado con éxito.")
 
     logging.info(f"Cargando archivo {nombres_path}...")
@@ -18,26 +25,39 @@ def cargar_archivos(dataset_path, nombres_path):
     
     return dataset_dm, nombres_limpios
 
-def inspeccionar_tipos_mixtos(df):
-    """Identifica columnas con tipos mixtos en un DataFrame."""
+def inspeccionar_tipos_mixtos(df, ruta_perfil=None):
+    """
+    Identifica columnas con tipos mixtos en un DataFrame a partir de su perfil
+    (Limpieza/Perfil.py). Si se indica ruta_perfil, guarda el perfil como JSON.
+    Devuelve la lista de problemas encontrados.
+    """
     logging.info("Inspeccionando columnas con tipos mixtos...")
-    mixed_columns = []
-    for column in df.columns:
-        unique_types = df[column].apply(type).unique()
-        if len(unique_types) > 1:
-            mixed_columns.append((column, unique_types))
-    if mixed_columns:
+    perfil = perfilar(df)
+    if ruta_perfil:
+        guardar_perfil(perfil, ruta_perfil)
+        logging.info(f"Perfil del dataset guardado en {ruta_perfil}")
+
+    problemas = verificar_perfil(perfil)
+    if problemas:
         logging.warning("Se encontraron columnas con tipos mixtos:")
-        for col, types in mixed_columns:
-            logging.warning(f"Columna: {col}, Tipos encontrados: {types}")
+        for problema in problemas:
+            logging.warning(problema)
     else:
         logging.info("No se encontraron columnas con tipos mixtos.")
+    return problemas
 
 def limpiar_columna_cvu(df):
     """Limpia la columna 'CVU' del DataFrame, manejando valores nulos o inválidos y eliminando filas no numéricas."""
     if "CVU" in df.columns:
         logging.info("Procesando columna 'CVU'...")
 
+        # En el Parquet combinado el CVU ya es entero: solo se quitan los nulos
+        if pd.api.types.is_integer_dtype(df['CVU']):
+            df = df[df['CVU'].notna()].copy()
+            df['CVU'] = df['CVU'].astype("float64")
+            logging.info("Columna 'CVU' procesada con éxito, filas sin CVU eliminadas.")
+            return df
+
         # Filtrar filas no numéricas en 'CVU' y crear una copia explícita
         df = df[df['CVU'].apply(lambda x: str(x).replace("-", "").strip().replace(".", "").isdigit())].copy()
 
@@ -57,40 +77,52 @@ def preparar_columna_investigador(df):
     logging.info("Columna 'INVESTIGADOR' creada y posicionada correctamente.")
     return df
 
-def encontrar_mejor_match(nombre, nombres_limpios, umbral=85):
-    """Encuentra el mejor match para un nombre usando RapidFuzz."""
-    mejor_match = process.extractOne(nombre, nombres_limpios, scorer=fuzz.ratio)
-    if mejor_match and mejor_match[1] >= umbral:
-        return mejor_match[0]
-    return ""
-
-def asignar_investigadores(dataset_dm, nombres_limpios):
-    """Asigna nombres de investigadores usando coincidencias basadas en RapidFuzz."""
+def asignar_investigadores(dataset_dm, nombres_limpios, umbral=85, bloqueo=False):
+    """
+    Asigna nombres de investigadores usando coincidencias basadas en RapidFuzz. Cada
+    nombre distinto se compara una sola vez (por lotes, en varios hilos) y el
+    resultado se asigna a todas sus filas. Con bloqueo cada nombre se compara solo
+    con los nombres limpios de sus bloques (Limpieza/Bloqueo.py).
+    """
     logging.info("Iniciando asignación de investigadores...")
+    inicio = time.perf_counter()
     nombres_limpios_list = nombres_limpios['NOMBRE DEL INVESTIGADOR'].tolist()
 
-    # usamos tqdm para mostrar el proceso
-    for index, row in tqdm(dataset_dm.iterrows(), total=dataset_dm.shape[0], desc="Asignando investigadores"):
-        nombre_original = row['NOMBRE DEL INVESTIGADOR']
-        mejor_match = encontrar_mejor_match(nombre_original, nombres_limpios_list)
-        dataset_dm.at[index, 'INVESTIGADOR'] = mejor_match
-        logging.debug(f"Procesado: {nombre_original} -> {mejor_match}")
-
-    logging.info("Asignación de investigadores completada.")
+    # Un mismo investigador aparece en varios padrones anuales
+    nombres = dataset_dm['NOMBRE DEL INVESTIGADOR']
+    nombres_unicos = [nombre for nombre in nombres.dropna().unique() if isinstance(nombre, str)]
+    logging.info(f"{len(nombres)} filas, {len(nombres_unicos)} nombres distintos contra {len(nombres_limpios_list)} nombres limpios")
+
+    indices, _ = buscar_coincidencias(nombres_unicos, nombres_limpios_list, umbral, bloqueo=bloqueo,
+                                      descripcion="Asignando investigadores")
+    asignacion = {
+        nombre: nombres_limpios_list[indice] if indice >= 0 else ""
+        for nombre, indice in zip(nombres_unicos, indices)
+    }
+    # Como object: en una columna categórica map devuelve categorías y fillna("") falla
+    dataset_dm['INVESTIGADOR'] = nombres.astype(object).map(asignacion).fillna("")
+
+    duracion = time.perf_counter() - inicio
+    asignadas = int((dataset_dm['INVESTIGADOR'] != "").sum())
+    logging.info(
+        f"Asignación de investigadores completada en {duracion:.1f} s "
+        f"({len(nombres_unicos) / max(duracion, 1e-9):.0f} nombres/s, {len(nombres) / max(duracion, 1e-9):.0f} filas/s); "
+        f"{asignadas} de {len(nombres)} filas con investigador."
+    )
     return dataset_dm
 
-def main():
-
-    # Archivos de entrada
-    dataset_path = "datasetMD.csv"
-    nombres_path = "Nombres_Limpios_Final.csv"
-    output_path = "Limpieza/datasetF.csv"
-
+def main(dataset_path="datasetMD.parquet", nombres_path="Nombres_Limpios_Final.csv",
+         output_path="Limpieza/datasetF.csv", perfil_path="Limpieza/perfil_datasetMD.json", bloqueo=True):
+    """
+    Asigna a cada fila del dataset combinado su nombre limpio y guarda el resultado.
+    Con perfil_path=None no se guarda el perfil del dataset. Con bloqueo (por
+    defecto) se registra el recall del bloqueo medido sobre una muestra.
+    """
     # Cargar los archivos
     dataset_dm, nombres_limpios = cargar_archivos(dataset_path, nombres_path)
 
     # Inspeccionar tipos mixtos
-    inspeccionar_tipos_mixtos(dataset_dm)
+    inspeccionar_tipos_mixtos(dataset_dm, perfil_path)
 
     # Limpiar la columna 'CVU'
     dataset_dm = limpiar_columna_cvu(dataset_dm)
@@ -99,7 +131,7 @@ def main():
     dataset_dm = preparar_columna_investigador(dataset_dm)
 
     # Asignar investigadores
-    dataset_dm = asignar_investigadores(dataset_dm, nombres_limpios)
+    dataset_dm = asignar_investigadores(dataset_dm, nombres_limpios, bloqueo=bloqueo)
 
     # Guardar el resultado
     logging.info(f"Guardando el archivo procesado en {output_path}...")
@@ -107,4 +139,7 @@ def main():
     logging.info(f"Archivo guardado con éxito en {output_path}.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Asigna a cada fila del dataset combinado su nombre limpio.")
+    parser.add_argument("--bloqueo", action=argparse.BooleanOptionalAction, default=True,
+                        help="Comparar solo contra los nombres limpios de los mismos bloques (por defecto, sí)")
+    main(bloqueo=parser.parse_args().bloqueo)
\ No newline at end of file
@@ -1,20 +1,21 @@
+import os
+import joblib
+import sklearn
 import streamlit as st
 import pandas as pd
 import plotly.graph_objs as go
 import re
-from Menu.utilidades import RUTA_PUBLICACIONES, RUTA_SNII, RUTA_MAESTRO, RUTA_PATENTES
+from Menu.utilidades import RUTA_PUBLICACIONES, RUTA_SNII, RUTA_PATENTES, RUTA_MAESTRO, RUTA_CACHE, RUTA_METRICAS
+from Menu.datos import cargar_tabla, hash_archivo, huella_archivo, huella_dataset, cargar_indice_busqueda, cargar_snii, cargar_patentes, cargar_mapas_busqueda, cargar_indice_investigadores, cargar_metricas
+from Menu.metricasAutores import calcular_metricas, COLUMNAS_METRICAS
+from Menu.figuras import CacheFiguras, RegistroVistas, iniciar_precalentamiento
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 import plotly.express as px
 
-# ----------------------- Ruta App ---------------------------------------------
-data = pd.read_csv(RUTA_PUBLICACIONES, encoding='utf-8')
-snii = pd.read_csv(RUTA_SNII)
-maestro = pd.read_csv(RUTA_MAESTRO, encoding='utf-8')
-patentes = pd.read_csv(RUTA_PATENTES, encoding='utf-8')
 # ----------------------- Funciones --------------------------------------------
 # Función para obtener los datos de un autor
-def obtener_datos_autor(nombre_autor, data, preprocessor):
+def obtener_datos_autor(nombre_autor, data, preprocessor=None):
     # Filtrar los datos del autor seleccionado
     autor_info = data[data['Investigador'] == nombre_autor]
     
@@ -32,86 +33,49 @@ def obtener_datos_autor(nombre_autor, data, preprocessor):
     # Extraer los datos del autor en el formato correcto
     input_data = autor_info[columnas_requeridas]
 
-    # Aplicar el preprocesamiento (estandarización y codificación OneHot)
-    input_data_encoded = preprocessor.transform(input_data)
-    
-    # Convertir csr_matrix a un array denso para el modelo
-    input_data_encoded = input_data_encoded.toarray()
-    
-    return input_data_encoded
+    # El preprocessor se construye (o se carga de disco) hasta que se necesita
+    if preprocessor is None:
+        preprocessor = obtener_preprocessor()
 
-# Función para procesar los datos del autor seleccionado
-def procesar_autor(df, autor_seleccionado):
-    """Procesa datos de un autor específico desde el año 2000 en adelante."""
-    # Filtrar y copiar datos del autor
-    df_filtrado = (
-        df.dropna(subset=['Investigador'])
-          .query("Investigador == @autor_seleccionado")
-          .copy()
-    )
+    # Aplicar el preprocesamiento (estandarización y codificación OneHot)
+    # Se conserva la salida dispersa (csr_matrix): el OneHot sobre títulos es muy ancho
+    return preprocessor.transform(input_data)
 
-    # Filtrar desde el año 2000 usando Publication Year
-    df_filtrado = df_filtrado[(df_filtrado['Publication Year'] >= 2000) & (df_filtrado['Publication Year'] <= 2024)]
+# Función para quedarse con el periodo analizado (2000–2024)
+def filtrar_periodo(df_autor):
+    """Filtra las publicaciones de un autor al periodo 2000–2024 usando Publication Year."""
+    return df_autor[(df_autor['Publication Year'] >= 2000) & (df_autor['Publication Year'] <= 2024)]
 
+# Función para procesar los datos del autor seleccionado
+def procesar_autor(df_autor):
+    """Procesa las publicaciones (ya filtradas por periodo) de un autor específico."""
     # Columnas fijas y dinámicas (años >=2000 con datos)
     columnas_especificas = ['Title', 'Publication Date', 'Total de Citas', 'Promedio por año']
 
     # Seleccionar y devolver
-    return df_filtrado[columnas_especificas].reset_index(drop=True)
+    return df_autor[columnas_especificas].reset_index(drop=True)
 
 # Función para calcular el resumen de citas
-def calcular_resumen(df, autor_seleccionado):
-    # Filtrar y copiar datos del autor
-    df = (
-        df.dropna(subset=['Investigador'])
-          .query("Investigador == @autor_seleccionado")
-          .copy()
-    )
-    df = df[(df['Publication Year'] >= 2000) & (df['Publication Year'] <= 2024)]
-
-    resumen = []
-
-    # Obtener los autores únicos
-    autores = df['Investigador'].unique()
-
-    for autor in autores:
-        # Filtrar los datos para el autor actual
-        df_autor = df[df['Investigador'] == autor]
-
-        # Calcular la suma de 'Total de Citas', el promedio de 'Promedio por año', y el índice h
-        total_publicaciones = df_autor['Title'].count()
-        total_citations = df_autor['Total de Citas'].sum()
-        average_per_year = df_autor['Promedio por año'].mean()
-        # Calcular el índice h
-        citas = df_autor['Total de Citas'].sort_values(ascending=False).values
-        h_index = sum(c >= i + 1 for i, c in enumerate(citas))
-
-        # Agregar los datos al resumen
-        resumen.append({
-            'Publicaciones': total_publicaciones,
-            'Total Citas': total_citations,
-            'Promedio Año': average_per_year,
-            'Índice h': h_index
-        })
-
-    # Convertir el resumen en un DataFrame
-    return pd.DataFrame(resumen)
+def calcular_resumen(df_autor):
+    """Resumen de citas de un autor a partir de sus publicaciones del periodo."""
+    return calcular_metricas(df_autor).reset_index(drop=True)
+
+# Función para obtener el resumen de la tabla materializada (o calcularlo)
+def obtener_resumen(metricas, df_autor, autor_seleccionado):
+    if metricas is not None and autor_seleccionado in metricas.index:
+        resumen = metricas.loc[[autor_seleccionado], COLUMNAS_METRICAS].reset_index(drop=True)
+        # Sin publicaciones en el periodo se muestra el mensaje de "sin datos"
+        return resumen if resumen.at[0, 'Publicaciones'] > 0 else pd.DataFrame()
+    return calcular_resumen(df_autor)
 
 # Función para gráfica las citas y publicaciones por año
 def graficar_citas_publicaciones(df_autor, autor_seleccionado, df_patentes, df_snii):
-    # Filtrar autor
-    df_autor = (
-        df_autor.dropna(subset=['Investigador'])
-          .query("Investigador == @autor_seleccionado")
-          .copy()
-    )
-    df_autor = df_autor[(df_autor['Publication Year'] >= 2000) & 
-                        (df_autor['Publication Year'] <= 2024)]
-    df_autor['Year'] = df_autor['Publication Year'].astype(int)
+    # df_autor ya contiene solo las publicaciones del autor en el periodo
+    años_publicacion = df_autor['Publication Year'].astype(int)
     # Agrupar por el año y contar el número de publicaciones
-    publicaciones_por_año = df_autor.groupby('Year').size()
+    publicaciones_por_año = df_autor.groupby(años_publicacion).size()
     # Agrupar por el año y sumar el total de citas
-    citas_por_año = df_autor.groupby('Year')['Total de Citas'].sum()
+    citas_por_año = df_autor.groupby(años_publicacion)['Total de Citas'].sum()
     # Obtener los años únicos para la gráfica
     años = sorted(publicaciones_por_año.index)
     # Obtener el valor máximo para escalar ejes
@@ -223,37 +187,115 @@ def graficar_citas_publicaciones(df_autor, autor_seleccionado, df_patentes, df_s
         )
     )
 
-    # Mostrar la gráfica en Streamlit
-    st.plotly_chart(fig)
+    return fig
+
+# Gráficas de pastel del SNII: (llave de la figura, columna, título)
+PASTELES_SNII = [
+    ('areas', 'ÁREA DEL CONOCIMIENTO', "Áreas del Conocimiento"),
+    ('disciplinas', 'DISCIPLINA', "Disciplinas"),
+    ('subdisciplinas', 'SUBDISCIPLINA', "Subdisciplinas"),
+]
+
+# Función para construir todas las figuras del perfil de un autor
+def crear_figuras_autor(autor_seleccionado, indice, patentes, df_autor, df_periodo, df_patentes, df_snii):
+    """
+    Construye las figuras del perfil (citas/publicaciones y gráficas de pastel) a partir
+    de las tablas del autor ya calculadas y las devuelve como {llave: go.Figure}.
+    """
+    figuras = {'citas': graficar_citas_publicaciones(df_periodo, autor_seleccionado, df_patentes, df_snii)}
+
+    for llave, columna, titulo in PASTELES_SNII:
+        if columna in df_snii.columns:
+            valores = df_snii[columna].explode().dropna()
+            if not valores.empty:
+                figuras[llave] = px.pie(names=valores, title=titulo, hole=0.3)
+
+    # Gráfica de pastel: Publicaciones del autor vs. total general
+    total_publicaciones_autor = df_autor['Title'].count()
+    total_publicaciones_otros = indice.total_titulos - total_publicaciones_autor
+    figuras['publicaciones'] = px.pie(
+        names=['Autor seleccionado', 'Otros investigadores'],
+        values=[total_publicaciones_autor, total_publicaciones_otros],
+        title="Proporción de publicaciones",
+        hole=0.3
+    )
+
+    # Gráfica de pastel: Patentes del autor vs. total general
+    if not patentes.empty:
+        total_patentes_autor = df_patentes['Total Patentes'].sum() if not df_patentes.empty else 0
+        total_patentes_general = patentes['Patents'].sum() if 'Patents' in patentes.columns else patentes['Total Patentes'].sum()
+        total_patentes_otros = total_patentes_general - total_patentes_autor
+        figuras['patentes'] = px.pie(
+            names=['Autor seleccionado', 'Otros investigadores'],
+            values=[total_patentes_autor, total_patentes_otros],
+            title="Proporción de patentes",
+            hole=0.3
+        )
 
+    return figuras
 
+# Función para construir el perfil completo de un autor
+def crear_perfil_autor(autor_seleccionado, indice, snii, patentes, mapas, metricas):
+    """
+    Tablas y figuras del perfil en un solo dict: 'publicaciones', 'resumen',
+    'patentes', 'snii' (DataFrames) y 'figuras' ({llave: go.Figure}). Las figuras
+    se comparten entre sesiones: no deben modificarse después de construirse.
+    Devuelve None si el autor no existe.
+    """
+    if autor_seleccionado not in indice:
+        return None
+    # Filas del autor a partir del índice (una sola búsqueda por autor)
+    df_autor = indice.filas(autor_seleccionado)
+    df_periodo = filtrar_periodo(df_autor)
+    df_patentes = buscar_datos_patentes(mapas, patentes, autor_seleccionado)
+    df_snii = buscar_datos_snii(mapas, snii, autor_seleccionado)
+    return {
+        'publicaciones': procesar_autor(df_periodo),
+        # Resumen de la tabla de métricas (o calculado si no está disponible)
+        'resumen': obtener_resumen(metricas, df_periodo, autor_seleccionado),
+        'patentes': df_patentes,
+        'snii': df_snii,
+        'figuras': crear_figuras_autor(autor_seleccionado, indice, patentes, df_autor, df_periodo, df_patentes, df_snii),
+    }
 
+# ----------------------- Caché de perfiles ------------------------------------
+@st.cache_resource(show_spinner=False)
+def cargar_cache_figuras():
+    """Caché LRU de perfiles y registro de vistas, compartidos por todas las sesiones."""
+    return CacheFiguras(), RegistroVistas()
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _precalentar_figuras(version, _construir):
+    # Se ejecuta una vez por versión de los datasets en cada proceso
+    cache, vistas = cargar_cache_figuras()
+    return iniciar_precalentamiento(cache, vistas, version, _construir)
+
+# Función para obtener el perfil de un autor (de la caché o construyéndolo)
+def obtener_perfil_autor(autor_seleccionado, version, construir):
+    """Perfil del autor para esta versión de los datasets; construir(autor) lo calcula si no está en la caché."""
+    cache, _ = cargar_cache_figuras()
+    perfil = cache.obtener((autor_seleccionado, version))
+    if perfil is None:
+        perfil = construir(autor_seleccionado)
+        if perfil is not None:
+            cache.guardar((autor_seleccionado, version), perfil)
+    return perfil
+
+def mostrar_figura(figuras, llave, **kwargs):
+    """Muestra una figura del perfil si existe."""
+    if llave in figuras:
+        st.plotly_chart(figuras[llave], **kwargs)
 
 #Funcion para mostrar los datos de Patentes
-def buscar_datos_patentes(maestro, patentes, autor_seleccionado):
+def buscar_datos_patentes(mapas, patentes, autor_seleccionado):
     """
-    Busca en el maestro el inventor_id del autor seleccionado
+    Busca en los mapas del maestro los inventor_id del autor seleccionado
     y retorna un DataFrame con sus patentes.
     """
-    # Eliminamos los NAN de la columna 'inventor_id'
-    maestro = maestro.dropna(subset=['inventor_id'])
-    # Normalizar tipo y formato de inventor_id
-    maestro['inventor_id']  = maestro['inventor_id'].astype(str).str.strip()
-    patentes['inventor_id'] = patentes['inventor_id'].astype(str).str.strip()
-
-    # Obtener inventor_id(s) del maestro
-    raw_ids = maestro.loc[
-        maestro['NOMBRE SNII'].str.strip() == autor_seleccionado.strip(),
-        'inventor_id'
-    ]
-    ids = [i for i in raw_ids.unique() if i and i.lower() != 'nan']
-    if len(ids) == 0:
+    # Filas de patentes del autor (acceso a diccionario, sin recorrer las tablas)
+    posiciones = mapas.posiciones_patentes(autor_seleccionado)
+    if len(posiciones) == 0:
         return pd.DataFrame()  # sin coincidencias
-    
-    # debug: ver ids encontrados
-    # st.write("IDs encontrados:", ids)
-    # Renombramos las columnas years active y Cites
-    patentes.rename(columns={'years active': 'Años activos', 'Cites': 'Citas', 'Patents':'Total Patentes'}, inplace=True)
 
     # Columnas a extraer
     cols = [
@@ -266,49 +308,28 @@ def buscar_datos_patentes(maestro, patentes, autor_seleccionado):
         'Nacionalidad'
     ]
 
-    # Filtrar por inventor_id y devolver
+    # Renombramos las columnas years active y Cites solo en el resultado
     return (
         patentes
-        .loc[patentes['inventor_id'].isin(ids), cols]
+        .take(posiciones)
+        .rename(columns={'years active': 'Años activos', 'Cites': 'Citas', 'Patents':'Total Patentes'})
+        .loc[:, cols]
         .reset_index(drop=True)
     )
 
 # Funcion para mostrar los datos del SNII
-def buscar_datos_snii(maestro, snii, autor_seleccionado):
+def buscar_datos_snii(mapas, snii, autor_seleccionado):
     """
-    Busca el CVU del autor en el maestro y filtra el DataFrame snii.
+    Busca el CVU del autor en los mapas del maestro y toma sus filas del snii.
     Calcula el rango de años activos y extrae el último estado y áreas temáticas.
     """
-    # 1. Preparar maestro: quedarnos solo with NOMBRE SNII y CVU válidos
-    df_m = (
-        maestro
-        .dropna(subset=['NOMBRE SNII','CVU'])
-        .assign(
-            **{
-                'NOMBRE SNII': lambda d: d['NOMBRE SNII'].astype(str).str.strip(),
-                'CVU':          lambda d: d['CVU'].astype(str).str.strip()
-            }
-        )
-    )
-    # 2. Obtener CVU(s) del autor
-    cvus = df_m.loc[
-        df_m['NOMBRE SNII'] == autor_seleccionado.strip(),
-        'CVU'
-    ].unique().tolist()
-    cvus = [c for c in cvus if c and c.lower() != 'nan']
-    if not cvus:
+    # 1. Filas del SNII de los CVU del autor
+    posiciones = mapas.posiciones_snii(autor_seleccionado)
+    if len(posiciones) == 0:
         return pd.DataFrame()
+    df_s = snii.take(posiciones)
 
-    # 3. Filtrar snii por esos CVU
-    df_s = (
-        snii
-        .assign(CVU=lambda d: d['CVU'].astype(str).str.strip())
-        .loc[lambda d: d['CVU'].isin(cvus)]
-    )
-    if df_s.empty:
-        return pd.DataFrame()
-
-    # 4. Calcular rango de años activos
+    # 2. Calcular rango de años activos
     años = (
         pd.to_numeric(df_s['AÑO'], errors='coerce')
           .dropna()
@@ -318,11 +339,11 @@ def buscar_datos_snii(maestro, snii, autor_seleccionado):
     inicio, fin = (años.min(), años.max()) if not años.empty else (None, None)
     rango_activo = f"{inicio} - {fin}" if inicio is not None and fin is not None else ""
 
-    # 5. Extraer último registro (por año máximo)
+    # 3. Extraer último registro (por año máximo)
     idx_ult = años.idxmax()
     ultimo = df_s.loc[idx_ult]
 
-    # 6. Construir resultado
+    # 4. Construir resultado
     resultado = {
         'Años Activos':              [rango_activo],
         'NOBILIS':                   [ultimo.get('NOBILIS')],
@@ -339,44 +360,91 @@ def buscar_datos_snii(maestro, snii, autor_seleccionado):
     return pd.DataFrame(resultado)
 
 # ----------------------- Preprocessor -----------------------------------------
-# Creación del preprocessor una vez
-numeric_features = ['Total de Citas', 'Promedio por año'] + \
-    [col for col in data.columns if col.isdigit() and 2000 <= int(col) <= 2024]
+# El preprocessor se ajusta solo cuando obtener_datos_autor lo necesita y se
+# guarda en disco con el hash del dataset, así los siguientes arranques lo cargan.
 categorical_features = ['Title', 'Investigador', 'Corporate Authors', 'Book Editors', 'Source Title']
 
-preprocessor = ColumnTransformer(
-    transformers=[
-        ('num', StandardScaler(), numeric_features),
-        ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
-    ])
-
-# Ajustar el preprocesador a los datos completos
-preprocessor.fit(data)
+# Función para crear y ajustar el preprocessor
+def crear_preprocessor(data):
+    numeric_features = ['Total de Citas', 'Promedio por año'] + \
+        [col for col in data.columns if col.isdigit() and 2000 <= int(col) <= 2024]
+
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), numeric_features),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
+        ])
+
+    # Ajustar el preprocesador a los datos completos
+    return preprocessor.fit(data)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _cargar_preprocessor(ruta, hash_datos):
+    """Carga el preprocessor persistido para este hash o lo ajusta y lo guarda."""
+    nombre = f"preprocessor_{hash_datos[:16]}_sklearn{sklearn.__version__}.joblib"
+    ruta_modelo = os.path.join(RUTA_CACHE, nombre)
+    if os.path.exists(ruta_modelo):
+        try:
+            return joblib.load(ruta_modelo)
+        except Exception:
+            pass  # Archivo dañado o incompatible: se vuelve a ajustar
+
+    preprocessor = crear_preprocessor(cargar_tabla(ruta))
+
+    # Guardar de forma atómica y eliminar versiones anteriores
+    os.makedirs(RUTA_CACHE, exist_ok=True)
+    temporal = f"{ruta_modelo}.{os.getpid()}.tmp"
+    joblib.dump(preprocessor, temporal)
+    os.replace(temporal, ruta_modelo)
+    for archivo in os.listdir(RUTA_CACHE):
+        if archivo.startswith("preprocessor_") and archivo != nombre and archivo.endswith(".joblib"):
+            os.remove(os.path.join(RUTA_CACHE, archivo))
+    return preprocessor
+
+# Función para obtener el preprocessor del dataset de publicaciones
+def obtener_preprocessor(ruta=RUTA_PUBLICACIONES):
+    return _cargar_preprocessor(ruta, hash_archivo(ruta))
 # ----------------------- Streamlit --------------------------------------------
+# Número máximo de investigadores que se muestran en el selector
+MAXIMO_OPCIONES = 20
+
 def mostrar_buscar_investigador(rutaWoS):
-    # Cargar el archivo CSV y eliminar duplicados de autores
-    dfWoS = pd.read_csv(rutaWoS)
-    autores_unicos = dfWoS['Investigador'].drop_duplicates().sort_values()
+    # Datasets compartidos por el proceso (se leen una sola vez)
+    indice = cargar_indice_investigadores(rutaWoS)
+    snii = cargar_snii()
+    patentes = cargar_patentes()
+    mapas = cargar_mapas_busqueda()
+
+    metricas = cargar_metricas()
+
+    # Versión de los datasets (y de la tabla de métricas): forma parte de la llave de la caché de perfiles
+    version = tuple(huella_dataset(ruta) for ruta in (rutaWoS, RUTA_SNII, RUTA_PATENTES, RUTA_MAESTRO))
+    version += (huella_archivo(RUTA_METRICAS) if metricas is not None else None,)
+    construir = lambda autor: crear_perfil_autor(autor, indice, snii, patentes, mapas, metricas)
+    _precalentar_figuras(version, construir)
 
     # Configuración de la app en Streamlit
     st.title("📊 Análisis de Investigadores")
 
-    # Selector de autor
-    # Lista original de autores
-    autores = list(autores_unicos)
-
-    # Si ya hay selección previa, rotamos la lista para que empiece por ella
-    if 'autor_seleccionado' in st.session_state:
-        sel = st.session_state.autor_seleccionado
-        if sel in autores:
-            i = autores.index(sel)
-            opciones = autores[i:] + autores[:i]
-        else:
-            opciones = autores
+    # Buscador de autor: solo se envían al navegador las mejores coincidencias
+    consulta = st.text_input(
+        "Buscar investigador",
+        key="consulta_investigador",
+        placeholder="Escribe parte del nombre (sin importar acentos ni mayúsculas)"
+    )
+    if consulta.strip():
+        opciones = cargar_indice_busqueda(rutaWoS).buscar(consulta, limite=MAXIMO_OPCIONES)
+        if not opciones:
+            st.write("No se encontraron investigadores para esa búsqueda.")
     else:
-        opciones = autores
+        # Sin búsqueda: la selección previa y los investigadores más consultados
+        _, vistas = cargar_cache_figuras()
+        opciones = [autor for autor in vistas.mas_vistos(MAXIMO_OPCIONES) if autor in indice]
+        opciones = opciones or indice.autores[:MAXIMO_OPCIONES]
+        sel = st.session_state.get('autor_seleccionado')
+        if sel in indice and sel not in opciones:
+            opciones = [sel] + opciones
 
-    # Desplegable con la lista rotada
     autor_seleccionado = st.selectbox(
         "Selecciona un investigador",
         opciones,
@@ -386,19 +454,25 @@ def mostrar_buscar_investigador(rutaWoS):
 
     # Mostrar automáticamente los datos del autor seleccionado
     if autor_seleccionado:
+        # Contar la vista solo cuando cambia la selección (no en cada rerun)
+        if st.session_state.get('ultimo_autor_visto') != autor_seleccionado:
+            st.session_state.ultimo_autor_visto = autor_seleccionado
+            cargar_cache_figuras()[1].registrar(autor_seleccionado)
         try:
-            # Procesar la información del autor seleccionado
-            df_publicaciones = procesar_autor(dfWoS, autor_seleccionado)
-            # Calcular el resumen
-            df_resumen = calcular_resumen(dfWoS, autor_seleccionado)
-            # Busca los datos de la patentes
-            df_patentes = buscar_datos_patentes(maestro, patentes, autor_seleccionado)
-            # Busca los datos del SNII
-            df_snii = buscar_datos_snii(maestro, snii, autor_seleccionado)
+            # Tablas y figuras del perfil (de la caché si el autor ya se consultó en esta versión)
+            perfil = obtener_perfil_autor(autor_seleccionado, version, construir)
+            if perfil is None:
+                st.write("No se encontraron publicaciones para este autor.")
+                return
+            df_publicaciones = perfil['publicaciones']
+            df_resumen = perfil['resumen']
+            df_patentes = perfil['patentes']
+            df_snii = perfil['snii']
+            figuras = perfil['figuras']
 
             st.write(f"## Información para {autor_seleccionado}")
             # Gráfica con los datos
-            graficar_citas_publicaciones(dfWoS, autor_seleccionado, df_patentes, df_snii)
+            mostrar_figura(figuras, 'citas')
             # Dividir en dos columnas con proporciones ajustadas
             col1, col3 = st.columns([1, 2])
             col2 = st.columns([2])[0]
@@ -432,69 +506,15 @@ def mostrar_buscar_investigador(rutaWoS):
                     st.dataframe(df_snii.T)
 
             # Agregar las gráficas de pastel en una sola línea
-            col4_1, col4_2, col4_3 = st.columns(3)
-            with col4_1:
-                if 'ÁREA DEL CONOCIMIENTO' in df_snii.columns:
-                    areas = df_snii['ÁREA DEL CONOCIMIENTO'].explode().dropna()
-                    if not areas.empty:
-                        fig_area = px.pie(
-                            names=areas,
-                            title="Áreas del Conocimiento",
-                            hole=0.3
-                        )
-                        st.plotly_chart(fig_area, use_container_width=True)
-            with col4_2:
-                if 'DISCIPLINA' in df_snii.columns:
-                    disciplinas = df_snii['DISCIPLINA'].explode().dropna()
-                    if not disciplinas.empty:
-                        fig_disciplina = px.pie(
-                            names=disciplinas,
-                            title="Disciplinas",
-                            hole=0.3
-                        )
-                        st.plotly_chart(fig_disciplina, use_container_width=True)
-            with col4_3:
-                if 'SUBDISCIPLINA' in df_snii.columns:
-                    subdisciplinas = df_snii['SUBDISCIPLINA'].explode().dropna()
-                    if not subdisciplinas.empty:
-                        fig_subdisciplina = px.pie(
-                            names=subdisciplinas,
-                            title="Subdisciplinas",
-                            hole=0.3
-                        )
-                        st.plotly_chart(fig_subdisciplina, use_container_width=True)
-
-            # Gráfica de pastel: Publicaciones del autor vs. total general
-            total_publicaciones_autor = dfWoS[dfWoS['Investigador'] == autor_seleccionado]['Title'].count()
-            total_publicaciones_otros = dfWoS['Title'].count() - total_publicaciones_autor
-
-            # Gráfica de pastel: Patentes del autor vs. total general
-            if not patentes.empty:
-                total_patentes_autor = df_patentes['Total Patentes'].sum() if not df_patentes.empty else 0
-                total_patentes_general = patentes['Patents'].sum() if 'Patents' in patentes.columns else patentes['Total Patentes'].sum()
-                total_patentes_otros = total_patentes_general - total_patentes_autor
-            else:
-                total_patentes_autor = 0
-                total_patentes_otros = 0
+            for columna, (llave, _, _) in zip(st.columns(3), PASTELES_SNII):
+                with columna:
+                    mostrar_figura(figuras, llave, use_container_width=True)
 
             col_pie1, col_pie2 = st.columns(2)
             with col_pie1:
-                fig_pub = px.pie(
-                    names=['Autor seleccionado', 'Otros investigadores'],
-                    values=[total_publicaciones_autor, total_publicaciones_otros],
-                    title="Proporción de publicaciones",
-                    hole=0.3
-                )
-                st.plotly_chart(fig_pub, use_container_width=True)
+                mostrar_figura(figuras, 'publicaciones', use_container_width=True)
             with col_pie2:
-                if not patentes.empty:
-                    fig_pat = px.pie(
-                        names=['Autor seleccionado', 'Otros investigadores'],
-                        values=[total_patentes_autor, total_patentes_otros],
-                        title="Proporción de patentes",
-                        hole=0.3
-                    )
-                    st.plotly_chart(fig_pat, use_container_width=True)
+                mostrar_figura(figuras, 'patentes', use_container_width=True)
 
         except Exception as e:
             st.error(f"Error procesando los datos: {e}")
\ No newline at end of file
@@ -0,0 +1,159 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+import networkx as nx
+from Menu.utilidades import RUTA_PUBLICACIONES, RUTA_COAUTORIA, RUTA_POSICIONES_COAUTORIA
+from Menu.snapshots import leer_tabla
+
+# Configuración de logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# ----------------------- Red de coautoría -------------------------------------
+# Lista de aristas (autor_a, autor_b, peso) construida a partir del campo
+# 'Authors' de datasetWoS: el peso es el número de publicaciones en común.
+# Junto a la lista se guardan las posiciones de todos los autores (layout de la
+# red completa); la app solo filtra las posiciones de los nodos que quedan
+# después de la poda. Ambas se regeneran con:
+#   python -m Menu.coautoria
+COLUMNAS_ARISTAS = ['Autor A', 'Autor B', 'Peso']
+COLUMNAS_POSICIONES = ['Autor', 'x', 'y']
+# Publicaciones con más autores (consorcios) no se usan: generan n² aristas
+MAXIMO_AUTORES_PUBLICACION = 50
+# El layout de fuerzas (spring) es O(n²) por iteración: en componentes más grandes
+# solo se aplica a los autores con más coautorías y el resto se ubica junto a sus
+# coautores ya ubicados
+MAXIMO_NODOS_SPRING = 2000
+ITERACIONES_SPRING = 50
+
+# Función para construir la lista de aristas de coautoría
+def construir_aristas(df, maximo_autores=MAXIMO_AUTORES_PUBLICACION):
+    """
+    Devuelve un DataFrame con una fila por par de coautores y su número de
+    publicaciones en común. Las publicaciones repetidas (la misma publicación en
+    la exportación de varios investigadores) se cuentan una sola vez.
+    """
+    publicaciones = df[['Title', 'Authors']].dropna().drop_duplicates().reset_index(drop=True)
+
+    # Una fila por (publicación, autor)
+    autores = publicaciones['Authors'].str.split(';').explode().str.strip()
+    autores = autores[autores != '']
+    pares = pd.DataFrame({'publicacion': autores.index.to_numpy(), 'autor': autores.to_numpy()}).drop_duplicates()
+    por_publicacion = pares.groupby('publicacion')['autor'].transform('size')
+    pares = pares[(por_publicacion > 1) & (por_publicacion <= maximo_autores)]
+
+    # Todos los pares de autores de cada publicación (autor A < autor B)
+    cruce = pares.merge(pares, on='publicacion', suffixes=(' A', ' B'))
+    cruce = cruce[cruce['autor A'] < cruce['autor B']]
+
+    aristas = (
+        cruce.groupby(['autor A', 'autor B']).size()
+             .reset_index(name='Peso')
+             .rename(columns={'autor A': 'Autor A', 'autor B': 'Autor B'})
+             .sort_values('Peso', ascending=False, kind='stable')
+             .reset_index(drop=True)
+    )
+    return aristas[COLUMNAS_ARISTAS]
+
+def leer_aristas(ruta=RUTA_COAUTORIA):
+    """Lee la lista de aristas persistida (vacía si no existe)."""
+    if not os.path.exists(ruta):
+        return pd.DataFrame(columns=COLUMNAS_ARISTAS)
+    return pd.read_csv(ruta)
+
+# Función para podar la red
+def podar_aristas(aristas, peso_minimo=1, grado_minimo=1, maximo_aristas=None):
+    """
+    Conserva las aristas con peso >= peso_minimo cuyos dos extremos tienen al menos
+    grado_minimo coautores y, si se indica, solo las maximo_aristas de mayor peso.
+    """
+    aristas = aristas[aristas['Peso'] >= peso_minimo]
+    if grado_minimo > 1 and not aristas.empty:
+        grados = pd.concat([aristas['Autor A'], aristas['Autor B']]).value_counts()
+        validos = grados.index[grados.to_numpy() >= grado_minimo]
+        aristas = aristas[aristas['Autor A'].isin(validos) & aristas['Autor B'].isin(validos)]
+    if maximo_aristas is not None and len(aristas) > maximo_aristas:
+        aristas = aristas.nlargest(maximo_aristas, 'Peso', keep='first')
+    return aristas.reset_index(drop=True)
+
+# ----------------------- Layout -----------------------------------------------
+def _layout_componente(G, rng):
+    """Posiciones de una componente conexa, centradas en 0 y dentro de [-1, 1]."""
+    nodos = list(G.nodes)
+    if len(nodos) <= 2:
+        return {nodo: (x, 0.0) for nodo, x in zip(nodos, (-0.5, 0.5) if len(nodos) == 2 else (0.0,))}
+    if len(nodos) <= MAXIMO_NODOS_SPRING:
+        return nx.spring_layout(G, seed=42, iterations=ITERACIONES_SPRING)
+
+    # Layout de fuerzas sobre los autores con más coautorías (ponderadas)
+    grados = dict(G.degree(weight='weight'))
+    principales = sorted(nodos, key=grados.get, reverse=True)[:MAXIMO_NODOS_SPRING]
+    pos = nx.spring_layout(G.subgraph(principales), seed=42, iterations=ITERACIONES_SPRING)
+
+    # Los demás, en orden de cercanía (BFS), en el promedio de sus coautores ya ubicados
+    cola = list(principales)
+    for nodo in cola:
+        for vecino in G.neighbors(nodo):
+            if vecino not in pos:
+                ubicados = np.array([pos[v] for v in G.neighbors(vecino) if v in pos])
+                pos[vecino] = ubicados.mean(axis=0) + rng.normal(0, 0.02, 2)
+                cola.append(vecino)
+    return pos
+
+def calcular_posiciones(aristas):
+    """
+    Posiciones (Autor, x, y) de todos los autores de la lista de aristas. Cada
+    componente conexa se ubica por separado en un recuadro proporcional a la raíz
+    de su número de autores, y los recuadros se acomodan por filas, de mayor a menor.
+    """
+    if aristas.empty:
+        return pd.DataFrame(columns=COLUMNAS_POSICIONES)
+    G = nx.Graph()
+    G.add_weighted_edges_from(aristas[COLUMNAS_ARISTAS].itertuples(index=False, name=None))
+    componentes = sorted(nx.connected_components(G), key=len, reverse=True)
+    lados = np.sqrt([len(componente) for componente in componentes])
+    ancho_fila = max(lados[0], np.sqrt((lados ** 2).sum()))
+    rng = np.random.default_rng(42)
+
+    autores, xs, ys = [], [], []
+    x0 = y0 = alto_fila = 0.0
+    for componente, lado in zip(componentes, lados):
+        if x0 > 0 and x0 + lado > ancho_fila:
+            x0, y0, alto_fila = 0.0, y0 - alto_fila * 1.1, 0.0
+        pos = _layout_componente(G.subgraph(componente), rng)
+        coordenadas = np.array(list(pos.values()), dtype=float)
+        # Llevar la componente a su recuadro (lado × lado)
+        minimo, maximo = coordenadas.min(axis=0), coordenadas.max(axis=0)
+        escala = lado / max(float((maximo - minimo).max()), 1e-9)
+        coordenadas = (coordenadas - minimo) * escala * 0.9
+        autores.extend(pos.keys())
+        xs.extend(x0 + coordenadas[:, 0])
+        ys.extend(y0 - coordenadas[:, 1])
+        x0 += lado * 1.1
+        alto_fila = max(alto_fila, lado)
+    return pd.DataFrame({'Autor': autores, 'x': xs, 'y': ys})
+
+def leer_posiciones(ruta=RUTA_POSICIONES_COAUTORIA):
+    """Lee las posiciones persistidas (vacías si no existen)."""
+    if not os.path.exists(ruta):
+        return pd.DataFrame(columns=COLUMNAS_POSICIONES)
+    return pd.read_csv(ruta)
+
+def _guardar_csv(df, ruta):
+    temporal = f"{ruta}.tmp"
+    df.to_csv(temporal, index=False)
+    os.replace(temporal, ruta)
+
+# Función principal del proceso por lotes
+def main(ruta_publicaciones=RUTA_PUBLICACIONES, ruta_aristas=RUTA_COAUTORIA, ruta_posiciones=RUTA_POSICIONES_COAUTORIA):
+    aristas = construir_aristas(leer_tabla(ruta_publicaciones, ['Title', 'Authors']))
+    _guardar_csv(aristas, ruta_aristas)
+    logging.info(f"Lista de aristas guardada en {ruta_aristas} ({len(aristas)} aristas)")
+    # Las posiciones se escriben después de las aristas: su fecha indica que corresponden a ellas
+    posiciones = calcular_posiciones(aristas)
+    _guardar_csv(posiciones, ruta_posiciones)
+    logging.info(f"Posiciones de los autores guardadas en {ruta_posiciones} ({len(posiciones)} autores)")
+    return aristas
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import streamlit as st
+import pandas as pd
+from Menu.utilidades import RUTA_SNII, RUTA_MAESTRO, pivote_publicaciones_citas, graficar_citas_publicaciones_comparados
+from Menu.datos import cargar_tabla, cargar_maestro, cargar_snii, cargar_indice_busqueda, huella_dataset
+
+# ----------------------- Funciones --------------------------------------------
+COLUMNAS_COMPARACION = ['Investigador', 'Publication Date', 'Publication Year', 'Total de Citas']
+MODO_INVESTIGADORES = "Investigadores"
+MODO_INSTITUCIONES = "Instituciones"
+MAXIMO_OPCIONES = 20
+
+# Función para obtener la institución más reciente de cada investigador
+def instituciones_por_investigador(maestro, snii):
+    """Devuelve una Serie NOMBRE SNII → institución de adscripción del último año en el SNII."""
+    llaves = maestro[['NOMBRE SNII', 'CVU']].dropna()
+    registros = snii[['CVU', 'AÑO', 'INSTITUCIÓN DE ADSCRIPCIÓN']].dropna(subset=['CVU', 'INSTITUCIÓN DE ADSCRIPCIÓN'])
+    registros = registros.assign(AÑO=pd.to_numeric(registros['AÑO'], errors='coerce'))
+    ultimo = (
+        llaves.merge(registros, on='CVU')
+              .sort_values('AÑO', kind='stable')
+              .drop_duplicates(subset='NOMBRE SNII', keep='last')
+    )
+    return pd.Series(ultimo['INSTITUCIÓN DE ADSCRIPCIÓN'].to_numpy(),
+                     index=ultimo['NOMBRE SNII'].astype(str).str.strip())
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _construir_pivotes(ruta, modo, huellas):
+    df = cargar_tabla(ruta, COLUMNAS_COMPARACION)
+    if modo == MODO_INSTITUCIONES:
+        instituciones = instituciones_por_investigador(cargar_maestro(), cargar_snii())
+        df = df.assign(Institución=df['Investigador'].map(instituciones))
+        return pivote_publicaciones_citas(df, 'Institución')
+    return pivote_publicaciones_citas(df, 'Investigador')
+
+# Función para obtener las tablas (entidad × año) de publicaciones y citas
+def cargar_pivotes(ruta, modo):
+    """Tablas de publicaciones y citas de todo el corpus, calculadas una vez por versión de los datos."""
+    huellas = tuple(huella_dataset(r) for r in (ruta, RUTA_MAESTRO, RUTA_SNII))
+    return _construir_pivotes(ruta, modo, huellas)
+
+# ----------------------- Streamlit --------------------------------------------
+def mostrar_comparar_investigadores(rutaWoS):
+    st.title("📈 Comparación de Investigadores")
+
+    modo = st.radio("Comparar", [MODO_INVESTIGADORES, MODO_INSTITUCIONES], horizontal=True)
+    publicaciones, citas = cargar_pivotes(rutaWoS, modo)
+    if publicaciones.empty:
+        st.write("No hay publicaciones para comparar.")
+        return
+
+    año_min, año_max = int(publicaciones.columns.min()), int(publicaciones.columns.max())
+    inicio, fin = st.slider("Periodo", año_min, año_max, (max(año_min, 2000), min(año_max, 2024)))
+    años = [año for año in publicaciones.columns if inicio <= año <= fin]
+
+    # Opciones del selector: la selección actual más los resultados de la búsqueda
+    clave = f"comparar_{modo}"
+    seleccion_previa = [s for s in st.session_state.get(clave, []) if s in publicaciones.index]
+    if modo == MODO_INVESTIGADORES:
+        consulta = st.text_input("Buscar investigador para agregar", key="consulta_comparar")
+        candidatos = cargar_indice_busqueda(rutaWoS).buscar(consulta, limite=MAXIMO_OPCIONES) if consulta.strip() else []
+    else:
+        candidatos = publicaciones.index.tolist()
+    opciones = list(dict.fromkeys(seleccion_previa + [c for c in candidatos if c in publicaciones.index]))
+    seleccion = st.multiselect(f"{modo} a comparar", opciones, key=clave)
+
+    # Sin selección se muestran los que tienen más publicaciones en el periodo
+    if not seleccion:
+        cantidad = st.slider(f"Cantidad de {modo.lower()} con más publicaciones", 1, 200, 10)
+        seleccion = publicaciones[años].sum(axis=1).nlargest(cantidad).index.tolist()
+
+    fig = graficar_citas_publicaciones_comparados(publicaciones.loc[seleccion, años], citas.loc[seleccion, años])
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Tabla de totales del periodo
+    resumen = pd.DataFrame({
+        'Publicaciones': publicaciones.loc[seleccion, años].sum(axis=1),
+        'Total Citas': citas.loc[seleccion, años].sum(axis=1),
+    }).sort_values('Publicaciones', ascending=False)
+    st.dataframe(resumen, use_container_width=True)
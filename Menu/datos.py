@@ -0,0 +1,162 @@
+import os
+from functools import lru_cache
+import streamlit as st
+from Menu.utilidades import RUTA_PUBLICACIONES, RUTA_SNII, RUTA_MAESTRO, RUTA_PATENTES, RUTA_ANALISIS, RUTA_METRICAS, RUTA_COAUTORIA, RUTA_POSICIONES_COAUTORIA, hash_contenido
+from Menu.metricasAutores import leer_metricas
+from Menu.coautoria import leer_aristas, construir_aristas, leer_posiciones, calcular_posiciones
+from Menu.indices import IndiceInvestigadores, MapasBusqueda, IndiceBusqueda
+from Menu.snapshots import leer_tabla, ruta_snapshot
+
+# ----------------------- Acceso a datos ---------------------------------------
+# Los datasets de Analisis se cargan una sola vez por proceso del servidor y se
+# comparten entre todas las sesiones. La caché se invalida sola cuando cambia la
+# huella (tamaño y fecha de modificación) del archivo. Si existe un snapshot
+# columnar (Menu/snapshots.py) se lee con memory map y solo las columnas pedidas.
+# Los DataFrames devueltos son compartidos: no deben modificarse en su lugar.
+
+# Función para obtener la huella de un archivo
+def huella_archivo(ruta):
+    """Devuelve una tupla (tamaño, mtime en ns) que identifica la versión del archivo."""
+    estado = os.stat(ruta)
+    return estado.st_size, estado.st_mtime_ns
+
+# Función para obtener la huella de un dataset (CSV y snapshot)
+def huella_dataset(ruta):
+    """Huella del CSV junto con la de su snapshot columnar, si existe."""
+    snapshot = ruta_snapshot(ruta)
+    return huella_archivo(ruta), huella_archivo(snapshot) if os.path.exists(snapshot) else None
+
+@lru_cache(maxsize=32)
+def _hash_contenido(ruta, huella):
+    return hash_contenido(ruta)
+
+# Función para obtener el hash del contenido de un archivo
+def hash_archivo(ruta):
+    """SHA-256 del contenido; solo se recalcula cuando cambia la huella."""
+    return _hash_contenido(ruta, huella_archivo(ruta))
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _leer_tabla_cacheada(ruta, huella, columnas):
+    """Lee un dataset; la huella forma parte de la llave de la caché."""
+    return leer_tabla(ruta, list(columnas) if columnas is not None else None)
+
+# Función para leer un dataset a través de la caché compartida
+def cargar_tabla(ruta, columnas=None):
+    """Lee un dataset una sola vez por proceso mientras su huella (o la de su snapshot) no cambie."""
+    return _leer_tabla_cacheada(ruta, huella_dataset(ruta), tuple(columnas) if columnas is not None else None)
+
+# ----------------------- Datasets ---------------------------------------------
+# Columnas que usa la página de investigadores de cada dataset
+COLUMNAS_PERFIL = ['Title', 'Investigador', 'Publication Date', 'Publication Year',
+                   'Total de Citas', 'Promedio por año']
+COLUMNAS_SNII = ['CVU', 'AÑO', 'NOBILIS', 'NIVEL', 'FECHA DE FIN DE VIGENCIA',
+                 'INSTITUCIÓN DE ADSCRIPCIÓN', 'PAÍS', 'ÁREA DEL CONOCIMIENTO',
+                 'DISCIPLINA', 'SUBDISCIPLINA', 'ESPECIALIDAD']
+COLUMNAS_MAESTRO = ['NOMBRE SNII', 'CVU', 'inventor_id']
+COLUMNAS_PATENTES = ['inventor_id', 'Patents', 'Cites', 'years active',
+                     'INSTITUCIÓN Pública= 1; Privada= 0', 'Posgrado SI= 1 NO= 0',
+                     'Puesto', 'Nacionalidad']
+
+def cargar_publicaciones(columnas=None):
+    """Publicaciones de WoS (datasetWoS.csv)."""
+    return cargar_tabla(RUTA_PUBLICACIONES, columnas)
+
+def cargar_snii(columnas=COLUMNAS_SNII):
+    """Registros del SNII (datasetSNII.csv)."""
+    return cargar_tabla(RUTA_SNII, columnas)
+
+def cargar_maestro(columnas=COLUMNAS_MAESTRO):
+    """Tabla de equivalencias de nombres SNII / patentes (Nombres_PxS.csv)."""
+    return cargar_tabla(RUTA_MAESTRO, columnas)
+
+def cargar_patentes(columnas=COLUMNAS_PATENTES):
+    """Datos de patentes por inventor (datasetPatentes.csv)."""
+    return cargar_tabla(RUTA_PATENTES, columnas)
+
+def cargar_analisis(columnas=None):
+    """Dataset de entrenamiento (analisisEntrenamiento.csv)."""
+    return cargar_tabla(RUTA_ANALISIS, columnas)
+
+# ----------------------- Índices ----------------------------------------------
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _construir_indice_investigadores(ruta, huella):
+    # Lectura directa: el índice guarda su propia copia ordenada de las filas
+    return IndiceInvestigadores(leer_tabla(ruta, COLUMNAS_PERFIL))
+
+def cargar_indice_investigadores(ruta=RUTA_PUBLICACIONES):
+    """Índice investigador → filas de datasetWoS, construido una vez por versión del archivo."""
+    return _construir_indice_investigadores(ruta, huella_dataset(ruta))
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _construir_mapas_busqueda(huellas):
+    return MapasBusqueda(cargar_maestro(), cargar_snii(), cargar_patentes())
+
+def cargar_mapas_busqueda():
+    """Mapas NOMBRE SNII → CVU / inventor_id → filas, construidos una vez por versión de los datasets."""
+    huellas = tuple(huella_dataset(ruta) for ruta in (RUTA_MAESTRO, RUTA_SNII, RUTA_PATENTES))
+    return _construir_mapas_busqueda(huellas)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _construir_indice_busqueda(ruta, huellas):
+    autores = cargar_indice_investigadores(ruta).autores
+    # Nombres del SNII como alias del nombre con que aparece el investigador en WoS
+    maestro = cargar_maestro(['NOMBRE DEL INVESTIGADOR', 'NOMBRE SNII']).dropna()
+    alias = dict(zip(maestro['NOMBRE DEL INVESTIGADOR'].astype(str), maestro['NOMBRE SNII'].astype(str).str.strip()))
+    return IndiceBusqueda(autores, alias)
+
+def cargar_indice_busqueda(ruta=RUTA_PUBLICACIONES):
+    """Índice de búsqueda (prefijos y trigramas) de investigadores de datasetWoS y sus nombres del SNII."""
+    huellas = (huella_dataset(ruta), huella_dataset(RUTA_MAESTRO))
+    return _construir_indice_busqueda(ruta, huellas)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _construir_metricas(ruta, huella):
+    return leer_metricas(ruta)
+
+def cargar_metricas(ruta=RUTA_METRICAS, ruta_publicaciones=RUTA_PUBLICACIONES):
+    """
+    Tabla materializada de métricas por investigador (Menu/metricasAutores.py).
+    Devuelve None si no existe o si es anterior al dataset de publicaciones.
+    """
+    if not os.path.exists(ruta) or huella_archivo(ruta)[1] < huella_archivo(ruta_publicaciones)[1]:
+        return None
+    return _construir_metricas(ruta, huella_archivo(ruta))
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _construir_aristas(ruta, huella, persistida):
+    if persistida:
+        return leer_aristas(ruta)
+    return construir_aristas(leer_tabla(ruta, ['Title', 'Authors']))
+
+def _origen_aristas(ruta, ruta_publicaciones):
+    """(ruta, huella, persistida) de la fuente de la lista de aristas vigente."""
+    if os.path.exists(ruta) and huella_archivo(ruta)[1] >= huella_archivo(ruta_publicaciones)[1]:
+        return ruta, huella_archivo(ruta), True
+    return ruta_publicaciones, huella_dataset(ruta_publicaciones), False
+
+def cargar_aristas(ruta=RUTA_COAUTORIA, ruta_publicaciones=RUTA_PUBLICACIONES):
+    """
+    Lista de aristas de coautoría (Menu/coautoria.py). Si no existe o es anterior
+    al dataset de publicaciones se construye a partir de datasetWoS.
+    """
+    return _construir_aristas(*_origen_aristas(ruta, ruta_publicaciones))
+
+@st.cache_resource(show_spinner="Calculando la posición de los nodos...", max_entries=2)
+def _construir_posiciones(ruta, huella, persistida, origen_aristas):
+    if persistida:
+        posiciones = leer_posiciones(ruta)
+    else:
+        posiciones = calcular_posiciones(_construir_aristas(*origen_aristas))
+    return dict(zip(posiciones['Autor'], zip(posiciones['x'], posiciones['y'])))
+
+def cargar_posiciones(ruta=RUTA_POSICIONES_COAUTORIA, ruta_aristas=RUTA_COAUTORIA, ruta_publicaciones=RUTA_PUBLICACIONES):
+    """
+    Posiciones {autor: (x, y)} de la red de coautoría completa. Se leen del archivo
+    persistido si corresponde a la lista de aristas vigente; si no, se calculan una
+    sola vez por versión de la lista. La poda de la página solo filtra estas posiciones.
+    """
+    origen = _origen_aristas(ruta_aristas, ruta_publicaciones)
+    _, _, aristas_persistidas = origen
+    if aristas_persistidas and os.path.exists(ruta) and huella_archivo(ruta)[1] >= huella_archivo(ruta_aristas)[1]:
+        return _construir_posiciones(ruta, huella_archivo(ruta), True, origen)
+    return _construir_posiciones(None, None, False, origen)
@@ -3,11 +3,12 @@ from sklearn.metrics import mean_squared_error
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
+from Menu.snapshots import leer_tabla
 
-# Cargamos los datasets
-def safe_read_csv(path, **kwargs):
+# Cargamos los datasets (snapshot columnar si existe, si no el CSV)
+def safe_read_csv(path, columnas=None):
     try:
-        df = pd.read_csv(path, **kwargs)
+        df = leer_tabla(path, columnas)
         print(f"Archivo leído correctamente: {path} (filas: {len(df)})")
         return df
     except Exception as e:
@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+import pandas as pd
+import plotly.graph_objs as go
+from collections import Counter, OrderedDict
+from Menu.utilidades import RUTA_VISTAS
+
+# ----------------------- Caché de perfiles por investigador -------------------
+# El perfil completo de cada investigador (tablas y figuras de Plotly ya
+# construidas, para no volver a procesarlas en cada render) se guarda con llave
+# (investigador, versión de los datasets). La memoria queda acotada por el tamaño
+# total de las entradas (largo del JSON de cada figura y memoria de los
+# DataFrames, medidos al guardar): al pasar el límite se desalojan las entradas
+# usadas hace más tiempo (LRU). Las vistas de cada investigador se guardan en
+# disco (a lo más una escritura cada INTERVALO_GUARDADO_VISTAS segundos) para
+# precalentar los perfiles más consultados al arrancar.
+MAXIMO_BYTES_FIGURAS = 64 * 1024 * 1024
+MAXIMO_PRECALENTAR = 50
+INTERVALO_GUARDADO_VISTAS = 30
+
+class CacheFiguras:
+    """Caché LRU de perfiles (dicts de tablas y figuras), acotada por número de bytes."""
+
+    def __init__(self, maximo_bytes=MAXIMO_BYTES_FIGURAS):
+        self.maximo_bytes = maximo_bytes
+        self.bytes = 0
+        self._entradas = OrderedDict()
+        self._candado = threading.Lock()
+
+    @staticmethod
+    def _tamaño(valor):
+        if isinstance(valor, dict):
+            return sum(CacheFiguras._tamaño(elemento) for elemento in valor.values())
+        if isinstance(valor, pd.DataFrame):
+            return int(valor.memory_usage(index=True, deep=True).sum())
+        if isinstance(valor, go.Figure):
+            return len(valor.to_json())
+        return len(valor)
+
+    def obtener(self, llave):
+        """Devuelve el perfil guardado con la llave (o None) y lo marca como usado."""
+        with self._candado:
+            entrada = self._entradas.get(llave)
+            if entrada is None:
+                return None
+            self._entradas.move_to_end(llave)
+            return entrada[0]
+
+    def guardar(self, llave, perfil):
+        # El tamaño se mide una sola vez y se guarda junto al perfil
+        tamaño = self._tamaño(perfil)
+        if tamaño > self.maximo_bytes:
+            return
+        with self._candado:
+            anterior = self._entradas.pop(llave, None)
+            if anterior is not None:
+                self.bytes -= anterior[1]
+            self._entradas[llave] = (perfil, tamaño)
+            self.bytes += tamaño
+            # Desalojar las entradas menos usadas hasta volver al límite
+            while self.bytes > self.maximo_bytes:
+                _, (_, tamaño_desalojada) = self._entradas.popitem(last=False)
+                self.bytes -= tamaño_desalojada
+
+    def __contains__(self, llave):
+        return llave in self._entradas
+
+    def __len__(self):
+        return len(self._entradas)
+
+class RegistroVistas:
+    """
+    Conteo persistente de vistas por investigador. Las vistas se cuentan en memoria
+    y el archivo se reescribe a lo más una vez cada 'intervalo' segundos; las
+    pendientes se guardan al terminar el proceso.
+    """
+
+    def __init__(self, ruta=RUTA_VISTAS, intervalo=INTERVALO_GUARDADO_VISTAS):
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self._candado = threading.Lock()
+        self._pendientes = 0
+        self._ultimo_guardado = time.monotonic()
+        try:
+            with open(ruta, encoding='utf-8') as f:
+                self.vistas = Counter(json.load(f))
+        except (OSError, ValueError):
+            self.vistas = Counter()
+        atexit.register(self.guardar)
+
+    def _escribir(self):
+        os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+        temporal = f"{self.ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.vistas, f, ensure_ascii=False)
+        os.replace(temporal, self.ruta)
+        self._pendientes = 0
+        self._ultimo_guardado = time.monotonic()
+
+    def registrar(self, autor):
+        with self._candado:
+            self.vistas[autor] += 1
+            self._pendientes += 1
+            if time.monotonic() - self._ultimo_guardado >= self.intervalo:
+                self._escribir()
+
+    def guardar(self):
+        """Escribe las vistas pendientes en disco."""
+        with self._candado:
+            if self._pendientes:
+                self._escribir()
+
+    def mas_vistos(self, cantidad=MAXIMO_PRECALENTAR):
+        with self._candado:
+            return [autor for autor, _ in self.vistas.most_common(cantidad)]
+
+# Función para precalentar la caché con los investigadores más vistos
+def precalentar(cache, vistas, version, construir, cantidad=MAXIMO_PRECALENTAR):
+    """
+    Construye los perfiles de los investigadores más consultados que aún no están en
+    la caché para esta versión. construir(autor) devuelve el perfil o None.
+    """
+    generadas = 0
+    for autor in vistas.mas_vistos(cantidad):
+        if (autor, version) in cache:
+            continue
+        try:
+            perfil = construir(autor)
+        except Exception as e:
+            logging.error(f"Error precalentando el perfil de {autor}: {e}")
+            continue
+        if perfil is not None:
+            cache.guardar((autor, version), perfil)
+            generadas += 1
+    logging.info(f"Perfiles precalentados: {generadas} investigadores")
+    return generadas
+
+def iniciar_precalentamiento(cache, vistas, version, construir, cantidad=MAXIMO_PRECALENTAR):
+    """Ejecuta precalentar en un hilo en segundo plano y devuelve el hilo."""
+    hilo = threading.Thread(target=precalentar, args=(cache, vistas, version, construir, cantidad), daemon=True)
+    hilo.start()
+    return hilo
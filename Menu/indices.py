@@ -0,0 +1,202 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
+
+# ----------------------- Índices ----------------------------------------------
+# Estructuras que se construyen una sola vez al cargar los datasets y que
+# permiten resolver las consultas de la app sin recorrer el corpus completo.
+
+class IndiceInvestigadores:
+    """
+    Índice investigador → rango de filas de sus publicaciones.
+    Las publicaciones se ordenan una vez por investigador, de modo que las filas de
+    cada autor quedan contiguas y se obtienen con un slice en O(filas del autor).
+    """
+
+    def __init__(self, df, columna='Investigador'):
+        # Conteo sobre el DataFrame completo (para las proporciones de la app)
+        self.total_titulos = int(df['Title'].count()) if 'Title' in df.columns else len(df)
+
+        ordenado = (
+            df.dropna(subset=[columna])
+              .sort_values(columna, kind='stable')
+              .reset_index(drop=True)
+        )
+        valores = ordenado[columna].to_numpy()
+
+        # Posiciones donde cambia el investigador: inicio de cada bloque
+        cortes = np.flatnonzero(valores[1:] != valores[:-1]) + 1
+        inicios = np.concatenate(([0], cortes)) if len(valores) else np.array([], dtype=int)
+        fines = np.append(inicios[1:], len(valores)).astype(int)
+
+        self.publicaciones = ordenado
+        self.rangos = {
+            valores[inicio]: (int(inicio), int(fin))
+            for inicio, fin in zip(inicios, fines)
+        }
+        # Lista ordenada de investigadores (el orden del índice ya es alfabético)
+        self.autores = list(self.rangos)
+
+    def __contains__(self, autor):
+        return autor in self.rangos
+
+    def __len__(self):
+        return len(self.rangos)
+
+    def filas(self, autor):
+        """Devuelve las publicaciones del autor (DataFrame vacío si no existe)."""
+        inicio, fin = self.rangos.get(autor, (0, 0))
+        return self.publicaciones.iloc[inicio:fin]
+
+# Función para normalizar las llaves de búsqueda (nombres, CVU e inventor_id)
+def normalizar_llave(valores):
+    """Convierte una serie a texto sin espacios en los extremos, como se compara en la app."""
+    return valores.astype(str).str.strip()
+
+def _posiciones_por_llave(llaves):
+    """Agrupa las posiciones de fila por llave: {llave: array de posiciones de solo lectura}."""
+    posiciones = {}
+    for llave, filas in pd.Series(llaves).groupby(llaves, sort=False).indices.items():
+        filas = np.asarray(filas, dtype=np.int64)
+        filas.flags.writeable = False
+        posiciones[llave] = filas
+    return MappingProxyType(posiciones)
+
+def _valores_por_nombre(nombres, valores):
+    """Agrupa valores únicos (en orden de aparición) por nombre, descartando vacíos y 'nan'."""
+    agrupados = {}
+    for nombre, valor in zip(nombres, valores):
+        if valor and valor.lower() != 'nan':
+            lista = agrupados.setdefault(nombre, [])
+            if valor not in lista:
+                lista.append(valor)
+    return MappingProxyType({nombre: tuple(lista) for nombre, lista in agrupados.items()})
+
+class MapasBusqueda:
+    """
+    Mapas inmutables construidos una vez a partir de Nombres_PxS.csv:
+    NOMBRE SNII → CVUs e inventor_ids, CVU → filas del SNII e inventor_id → filas de patentes.
+    Las búsquedas de la página de investigadores quedan en un acceso a diccionario.
+    """
+
+    def __init__(self, maestro, snii, patentes):
+        # NOMBRE SNII → CVU(s)
+        con_cvu = maestro.dropna(subset=['NOMBRE SNII', 'CVU'])
+        self.cvus = _valores_por_nombre(
+            normalizar_llave(con_cvu['NOMBRE SNII']), normalizar_llave(con_cvu['CVU'])
+        )
+        # NOMBRE SNII → inventor_id(s)
+        con_id = maestro.dropna(subset=['NOMBRE SNII', 'inventor_id'])
+        self.inventor_ids = _valores_por_nombre(
+            normalizar_llave(con_id['NOMBRE SNII']), normalizar_llave(con_id['inventor_id'])
+        )
+        # CVU → posiciones en el SNII e inventor_id → posiciones en patentes
+        self.filas_snii = _posiciones_por_llave(normalizar_llave(snii['CVU']).to_numpy())
+        self.filas_patentes = _posiciones_por_llave(normalizar_llave(patentes['inventor_id']).to_numpy())
+
+    @staticmethod
+    def _posiciones(mapa, llaves):
+        encontradas = [mapa[llave] for llave in llaves if llave in mapa]
+        if not encontradas:
+            return np.array([], dtype=np.int64)
+        # Orden original del dataset, como al filtrar con isin
+        return np.sort(np.concatenate(encontradas))
+
+    def posiciones_snii(self, nombre):
+        """Posiciones de las filas del SNII del investigador."""
+        return self._posiciones(self.filas_snii, self.cvus.get(nombre.strip(), ()))
+
+    def posiciones_patentes(self, nombre):
+        """Posiciones de las filas de patentes del investigador."""
+        return self._posiciones(self.filas_patentes, self.inventor_ids.get(nombre.strip(), ()))
+
+# ----------------------- Búsqueda de investigadores ---------------------------
+# Función para normalizar un texto de búsqueda (sin acentos ni mayúsculas)
+def normalizar_busqueda(texto):
+    texto = unicodedata.normalize('NFKD', str(texto))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+    return ' '.join(re.sub(r'[^a-z0-9ñ]+', ' ', texto).split())
+
+# Proporción mínima de trigramas de la consulta que debe tener un nombre
+SIMILITUD_MINIMA = 0.3
+
+def _trigramas(texto):
+    texto = f" {texto} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+class IndiceBusqueda:
+    """
+    Índice de búsqueda de investigadores insensible a acentos y mayúsculas.
+    Cada nombre (y cada alias del SNII) se indexa por sus palabras, para búsquedas
+    por prefijo, y por sus trigramas de caracteres, para tolerar errores de escritura.
+    buscar() devuelve los mejores investigadores sin recorrer la lista completa.
+    """
+
+    def __init__(self, autores, alias=None):
+        # Entradas: (texto normalizado, investigador al que apunta)
+        entradas = [(normalizar_busqueda(autor), autor) for autor in autores]
+        validos = set(autores)
+        for nombre, autor in (alias or {}).items():
+            if autor in validos:
+                entradas.append((normalizar_busqueda(nombre), autor))
+        entradas = sorted(set(entradas))
+
+        self.textos = [texto for texto, _ in entradas]
+        self.destinos = np.array([autor for _, autor in entradas], dtype=object)
+
+        # Palabras ordenadas → entrada, para resolver prefijos con búsqueda binaria
+        palabras = sorted((palabra, i) for i, texto in enumerate(self.textos) for palabra in set(texto.split()))
+        self._palabras = [palabra for palabra, _ in palabras]
+        self._entradas_palabra = np.array([i for _, i in palabras], dtype=np.int64)
+
+        # Trigrama → entradas que lo contienen
+        posiciones = {}
+        for i, texto in enumerate(self.textos):
+            for trigrama in _trigramas(texto):
+                posiciones.setdefault(trigrama, []).append(i)
+        self._trigramas = {trigrama: np.array(filas, dtype=np.int64) for trigrama, filas in posiciones.items()}
+
+    def __len__(self):
+        return len(self.textos)
+
+    def _prefijo(self, palabra):
+        """Entradas con alguna palabra que empieza con 'palabra'."""
+        inicio = bisect_left(self._palabras, palabra)
+        fin = bisect_left(self._palabras, palabra + '\uffff', inicio)
+        return self._entradas_palabra[inicio:fin]
+
+    def buscar(self, consulta, limite=20):
+        """Devuelve hasta 'limite' investigadores ordenados por relevancia."""
+        consulta = normalizar_busqueda(consulta)
+        if not consulta or not self.textos:
+            return []
+
+        # Puntaje base: proporción de trigramas de la consulta presentes en el nombre
+        trigramas = [self._trigramas[t] for t in _trigramas(consulta) if t in self._trigramas]
+        total = len(_trigramas(consulta))
+        puntaje = np.zeros(len(self.textos))
+        if trigramas:
+            puntaje += np.bincount(np.concatenate(trigramas), minlength=len(self.textos)) / total
+        # Coincidencias débiles (pocos trigramas en común) no se consideran
+        puntaje[puntaje < SIMILITUD_MINIMA] = 0
+
+        # Bonificación por cada palabra de la consulta que es prefijo de una palabra del nombre
+        for palabra in consulta.split():
+            puntaje[np.unique(self._prefijo(palabra))] += 1
+
+        candidatos = np.flatnonzero(puntaje > 0)
+        if len(candidatos) == 0:
+            return []
+        # Orden: mayor puntaje, luego alfabético (los textos ya están ordenados)
+        orden = candidatos[np.lexsort((candidatos, -puntaje[candidatos]))]
+
+        resultados = []
+        for autor in self.destinos[orden]:
+            if autor not in resultados:
+                resultados.append(autor)
+                if len(resultados) == limite:
+                    break
+        return resultados
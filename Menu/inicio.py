@@ -2,29 +2,56 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objs as go
+import plotly.io as pio
 from sklearn.cluster import KMeans
 from sklearn.ensemble import RandomForestClassifier
 from statsmodels.tsa.stattools import grangercausalitytests
 from Menu.utilidades import procesar_archivos, RUTA_GUARDADO
+from Menu.datos import cargar_tabla
+from Menu.resultados import obtener_resultado
 
 # ----------------------------------------- Definiciones ---------------------------------
-def mostrar_causalidad(dfEntrenamiento):
-    st.title("📈 Análisis de Causalidad de Granger")
+# Pruebas reportadas de grangercausalitytests y su nombre en la tabla
+PRUEBAS_GRANGER = {'ssr_ftest': "SSR F-test", 'ssr_chi2test': "Chi2 test", 'lrtest': "Likelihood ratio test"}
 
+# Función para calcular la causalidad de Granger en ambas direcciones
+def calcular_causalidad(dfEntrenamiento, maxlag=2):
+    """Devuelve, por dirección y lag, el estadístico y el p-valor de cada prueba (serializable en JSON)."""
     # Preparar datos para análisis de causalidad
     df_causalidad = dfEntrenamiento[['total_publicaciones', 'patents']].dropna()
 
+    direcciones = {
+        'pub_pat': ['total_publicaciones', 'patents'],
+        'pat_pub': ['patents', 'total_publicaciones'],
+    }
+    resultados = {}
+    for direccion, columnas in direcciones.items():
+        pruebas = grangercausalitytests(df_causalidad[columnas], maxlag=maxlag, verbose=False)
+        resultados[direccion] = {
+            str(lag): {
+                "Estadístico": [float(resultado[0][prueba][0]) for prueba in PRUEBAS_GRANGER],
+                "p-valor": [float(resultado[0][prueba][1]) for prueba in PRUEBAS_GRANGER],
+            }
+            for lag, resultado in pruebas.items()
+        }
+    return resultados
+
+def mostrar_causalidad(rutaAnalisis):
+    st.title("📈 Análisis de Causalidad de Granger")
+
+    resultados, vigente = obtener_resultado('causalidad', calcular_causalidad, rutaAnalisis, maxlag=2)
+    if not vigente:
+        st.caption("⏳ Resultados de una versión anterior del dataset; se están recalculando.")
+
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("Publicaciones → Patentes")
-        resultados_pub_pat = grangercausalitytests(df_causalidad[['total_publicaciones', 'patents']], maxlag=2, verbose=False)
-        mostrar_resultados_causalidad(resultados_pub_pat)
+        mostrar_resultados_causalidad(resultados['pub_pat'])
 
     with col2:
         st.subheader("Patentes → Publicaciones")
-        resultados_pat_pub = grangercausalitytests(df_causalidad[['patents', 'total_publicaciones']], maxlag=2, verbose=False)
-        mostrar_resultados_causalidad(resultados_pat_pub)
+        mostrar_resultados_causalidad(resultados['pat_pub'])
 
     st.info("🔍 **Nota:** Un valor p bajo (por ejemplo, < 0.05) indica una relación causal significativa.")
 
@@ -32,17 +59,9 @@ def mostrar_resultados_causalidad(resultados):
     for lag, resultado in resultados.items():
         st.markdown(f"### Lag {lag}")
         data = {
-            "Prueba": ["SSR F-test", "Chi2 test", "Likelihood ratio test"],
-            "Estadístico": [
-                resultado[0]['ssr_ftest'][0],
-                resultado[0]['ssr_chi2test'][0],
-                resultado[0]['lrtest'][0]
-            ],
-            "p-valor": [
-                resultado[0]['ssr_ftest'][1],
-                resultado[0]['ssr_chi2test'][1],
-                resultado[0]['lrtest'][1]
-            ]
+            "Prueba": list(PRUEBAS_GRANGER.values()),
+            "Estadístico": resultado["Estadístico"],
+            "p-valor": resultado["p-valor"]
         }
         df_resultados = pd.DataFrame(data)
 
@@ -56,12 +75,15 @@ def mostrar_resultados_causalidad(resultados):
             use_container_width=True
         )
 
-def realizar_clustering_y_clasificacion(dfEntrenamiento):
-    st.title("🔍 Análisis de Clustering y Clasificación")
+# Función para calcular el clustering (KMeans) y la clasificación (Random Forest)
+def calcular_clustering(dfEntrenamiento, n_clusters=3, random_state=42):
+    """Ajusta KMeans y Random Forest y devuelve las dos figuras en JSON."""
+    # Copia local: el DataFrame de la caché es compartido entre sesiones
+    dfEntrenamiento = dfEntrenamiento.copy()
 
     # Clustering con KMeans
     X = dfEntrenamiento[['total_publicaciones', 'patents']].dropna()
-    kmeans = KMeans(n_clusters=3, random_state=42).fit(X)
+    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state).fit(X)
     # Solo asignar etiquetas a las filas sin NaN en X
     dfEntrenamiento['cluster'] = None
     dfEntrenamiento.loc[X.index, 'cluster'] = kmeans.labels_
@@ -101,7 +123,7 @@ def realizar_clustering_y_clasificacion(dfEntrenamiento):
 
     # Clasificación con Random Forest
     y = kmeans.labels_
-    rf = RandomForestClassifier(random_state=42)
+    rf = RandomForestClassifier(random_state=random_state)
     rf.fit(X, y)
 
     # Importancia de características
@@ -118,14 +140,24 @@ def realizar_clustering_y_clasificacion(dfEntrenamiento):
         color_continuous_scale='Blues'
     )
 
+    return {'clusters': fig_clusters.to_json(), 'importancias': fig_importances.to_json()}
+
+def realizar_clustering_y_clasificacion(rutaAnalisis):
+    st.title("🔍 Análisis de Clustering y Clasificación")
+
+    figuras, vigente = obtener_resultado('clustering', calcular_clustering, rutaAnalisis,
+                                         n_clusters=3, random_state=42)
+    if not vigente:
+        st.caption("⏳ Resultados de una versión anterior del dataset; se están recalculando.")
+
     # Mostrar ambas gráficas en una sola línea
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("📊 Clustering con KMeans")
-        st.plotly_chart(fig_clusters, use_container_width=True)
+        st.plotly_chart(pio.from_json(figuras['clusters']), use_container_width=True)
     with col2:
         st.subheader("🌲 Clasificación con Random Forest")
-        st.plotly_chart(fig_importances, use_container_width=True)
+        st.plotly_chart(pio.from_json(figuras['importancias']), use_container_width=True)
 
 def graficar_correlaciones(dfEntrenamiento):
     """
@@ -180,7 +212,7 @@ def graficar_correlaciones(dfEntrenamiento):
 # ----------------------------------------- Codigo ---------------------------------
 def mostrar_inicio(rutaAnalisis):
     correctos, incorrectos, archivos_incorrectos = procesar_archivos(RUTA_GUARDADO)
-    dfEntrenamiento = pd.read_csv(rutaAnalisis)
+    dfEntrenamiento = cargar_tabla(rutaAnalisis)
 
     st.title("📊 Informe de Archivos Procesados")
     col1, col2, col3 = st.columns(3)
@@ -190,8 +222,8 @@ def mostrar_inicio(rutaAnalisis):
 
     if incorrectos > 0:
         st.subheader("Archivos con error:")
-        for archivo in archivos_incorrectos:
-            st.write(f"- {archivo}")
+        for error in archivos_incorrectos:
+            st.write(f"- {error['archivo']}: {error['detalle']}")
 
     # Gráfico de barras
     data = {
@@ -243,5 +275,5 @@ def mostrar_inicio(rutaAnalisis):
         fig_correlaciones = graficar_correlaciones(dfEntrenamiento)
         st.plotly_chart(fig_correlaciones, use_container_width=True)
 
-    mostrar_causalidad(dfEntrenamiento)
-    realizar_clustering_y_clasificacion(dfEntrenamiento)
\ No newline at end of file
+    mostrar_causalidad(rutaAnalisis)
+    realizar_clustering_y_clasificacion(rutaAnalisis)
\ No newline at end of file
@@ -1,25 +1,109 @@
+import sys
 import logging
+import argparse
 import Limpieza.LimpiezaColumnas as LimpiezaColumnas
 import Limpieza.LimpiezaDatos as LimpiezaDatos
 import Limpieza.LimpiezaNombres as LimpiezaNombres
 import Limpieza.LimpiezaNombresFinal as LimpiezaNombresFinal
 import Limpieza.UnionNombres as UnionNombres
 import Limpieza.UltimoFiltro as UltimoFiltro
+from Limpieza.Pipeline import Etapa, seleccionar, planear, ejecutar, NO_SELECCIONADA
 
 # Configuración de logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-def main():
-    LimpiezaColumnas.main()
-    LimpiezaDatos.main()
-    LimpiezaNombres.main()
-    LimpiezaNombresFinal.main()
-    UnionNombres.main()
-    UltimoFiltro.main()
-    UnionNombres.main()
+# === Etapas de la limpieza ===
+# Cada etapa escribe sus propios archivos: la lista de nombres de
+# LimpiezaNombresFinal (Nombres_Limpios_75.csv) pasa por una primera unión con el
+# dataset, UltimoFiltro le agrega los nombres sin coincidencia y escribe la lista
+# final, y la unión final asigna esa lista. Así ninguna etapa sobrescribe la
+# entrada de otra y cada una se omite si sus entradas no cambiaron.
+# Nombres_LimpiosCompleto.csv no lo genera ninguna etapa: es una entrada externa.
+# Las etapas de comparación difusa (nombres, nombres_final y las uniones) usan el
+# bloqueo según el valor por defecto de cada una, salvo que se indique 'bloqueo'.
+def crear_etapas(bloqueo=None):
+    """Etapas de la limpieza; con bloqueo=True/False se fuerza en todas las etapas de comparación."""
+    opcion = {} if bloqueo is None else {"bloqueo": bloqueo}
+    return [
+        Etapa("columnas", LimpiezaColumnas.main,
+              entradas=["dataset/*.xlsx"],
+              salidas=["datasetMD/*.csv"]),
+        Etapa("datos", LimpiezaDatos.main,
+              entradas=["datasetMD/*.csv"],
+              salidas=[LimpiezaDatos.CONFIG["archivo_salida"], LimpiezaDatos.CONFIG["archivo_nombres"],
+                       LimpiezaDatos.CONFIG["archivo_nombres_limpios"], LimpiezaDatos.CONFIG["archivo_nombres_descartados"]]),
+        Etapa("nombres", LimpiezaNombres.main,
+              entradas=[LimpiezaNombres.ruta_nombres_limpios, LimpiezaNombres.ruta_nombres_descartados],
+              salidas=[LimpiezaNombres.ruta_nombres_no_encontrados, LimpiezaNombres.ruta_nombres_no_encontrados_2],
+              parametros=opcion),
+        Etapa("nombres_final", LimpiezaNombresFinal.main,
+              entradas=["Limpieza/Nombres_LimpiosCompleto.csv"],
+              salidas=["Limpieza/Nombres_Limpios_85.csv", "Limpieza/Nombres_Limpios_75.csv"],
+              parametros={"umbrales": (85, 75),
+                          "ruta_entrada": "Limpieza/Nombres_LimpiosCompleto.csv",
+                          "ruta_intermedia": "Limpieza/Nombres_Limpios_85.csv",
+                          "ruta_salida": "Limpieza/Nombres_Limpios_75.csv", **opcion}),
+        Etapa("union_preliminar", UnionNombres.main,
+              entradas=["datasetMD.parquet", "Limpieza/Nombres_Limpios_75.csv"],
+              salidas=["Limpieza/datasetF_preliminar.csv"],
+              parametros={"dataset_path": "datasetMD.parquet",
+                          "nombres_path": "Limpieza/Nombres_Limpios_75.csv",
+                          "output_path": "Limpieza/datasetF_preliminar.csv",
+                          "perfil_path": None, **opcion}),
+        Etapa("ultimo_filtro", UltimoFiltro.main,
+              entradas=["Limpieza/datasetF_preliminar.csv", "Limpieza/Nombres_Limpios_75.csv"],
+              salidas=[UltimoFiltro.ruta_dataset_sin, UltimoFiltro.ruta_nombres_limpios],
+              parametros={"ruta_entrada": "Limpieza/datasetF_preliminar.csv",
+                          "ruta_nombres": "Limpieza/Nombres_Limpios_75.csv",
+                          "ruta_salida": UltimoFiltro.ruta_nombres_limpios,
+                          "ruta_sin": UltimoFiltro.ruta_dataset_sin}),
+        Etapa("union_final", UnionNombres.main,
+              entradas=["datasetMD.parquet", UltimoFiltro.ruta_nombres_limpios],
+              salidas=["Limpieza/datasetF.csv", "Limpieza/perfil_datasetMD.json"],
+              parametros={"dataset_path": "datasetMD.parquet",
+                          "nombres_path": UltimoFiltro.ruta_nombres_limpios,
+                          "output_path": "Limpieza/datasetF.csv",
+                          "perfil_path": "Limpieza/perfil_datasetMD.json", **opcion}),
+    ]
+
+ETAPAS = crear_etapas()
+
+def main(solo=None, desde=None, jobs=None, simulacion=False, forzar=False, bloqueo=None):
+    """
+    Ejecuta las etapas de la limpieza que no están al día. Con simulacion=True solo
+    muestra qué etapas se ejecutarían. Con bloqueo=True/False se fuerza el uso del
+    bloqueo en las etapas de comparación. Devuelve las etapas con error.
+    """
+    etapas = ETAPAS if bloqueo is None else crear_etapas(bloqueo)
+    seleccion = seleccionar(etapas, solo, desde)
+    if simulacion:
+        for nombre, estado in planear(etapas, seleccion, forzar).items():
+            if estado != NO_SELECCIONADA or not (solo or desde):
+                print(f"{nombre:<18} {estado}")
+        return []
+    # Una etapa a la vez por defecto: 'columnas' abre su propio pool de procesos y las
+    # etapas de comparación usan todos los núcleos (cdist con workers=-1)
+    return ejecutar(etapas, seleccion, jobs or 1, forzar)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Limpieza de datos incremental: solo se ejecutan las etapas cuyas entradas cambiaron.")
+    nombres = [etapa.nombre for etapa in ETAPAS]
+    parser.add_argument("--only", nargs="+", choices=nombres, metavar="ETAPA",
+                        help=f"Considerar solo estas etapas ({', '.join(nombres)})")
+    parser.add_argument("--from", dest="desde", choices=nombres, metavar="ETAPA",
+                        help="Considerar esta etapa y las que dependen de ella")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Etapas a ejecutar a la vez (por defecto 1: cada etapa ya usa todos los núcleos)")
+    parser.add_argument("--dry-run", action="store_true", help="Solo mostrar qué etapas se ejecutarían")
+    parser.add_argument("--forzar", action="store_true", help="Ejecutar las etapas seleccionadas aunque estén al día")
+    parser.add_argument("--bloqueo", action=argparse.BooleanOptionalAction, default=None,
+                        help="Usar (o no, con --no-bloqueo) el índice de bloqueo en todas las etapas de comparación "
+                             "(por defecto, el de cada etapa: sí en nombres y en las uniones, no en nombres_final)")
+    args = parser.parse_args()
 
     logging.info("Empezando Limpieza de datos")
-    main()
-    logging.info("Fin de la Limpieza de datos.")
\ No newline at end of file
+    fallidas = main(args.only, args.desde, args.jobs, args.dry_run, args.forzar, args.bloqueo)
+    if fallidas:
+        logging.error(f"Etapas con error: {', '.join(fallidas)}")
+        sys.exit(1)
+    logging.info("Fin de la Limpieza de datos.")
@@ -0,0 +1,103 @@
+import os
+import hashlib
+import logging
+import argparse
+import pandas as pd
+from Menu.utilidades import RUTA_PUBLICACIONES, RUTA_GUARDADO, RUTA_METRICAS
+from Menu.snapshots import leer_tabla
+
+# Configuración de logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# ----------------------- Métricas por investigador ----------------------------
+# Tabla materializada con publicaciones, citas, promedio e índice h de todos los
+# investigadores. La app solo la consulta; se recalcula con este módulo:
+#   python -m Menu.metricasAutores            (solo autores con exportación modificada)
+#   python -m Menu.metricasAutores --completo (todos los autores)
+COLUMNAS_METRICAS = ['Publicaciones', 'Total Citas', 'Promedio Año', 'Índice h']
+COLUMNA_HUELLA = 'Huella Exportación'
+COLUMNAS_FUENTE = ['Investigador', 'Title', 'Publication Year', 'Total de Citas', 'Promedio por año']
+
+# Función para calcular las métricas de todos los investigadores
+def calcular_metricas(df):
+    """
+    Calcula en una sola pasada (groupby) las métricas del periodo 2000–2024 por investigador.
+    El índice h se obtiene ordenando las citas de cada autor de mayor a menor y
+    contando las publicaciones cuyo número de citas es mayor o igual a su rango.
+    """
+    df = df.loc[
+        df['Investigador'].notna() & (df['Publication Year'] >= 2000) & (df['Publication Year'] <= 2024),
+        ['Investigador', 'Title', 'Total de Citas', 'Promedio por año']
+    ]
+    df = df.sort_values(['Investigador', 'Total de Citas'], ascending=[True, False], kind='stable')
+    rango = df.groupby('Investigador', sort=False).cumcount() + 1
+    df = df.assign(cumple_h=(df['Total de Citas'] >= rango))
+
+    metricas = df.groupby('Investigador').agg(**{
+        'Publicaciones': ('Title', 'count'),
+        'Total Citas': ('Total de Citas', 'sum'),
+        'Promedio Año': ('Promedio por año', 'mean'),
+        'Índice h': ('cumple_h', 'sum'),
+    })
+    return metricas
+
+# Función para obtener el hash de la exportación WoS de cada autor
+def huellas_exportaciones(carpeta):
+    """Devuelve {investigador: sha256} de los .txt de la carpeta de exportaciones."""
+    huellas = {}
+    if not os.path.isdir(carpeta):
+        return huellas
+    for archivo in os.listdir(carpeta):
+        if archivo.endswith(".txt"):
+            with open(os.path.join(carpeta, archivo), 'rb') as f:
+                huellas[os.path.splitext(archivo)[0]] = hashlib.sha256(f.read()).hexdigest()
+    return huellas
+
+def leer_metricas(ruta=RUTA_METRICAS):
+    """Lee la tabla de métricas indexada por investigador (vacía si no existe)."""
+    if not os.path.exists(ruta):
+        return pd.DataFrame(columns=COLUMNAS_METRICAS + [COLUMNA_HUELLA]).rename_axis('Investigador')
+    return pd.read_csv(ruta, index_col='Investigador')
+
+# Función principal del proceso por lotes
+def actualizar_metricas(ruta_publicaciones=RUTA_PUBLICACIONES, carpeta_exportaciones=RUTA_GUARDADO,
+                        ruta_metricas=RUTA_METRICAS, completo=False):
+    """
+    Genera o actualiza la tabla de métricas. En modo incremental solo se recalculan
+    los investigadores cuya exportación WoS cambió (o que no estaban en la tabla) y
+    se eliminan los que ya no aparecen en el dataset de publicaciones.
+    """
+    huellas = huellas_exportaciones(carpeta_exportaciones)
+    df = leer_tabla(ruta_publicaciones, COLUMNAS_FUENTE)
+    autores = pd.Index(df['Investigador'].dropna().unique())
+
+    anterior = pd.DataFrame() if completo else leer_metricas(ruta_metricas)
+    if anterior.empty:
+        pendientes = autores
+    else:
+        huella_anterior = anterior[COLUMNA_HUELLA].reindex(autores)
+        huella_actual = pd.Series(huellas, dtype=object).reindex(autores)
+        cambio = huella_anterior.isna() | (huella_anterior != huella_actual)
+        pendientes = autores[cambio.to_numpy()]
+    logging.info(f"Investigadores a recalcular: {len(pendientes)} de {len(autores)}")
+
+    nuevas = calcular_metricas(df[df['Investigador'].isin(pendientes)])
+    # Autores sin publicaciones en el periodo también se registran (con métricas en cero)
+    nuevas = nuevas.reindex(pendientes, fill_value=0).rename_axis('Investigador')
+    nuevas[COLUMNA_HUELLA] = [huellas.get(autor, '') for autor in nuevas.index]
+
+    conservadas = anterior.loc[anterior.index.isin(autores) & ~anterior.index.isin(pendientes)]
+    metricas = nuevas if conservadas.empty else pd.concat([conservadas, nuevas])
+    metricas = metricas.sort_index()
+
+    temporal = f"{ruta_metricas}.tmp"
+    metricas.to_csv(temporal)
+    os.replace(temporal, ruta_metricas)
+    logging.info(f"Tabla de métricas guardada en {ruta_metricas} ({len(metricas)} investigadores)")
+    return metricas
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera la tabla de métricas por investigador.")
+    parser.add_argument('--completo', action='store_true', help="Recalcular todos los investigadores.")
+    args = parser.parse_args()
+    actualizar_metricas(completo=args.completo)
@@ -0,0 +1,75 @@
+import os
+import numpy as np
+import networkx as nx
+import streamlit as st
+import plotly.graph_objs as go
+from Menu.utilidades import RUTA_PUBLICACIONES, RUTA_COAUTORIA, RUTA_POSICIONES_COAUTORIA, create_node_trace, create_edge_trace
+from Menu.datos import cargar_aristas, cargar_posiciones, huella_dataset, huella_archivo
+from Menu.coautoria import podar_aristas
+
+# ----------------------- Funciones --------------------------------------------
+OPCIONES_MAXIMO_ARISTAS = [1000, 5000, 20000, 50000, 100000, 200000]
+
+# Función para construir el grafo podado
+@st.cache_resource(show_spinner=False, max_entries=8)
+def calcular_red(version, peso_minimo, grado_minimo, maximo_aristas, _aristas, _posiciones):
+    """
+    Grafo podado y posiciones de sus nodos, tomadas del layout precalculado de la
+    red completa (no se calcula ningún layout aquí). La llave es la versión de los
+    datos y los parámetros de poda (_aristas y _posiciones no forman parte de ella).
+    """
+    podadas = podar_aristas(_aristas, peso_minimo, grado_minimo, maximo_aristas)
+    G = nx.Graph()
+    G.add_weighted_edges_from(podadas.itertuples(index=False, name=None))
+    pos = {nodo: _posiciones[nodo] for nodo in G.nodes}
+    return G, pos
+
+# Función para graficar la red de coautoría
+def graficar_red(G, pos):
+    grados = np.array([grado for _, grado in G.degree()], dtype=float)
+    tamaños = 4 + 16 * np.sqrt(grados / grados.max()) if len(grados) else []
+    fig = go.Figure()
+    fig.add_trace(create_edge_trace(G, pos, edge_color='rgba(128, 128, 128, 0.4)'))
+    fig.add_trace(create_node_trace(G, pos, grados, node_size=tamaños))
+    fig.data[1].marker.update(colorscale='Viridis', showscale=True, colorbar=dict(title='Coautores'))
+    fig.update_layout(
+        template='plotly_white',
+        showlegend=False,
+        height=750,
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False),
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+    return fig
+
+# ----------------------- Streamlit --------------------------------------------
+def mostrar_red_coautoria(rutaWoS=RUTA_PUBLICACIONES):
+    st.title("🕸️ Red de Coautoría")
+
+    aristas = cargar_aristas(RUTA_COAUTORIA, rutaWoS)
+    if aristas.empty:
+        st.write("No hay coautorías para mostrar.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    peso_minimo = col1.slider("Publicaciones en común (mínimo)", 1, max(2, int(aristas['Peso'].max())), 1)
+    grado_minimo = col2.slider("Coautores por autor (mínimo)", 1, 50, 1)
+    maximo_aristas = col3.select_slider("Máximo de aristas", OPCIONES_MAXIMO_ARISTAS, value=5000)
+
+    # Versión de los datos: forma parte de la llave del grafo podado
+    version = tuple(huella_archivo(ruta) if os.path.exists(ruta) else None
+                    for ruta in (RUTA_COAUTORIA, RUTA_POSICIONES_COAUTORIA)) + (huella_dataset(rutaWoS),)
+    posiciones = cargar_posiciones(RUTA_POSICIONES_COAUTORIA, RUTA_COAUTORIA, rutaWoS)
+    G, pos = calcular_red(version, peso_minimo, grado_minimo, maximo_aristas, aristas, posiciones)
+
+    m1, m2 = st.columns(2)
+    m1.metric("Autores", G.number_of_nodes())
+    m2.metric("Coautorías", G.number_of_edges())
+
+    if G.number_of_edges() == 0:
+        st.write("Ninguna coautoría cumple los filtros seleccionados.")
+        return
+    st.plotly_chart(graficar_red(G, pos), use_container_width=True)
+
+    st.write("#### Coautorías más frecuentes")
+    st.dataframe(aristas.head(50), use_container_width=True)
@@ -0,0 +1,127 @@
+import os
+import json
+import glob
+import hashlib
+import logging
+import threading
+import time
+from Menu.utilidades import RUTA_CACHE
+from Menu.datos import cargar_tabla, hash_archivo
+from Menu.snapshots import leer_tabla
+
+# ----------------------- Caché de resultados analíticos -----------------------
+# Los resultados de los análisis de la página de Inicio (Granger, KMeans y
+# Random Forest, con sus figuras en JSON) se guardan en disco por nombre de
+# análisis, parámetros y hash del dataset. Si el dataset cambia se sirve el
+# último resultado guardado mientras se recalcula en un hilo en segundo plano.
+CARPETA_RESULTADOS = os.path.join(RUTA_CACHE, 'resultados')
+
+# Espera antes de reintentar un recálculo fallido (se duplica con cada falla)
+ESPERA_REINTENTO = 60
+ESPERA_MAXIMA = 3600
+
+# Análisis que se están recalculando en este proceso (uno por llave) y recálculos
+# fallidos: llave -> (fallas seguidas, instante desde el que se puede reintentar)
+_en_curso = set()
+_fallidos = {}
+_candado = threading.Lock()
+
+def _llave_parametros(parametros):
+    texto = json.dumps(parametros, sort_keys=True, default=str)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()[:12]
+
+def _ruta_resultado(nombre, parametros, hash_datos):
+    return os.path.join(CARPETA_RESULTADOS, f"{nombre}_{_llave_parametros(parametros)}_{hash_datos[:16]}.json")
+
+def _leer_resultado(ruta):
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _fecha_modificacion(ruta):
+    # Otra sesión puede haber borrado el archivo entre el glob y el stat
+    try:
+        return os.path.getmtime(ruta)
+    except FileNotFoundError:
+        return 0.0
+
+def _ultimo_resultado(nombre, parametros):
+    """Resultado más reciente del análisis con estos parámetros, sin importar la versión del dataset."""
+    patron = os.path.join(CARPETA_RESULTADOS, f"{nombre}_{_llave_parametros(parametros)}_*.json")
+    for ruta in sorted(glob.glob(patron), key=_fecha_modificacion, reverse=True):
+        resultado = _leer_resultado(ruta)
+        if resultado is not None:
+            return resultado
+    return None
+
+def _guardar_resultado(nombre, parametros, hash_datos, resultado):
+    """Guarda el resultado (escritura atómica) y borra los de versiones anteriores del dataset."""
+    ruta = _ruta_resultado(nombre, parametros, hash_datos)
+    os.makedirs(CARPETA_RESULTADOS, exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+    patron = os.path.join(CARPETA_RESULTADOS, f"{nombre}_{_llave_parametros(parametros)}_*.json")
+    for anterior in glob.glob(patron):
+        if anterior != ruta:
+            try:
+                os.remove(anterior)
+            except FileNotFoundError:
+                # Ya lo borró otra sesión o hilo
+                pass
+
+def _recalcular(nombre, calcular, ruta_datos, parametros, hash_datos, llave):
+    try:
+        # Lectura directa: fuera del hilo de la página no hay caché de Streamlit
+        resultado = calcular(leer_tabla(ruta_datos), **parametros)
+        _guardar_resultado(nombre, parametros, hash_datos, resultado)
+        logging.info(f"Resultado de '{nombre}' actualizado para el dataset {hash_datos[:16]}")
+        with _candado:
+            _fallidos.pop(llave, None)
+    except Exception as e:
+        with _candado:
+            fallas = _fallidos.get(llave, (0, 0.0))[0] + 1
+            espera = min(ESPERA_REINTENTO * 2 ** (fallas - 1), ESPERA_MAXIMA)
+            _fallidos[llave] = (fallas, time.monotonic() + espera)
+        logging.error(f"Error recalculando '{nombre}' ({fallas} fallas seguidas, se reintenta en {espera} s): {e}")
+    finally:
+        with _candado:
+            _en_curso.discard(llave)
+
+# Función para obtener el resultado de un análisis desde la caché
+def obtener_resultado(nombre, calcular, ruta_datos, **parametros):
+    """
+    Devuelve (resultado, vigente). calcular(df, **parametros) debe devolver un objeto
+    serializable en JSON. Si no hay resultado para la versión actual del dataset pero
+    sí uno anterior, se devuelve ese (vigente=False) y se recalcula en segundo plano;
+    si no hay ninguno, se calcula en el momento.
+    """
+    hash_datos = hash_archivo(ruta_datos)
+    resultado = _leer_resultado(_ruta_resultado(nombre, parametros, hash_datos))
+    if resultado is not None:
+        return resultado, True
+
+    anterior = _ultimo_resultado(nombre, parametros)
+    if anterior is None:
+        resultado = calcular(cargar_tabla(ruta_datos), **parametros)
+        _guardar_resultado(nombre, parametros, hash_datos, resultado)
+        return resultado, True
+
+    llave = (nombre, _llave_parametros(parametros), hash_datos)
+    with _candado:
+        # No se reintenta un recálculo fallido hasta que pase su espera
+        _, reintento = _fallidos.get(llave, (0, 0.0))
+        iniciar = llave not in _en_curso and time.monotonic() >= reintento
+        if iniciar:
+            _en_curso.add(llave)
+    if iniciar:
+        threading.Thread(
+            target=_recalcular,
+            args=(nombre, calcular, ruta_datos, parametros, hash_datos, llave),
+            daemon=True,
+        ).start()
+    return anterior, False
@@ -0,0 +1,198 @@
+import os
+import logging
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # Sin pyarrow se usa siempre el CSV
+    pa = None
+
+# Configuración de logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# ----------------------- Snapshots columnares ---------------------------------
+# Los CSV de Analisis se convierten a Arrow IPC (sin compresión) en la carpeta
+# 'snapshot' junto al CSV. Los archivos se abren con memory map y solo se
+# materializan las columnas que pide cada página; si no hay snapshot vigente
+# (o no está instalado pyarrow) se lee el CSV.
+CARPETA_SNAPSHOT = 'snapshot'
+EXTENSION_SNAPSHOT = '.arrow'
+
+# Esquema explícito por dataset: las columnas declaradas se convierten a estos
+# tipos; las demás conservan el tipo que infiere pandas al leer el CSV. Las
+# columnas enteras (CVU) se leen como Int64 (entero con nulos) tanto del snapshot
+# como del CSV, para que las llaves de búsqueda sean iguales en los dos casos.
+if pa is not None:
+    _TEXTO = pa.string()
+    _DECIMAL = pa.float64()
+    _ENTERO = pa.int64()
+
+    ESQUEMAS = {
+        'datasetWoS.csv': {
+            'Title': _TEXTO,
+            'Authors': _TEXTO,
+            'Corporate Authors': _TEXTO,
+            'Book Editors': _TEXTO,
+            'Source Title': _TEXTO,
+            'Publication Date': _TEXTO,
+            'Publication Year': _DECIMAL,
+            'Promedio por año': _DECIMAL,
+            'Investigador': _TEXTO,
+        },
+        'datasetSNII.csv': {
+            'CVU': _ENTERO,
+            'NOMBRE DEL INVESTIGADOR': _TEXTO,
+            'NOBILIS': _TEXTO,
+            'NIVEL': _TEXTO,
+            'FECHA DE INICIO DE VIGENCIA': _TEXTO,
+            'FECHA DE FIN DE VIGENCIA': _TEXTO,
+            'INSTITUCIÓN DE ADSCRIPCIÓN': _TEXTO,
+            'DEPENDENCIA': _TEXTO,
+            'ENTIDAD FEDERATIVA': _TEXTO,
+            'PAÍS': _TEXTO,
+            'ÁREA DEL CONOCIMIENTO': _TEXTO,
+            'DISCIPLINA': _TEXTO,
+            'SUBDISCIPLINA': _TEXTO,
+            'ESPECIALIDAD': _TEXTO,
+        },
+        'datasetPatentes.csv': {
+            'inventor_id': _TEXTO,
+            'Inventor': _TEXTO,
+            'NOMBRE_INVENTOR': _TEXTO,
+            'years active': _TEXTO,
+            'Puesto': _TEXTO,
+            'Nacionalidad': _TEXTO,
+        },
+        'Nombres_PxS.csv': {
+            'NOMBRE DEL INVESTIGADOR': _TEXTO,
+            'NOMBRE_INVENTOR': _TEXTO,
+            'NOMBRE SNII': _TEXTO,
+            'CVU': _ENTERO,
+            'inventor_id': _TEXTO,
+        },
+        'analisisEntrenamiento.csv': {
+            'patents': _DECIMAL,
+            'años_patente': _DECIMAL,
+            'prop_coinv_mujeres': _DECIMAL,
+            'h_index': _DECIMAL,
+            'citas_pub': _DECIMAL,
+            'vigencia_años': _DECIMAL,
+            'total_publicaciones': _DECIMAL,
+        },
+    }
+else:
+    ESQUEMAS = {}
+
+# Columnas enteras de cada dataset (sin depender de pyarrow, para el CSV)
+COLUMNAS_ENTERAS = {
+    'datasetSNII.csv': ['CVU'],
+    'Nombres_PxS.csv': ['CVU'],
+}
+
+# Función para obtener la ruta del snapshot de un CSV
+def ruta_snapshot(ruta_csv):
+    carpeta, archivo = os.path.split(ruta_csv)
+    nombre = os.path.splitext(archivo)[0] + EXTENSION_SNAPSHOT
+    return os.path.join(carpeta, CARPETA_SNAPSHOT, nombre)
+
+def snapshot_vigente(ruta_csv):
+    """
+    Indica si existe un snapshot del CSV que corresponda a su versión actual:
+    mismo tamaño de origen y escrito después de la última modificación del CSV.
+    """
+    ruta = ruta_snapshot(ruta_csv)
+    if pa is None or not os.path.exists(ruta):
+        return False
+    try:
+        with pa.memory_map(ruta, 'r') as fuente:
+            metadatos = pa.ipc.open_file(fuente).schema.metadata or {}
+        tamaño_origen = int(metadatos.get(b'tamano_origen', -1))
+    except (pa.ArrowInvalid, OSError, ValueError):
+        return False
+    estado_csv = os.stat(ruta_csv)
+    return tamaño_origen == estado_csv.st_size and os.stat(ruta).st_mtime_ns >= estado_csv.st_mtime_ns
+
+def a_entero(serie):
+    """Convierte una columna a Int64: los valores no numéricos o con decimales quedan nulos."""
+    numeros = pd.to_numeric(serie, errors='coerce')
+    return numeros.where(numeros % 1 == 0).astype('Int64')
+
+def tipar_enteros(df, ruta_csv):
+    """Aplica Int64 a las columnas enteras declaradas del dataset que estén en el DataFrame."""
+    for columna in COLUMNAS_ENTERAS.get(os.path.basename(ruta_csv), []):
+        if columna in df.columns and not isinstance(df[columna].dtype, pd.Int64Dtype):
+            df[columna] = a_entero(df[columna])
+    return df
+
+def _columna_arrow(serie, tipo):
+    """Convierte una columna de pandas a Arrow respetando el tipo declarado."""
+    if tipo is None:
+        try:
+            return pa.array(serie, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Columna con tipos mixtos: se guarda como texto
+            tipo = pa.string()
+    if pa.types.is_string(tipo):
+        serie = serie.where(serie.isna(), serie.astype(str))
+    elif pa.types.is_integer(tipo):
+        serie = a_entero(serie)
+    else:
+        serie = pd.to_numeric(serie, errors='coerce')
+    return pa.array(serie, type=tipo, from_pandas=True)
+
+# Función para construir el snapshot de un CSV
+def construir_snapshot(ruta_csv):
+    """Convierte un CSV a Arrow IPC con el esquema declarado y devuelve la ruta del snapshot."""
+    df = pd.read_csv(ruta_csv, low_memory=False)
+    esquema = ESQUEMAS.get(os.path.basename(ruta_csv), {})
+
+    columnas = [_columna_arrow(df[col], esquema.get(col)) for col in df.columns]
+    metadatos = {'origen': os.path.basename(ruta_csv), 'tamano_origen': str(os.stat(ruta_csv).st_size)}
+    tabla = pa.Table.from_arrays(columnas, names=[str(col) for col in df.columns], metadata=metadatos)
+
+    ruta = ruta_snapshot(ruta_csv)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with pa.OSFile(temporal, 'wb') as destino:
+        with pa.ipc.new_file(destino, tabla.schema) as escritor:
+            escritor.write_table(tabla)
+    os.replace(temporal, ruta)
+    return ruta
+
+# Función para leer un dataset (snapshot o CSV)
+def leer_tabla(ruta_csv, columnas=None):
+    """
+    Lee un dataset de Analisis. Usa el snapshot Arrow con memory map si está vigente
+    y, si no, el CSV. 'columnas' limita la lectura a esas columnas (las que no
+    existan se ignoran).
+    """
+    if snapshot_vigente(ruta_csv):
+        # El memory map se mantiene abierto mientras existan buffers que lo usen
+        tabla = pa.ipc.open_file(pa.memory_map(ruta_snapshot(ruta_csv), 'r')).read_all()
+        if columnas is not None:
+            tabla = tabla.select([col for col in columnas if col in tabla.schema.names])
+        return tipar_enteros(tabla.to_pandas(), ruta_csv)
+
+    if columnas is not None:
+        seleccion = set(columnas)
+        return tipar_enteros(pd.read_csv(ruta_csv, usecols=lambda col: col in seleccion, low_memory=False), ruta_csv)
+    return tipar_enteros(pd.read_csv(ruta_csv, low_memory=False), ruta_csv)
+
+# ----------------------- Paso de construcción ---------------------------------
+def main(carpeta='Analisis'):
+    if pa is None:
+        logging.error("pyarrow no está instalado; no se pueden generar los snapshots.")
+        return
+    for archivo in ESQUEMAS:
+        ruta_csv = os.path.join(carpeta, archivo)
+        if not os.path.exists(ruta_csv):
+            logging.warning(f"No se encontró {ruta_csv}, se omite.")
+            continue
+        if snapshot_vigente(ruta_csv):
+            logging.info(f"Snapshot vigente para {archivo}.")
+            continue
+        logging.info(f"Generando snapshot de {archivo}...")
+        logging.info(f"Snapshot guardado en {construir_snapshot(ruta_csv)}")
+
+if __name__ == "__main__":
+    main()
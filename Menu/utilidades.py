@@ -1,9 +1,14 @@
 import os
-import re
-import unicodedata
+import json
+import hashlib
+import numpy as np
 import pandas as pd
+import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
+from Menu.snapshots import leer_tabla
+from Menu.validacion import diagnosticar_archivos
+import Limpieza.Normalizacion as normalizacion
 
 # ----------------------- Ruta App ---------------------------------------------
 RUTA_BRUTOS  = '/mount/src/snii-insight/Autores WoS'
@@ -13,6 +18,12 @@ RUTA_SNII  = 'Analisis/datasetSNII.csv'
 RUTA_PATENTES  = 'Analisis/datasetPatentes.csv'
 RUTA_MAESTRO  = 'Analisis/Nombres_PxS.csv'
 RUTA_ANALISIS = 'Analisis/analisisEntrenamiento.csv'
+RUTA_CACHE = 'Analisis/cache'
+RUTA_METRICAS = 'Analisis/metricasAutores.csv'
+RUTA_MANIFIESTO = 'Analisis/cache/validacion_archivos.json'
+RUTA_VISTAS = 'Analisis/cache/vistas_investigadores.json'
+RUTA_COAUTORIA = 'Analisis/aristasCoautoria.csv'
+RUTA_POSICIONES_COAUTORIA = 'Analisis/posicionesCoautoria.csv'
 # ----------------------- Ruta GitHub ------------------------------------------
 # RUTA_BRUTOS  = 'Autores WoS'
 # RUTA_GUARDADO  = 'Autores WoS Limpios'
@@ -22,57 +33,80 @@ RUTA_ANALISIS = 'Analisis/analisisEntrenamiento.csv'
 # RUTA_MAESTRO  = 'Analisis/Nombres_PxS.csv'
 # RUTA_PUBLICACIONES_KERAS = 'Analisis/Entrena_Publicaciones.keras'
 # RUTA_ANALISIS = 'Analisis/analisisEntrenamiento.csv'
+# RUTA_CACHE = 'Analisis/cache'
+# RUTA_METRICAS = 'Analisis/metricasAutores.csv'
+# RUTA_MANIFIESTO = 'Analisis/cache/validacion_archivos.json'
+# RUTA_VISTAS = 'Analisis/cache/vistas_investigadores.json'
+# RUTA_COAUTORIA = 'Analisis/aristasCoautoria.csv'
+# RUTA_POSICIONES_COAUTORIA = 'Analisis/posicionesCoautoria.csv'
 # -------------------------------------------------------------------------------
 
 # ----------------------- Funciones --------------------------------------------
 # Función para calcular el índice h
 def calcular_indice_h(df):
-    # Ordenar las publicaciones por número de citas en orden descendente
-    citas = df['Total Citations'].sort_values(ascending=False).values
-    h_index = 0
-
-    # Calcular el índice h
-    for i, c in enumerate(citas):
-        if c >= i + 1:
-            h_index = i + 1
-        else:
-            break
-    return h_index
+    # Ordenar las publicaciones por número de citas en orden descendente (sin contar las que no tienen dato)
+    citas = df['Total Citations'].to_numpy(dtype=float)
+    citas = np.sort(citas[~np.isnan(citas)])[::-1]
+
+    # Calcular el índice h: publicaciones con citas >= su posición (la condición es monótona)
+    return int(np.count_nonzero(citas >= np.arange(1, len(citas) + 1)))
 
 # Función para graficar citas y publicaciones por año
-def graficar_citas_publicaciones_comparados(df):
-    df['Year'] = df['Publication Date'].apply(lambda x: re.search(
-        r'\d{4}', str(x)).group() if re.search(r'\d{4}', str(x)) else None)
-    df = df[df['Year'].notna()].copy()
-    df['Year'] = df['Year'].astype(int)
-    publicaciones_por_año = df.groupby('Year').size()
-    citas_por_año = df.groupby('Year')['Total de Citas'].sum()
-
-    #anos = sorted(publicaciones_por_año.index)
-    max_publicaciones = publicaciones_por_año.max()
-    max_citas = citas_por_año.max()
+def pivote_publicaciones_citas(df, columna='Investigador'):
+    """
+    Construye en una sola pasada las tablas (columna × año) de publicaciones y de
+    citas. El año sale de 'Publication Year' o, si falta, del primer número de
+    cuatro dígitos de 'Publication Date'.
+    """
+    años = pd.to_numeric(df['Publication Date'].astype(str).str.extract(r'(\d{4})', expand=False), errors='coerce')
+    if 'Publication Year' in df.columns:
+        años = pd.to_numeric(df['Publication Year'], errors='coerce').fillna(años)
+    datos = pd.DataFrame({
+        columna: df[columna].to_numpy(),
+        'Year': años.to_numpy(),
+        'Total de Citas': pd.to_numeric(df['Total de Citas'], errors='coerce').fillna(0).to_numpy(),
+    }).dropna(subset=[columna, 'Year'])
+    datos['Year'] = datos['Year'].astype(int)
 
-    fig = go.Figure()
-    for autor in df['Investigador'].unique():
-        df_autor = df[df['Investigador'] == autor]
+    agregado = datos.groupby([columna, 'Year'])['Total de Citas'].agg(['size', 'sum'])
+    publicaciones = agregado['size'].unstack(fill_value=0)
+    citas = agregado['sum'].unstack(fill_value=0)
+    return publicaciones, citas
 
-        publicaciones_por_año = df_autor.groupby('Year').size()
-        citas_por_año = df_autor.groupby('Year')['Total de Citas'].sum()
+def graficar_citas_publicaciones_comparados(publicaciones, citas):
+    """
+    Gráfica comparativa a partir de las tablas de pivote_publicaciones_citas (una fila
+    por investigador o institución). Usa trazos WebGL (Scattergl) para que sigan
+    siendo fluidos con cientos de series.
+    """
+    años = publicaciones.columns.to_numpy()
+    max_publicaciones = publicaciones.to_numpy().max(initial=0)
+    max_citas = citas.to_numpy().max(initial=0)
+    colores = px.colors.qualitative.Plotly
 
-        # Agregar las barras para las publicaciones por autor (Eje izquierdo)
-        fig.add_trace(go.Bar(
-            x=publicaciones_por_año.index,
-            y=publicaciones_por_año,
+    fig = go.Figure()
+    for i, autor in enumerate(publicaciones.index):
+        color = colores[i % len(colores)]
+
+        # Publicaciones por autor (Eje izquierdo)
+        fig.add_trace(go.Scattergl(
+            x=años,
+            y=publicaciones.iloc[i].to_numpy(),
+            mode='lines+markers',
             name=f'Publications ({autor})',
+            legendgroup=str(autor),
+            line=dict(color=color),
             yaxis='y1'
         ))
 
-        # Agregar la línea para las citas por autor (Eje derecho)
-        fig.add_trace(go.Scatter(
-            x=citas_por_año.index,
-            y=citas_por_año,
-            mode='lines+markers',
+        # Citas por autor (Eje derecho)
+        fig.add_trace(go.Scattergl(
+            x=años,
+            y=citas.iloc[i].to_numpy(),
+            mode='lines',
             name=f'Times Cited ({autor})',
+            legendgroup=str(autor),
+            line=dict(color=color, dash='dot'),
             yaxis='y2'
         ))
 
@@ -87,7 +121,7 @@ def graficar_citas_publicaciones_comparados(df):
                     y=0.5, xanchor="left", x=1.1)
     )
 
-    st.plotly_chart(fig)
+    return fig
 
 def procesar_autores(df, cantidad_autores, fecha_inicio, fecha_fin):
     # Filtrar por rango de fechas
@@ -121,33 +155,106 @@ def procesar_autores(df, cantidad_autores, fecha_inicio, fecha_fin):
 
     return df_final
 
-def procesar_archivos(carpeta):
-    correctos = 0
-    incorrectos = 0
-    archivos_incorrectos = []
+# Funciones para el manifiesto de validación (persistente entre reinicios)
+def leer_manifiesto(ruta):
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def guardar_manifiesto(manifiesto, ruta):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+def hash_contenido(ruta):
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
 
-    for filename in os.listdir(carpeta):
+def procesar_archivos(carpeta, ruta_manifiesto=RUTA_MANIFIESTO):
+    """
+    Cuenta los archivos correctos e incorrectos de la carpeta. Cada resultado se guarda
+    en un manifiesto con la ruta, tamaño, mtime y hash del archivo, de modo que solo
+    se vuelven a validar los archivos nuevos o modificados (en paralelo, con el motor
+    de Menu.validacion). Devuelve los diagnósticos de los archivos con error.
+    """
+    manifiesto = leer_manifiesto(ruta_manifiesto)
+    prefijo = os.path.abspath(carpeta) + os.sep
+    vistos = []
+    pendientes = {}
+    modificado = False
+
+    for filename in sorted(os.listdir(carpeta)):
         if filename.endswith(".txt"):
             ruta_archivo = os.path.join(carpeta, filename)
+            llave = os.path.abspath(ruta_archivo)
+            vistos.append(llave)
+            estado = os.stat(ruta_archivo)
+            entrada = manifiesto.get(llave)
+
+            # Mismo tamaño y mtime: se reutiliza el resultado sin leer el archivo
+            if entrada and 'tipo' in entrada and entrada['tamano'] == estado.st_size and entrada['mtime_ns'] == estado.st_mtime_ns:
+                continue
+            sha = hash_contenido(ruta_archivo)
+            if entrada and 'tipo' in entrada and entrada['sha256'] == sha:
+                # Solo cambió el mtime pero no el contenido: tampoco se vuelve a validar
+                entrada.update(tamano=estado.st_size, mtime_ns=estado.st_mtime_ns)
+                modificado = True
+            else:
+                pendientes[llave] = {'tamano': estado.st_size, 'mtime_ns': estado.st_mtime_ns, 'sha256': sha}
+
+    # Los archivos nuevos o modificados se validan en un solo lote
+    if pendientes:
+        for llave, diagnostico in zip(pendientes, diagnosticar_archivos(list(pendientes))):
+            manifiesto[llave] = {
+                **pendientes[llave],
+                'correcto': diagnostico['correcto'],
+                'tipo': diagnostico['tipo'],
+                'detalle': diagnostico['detalle'],
+                'linea': diagnostico['linea'],
+            }
+        modificado = True
+
+    # Quitar del manifiesto los archivos de esta carpeta que ya no existen
+    existentes = set(vistos)
+    for llave in [l for l in manifiesto if l.startswith(prefijo) and l not in existentes]:
+        del manifiesto[llave]
+        modificado = True
+
+    if modificado:
+        guardar_manifiesto(manifiesto, ruta_manifiesto)
 
-            try:
-                pd.read_csv(ruta_archivo, sep=',', quotechar='"', engine='python')
-                correctos += 1
-            except Exception:
-                incorrectos += 1
-                archivos_incorrectos.append(filename)
+    correctos = 0
+    archivos_incorrectos = []
+    for llave in vistos:
+        entrada = manifiesto[llave]
+        if entrada['correcto']:
+            correctos += 1
+        else:
+            archivos_incorrectos.append({
+                'archivo': os.path.basename(llave),
+                'tipo': entrada['tipo'],
+                'detalle': entrada['detalle'],
+                'linea': entrada['linea'],
+            })
 
-    return correctos, incorrectos, archivos_incorrectos
+    return correctos, len(archivos_incorrectos), archivos_incorrectos
 
 def procesar_estadisticas_autores(ruta_final):
-    data = pd.read_csv(ruta_final)
+    data = leer_tabla(ruta_final)
     year_columns = [col for col in data.columns if col.isdigit()]
     data['Sum Of Times Cited'] = data[year_columns].fillna(0).sum(axis=1)
-    publications_per_author = data.groupby('Authors')['Title'].count().reset_index()
-    publications_per_author.columns = ['Authors', 'Publications']
-    citations_per_author = data.groupby('Authors')['Sum Of Times Cited'].sum().reset_index()
-    author_stats = pd.merge(publications_per_author, citations_per_author, on='Authors')
-    author_stats = author_stats[author_stats['Authors'].notna()]
+    # Publicaciones y citas por autor en una sola agregación
+    author_stats = data.groupby('Authors').agg(**{
+        'Publications': ('Title', 'count'),
+        'Sum Of Times Cited': ('Sum Of Times Cited', 'sum'),
+    }).reset_index()
     return author_stats
 
 # Función para procesar los autores y reemplazar
@@ -169,47 +276,34 @@ def procesar_autores_brutos(df, nombre_archivo):
 
 # Función para limpiar texto
 def limpiar_texto(texto):
-    texto = unicodedata.normalize('NFKD', texto)
-    texto = ''.join(c for c in texto if not unicodedata.combining(c))
-    texto = ''.join(c for c in texto if c.isprintable())
-    texto = re.sub(r'\d+', '', texto)
-    texto = ' '.join(word for word in re.sub(
-        r'\s+', ' ', texto).strip().split() if len(word) > 1)
-    return texto
-
-# Crea un objeto Scatter de Plotly para los nodos del grafo.
+    # Implementación compartida con la limpieza de datos (con caché)
+    return normalizacion.limpiar_texto(texto)
+
+# Crea un objeto Scatter (WebGL) de Plotly para los nodos del grafo.
 def create_node_trace(G, pos, node_colors, node_size=10):
-    x_nodes = []
-    y_nodes = []
-    node_texts = []
-    for node in G.nodes():
-        x, y = pos[node]
-        x_nodes.append(x)
-        y_nodes.append(y)
-        node_texts.append(node)
-    return go.Scatter(
-        x=x_nodes,
-        y=y_nodes,
+    nodos = list(G.nodes())
+    coordenadas = np.array([pos[node] for node in nodos], dtype=float).reshape(-1, 2)
+    return go.Scattergl(
+        x=coordenadas[:, 0],
+        y=coordenadas[:, 1],
         mode='markers',
         marker=dict(size=node_size, color=node_colors,
                     line=dict(width=1, color='black')),
-        hovertext=node_texts,
+        hovertext=[str(node) for node in nodos],
         hoverinfo='text'
     )
 
-# Crea un objeto Scatter de Plotly para las aristas (conexiones) del grafo.
+# Crea un objeto Scatter (WebGL) de Plotly para las aristas (conexiones) del grafo.
 def create_edge_trace(G, pos, edge_color='gray'):
-    edge_x = []
-    edge_y = []
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
-    return go.Scatter(
+    # Una fila por arista: x0, y0, x1, y1; cada segmento se separa con NaN
+    extremos = np.array([(*pos[u], *pos[v]) for u, v in G.edges()], dtype=float).reshape(-1, 4)
+    separador = np.full(len(extremos), np.nan)
+    edge_x = np.column_stack([extremos[:, 0], extremos[:, 2], separador]).ravel()
+    edge_y = np.column_stack([extremos[:, 1], extremos[:, 3], separador]).ravel()
+    return go.Scattergl(
         x=edge_x,
         y=edge_y,
         mode='lines',
         line=dict(width=0.5, color=edge_color),
         hoverinfo='none'
-    )
\ No newline at end of file
+    )
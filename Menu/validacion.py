@@ -0,0 +1,158 @@
+import io
+import os
+import re
+import csv
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Configuración de logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# ----------------------- Validación de exportaciones WoS ----------------------
+# Motor de validación de los .txt exportados de WoS. Primero revisa el preámbulo,
+# el encabezado y el número de columnas con las primeras líneas (falla rápido) y
+# solo después recorre el archivo completo con el lector csv de la biblioteca
+# estándar. Con muchos archivos se reparte el trabajo en un pool de procesos.
+# Las reglas reproducen lo que acepta pd.read_csv(engine='python').
+
+# Tipos de error de los diagnósticos
+ERROR_CODIFICACION = 'codificacion'
+ERROR_VACIO = 'vacio'
+ERROR_PREAMBULO = 'preambulo'
+ERROR_ENCABEZADO = 'encabezado'
+ERROR_COMILLAS = 'comillas'
+ERROR_COLUMNAS = 'columnas'
+ERROR_LECTURA = 'lectura'
+
+# Segunda línea del preámbulo de WoS ("Período de tiempo: 1900-2025.")
+PATRON_PREAMBULO = re.compile(r'^\s*(Per\S{1,3}odo de tiempo|Time ?span)\s*:', re.IGNORECASE)
+BYTES_ENCABEZADO = 64 * 1024
+MINIMO_PARALELO = 32
+
+def _diagnostico(ruta, tipo=None, detalle='', linea=None, columnas=None, preambulo=False):
+    return {
+        'archivo': os.path.basename(ruta),
+        'ruta': ruta,
+        'correcto': tipo is None,
+        'tipo': tipo,
+        'detalle': detalle,
+        'linea': linea,
+        'columnas': columnas,
+        'preambulo': preambulo,
+    }
+
+def detectar_preambulo(lineas):
+    """Número de líneas de preámbulo (autor, periodo y líneas en blanco) antes del encabezado."""
+    if len(lineas) >= 2 and PATRON_PREAMBULO.match(lineas[1]):
+        saltar = 2
+        while saltar < len(lineas) and not lineas[saltar].strip():
+            saltar += 1
+        return saltar
+    return 0
+
+def _decodificar(ruta, datos):
+    try:
+        return datos.decode('utf-8-sig'), None
+    except UnicodeDecodeError as e:
+        linea = datos[:e.start].count(b'\n') + 1
+        return None, _diagnostico(ruta, ERROR_CODIFICACION,
+                                  f"Byte no válido en UTF-8 en la posición {e.start}", linea)
+
+# Función para validar un archivo
+def diagnosticar_archivo(ruta, permitir_preambulo=False, columnas_esperadas=None):
+    """
+    Valida una exportación WoS y devuelve su diagnóstico (dict). Con permitir_preambulo
+    se aceptan las exportaciones sin limpiar (dos líneas de autor y periodo antes del
+    encabezado); columnas_esperadas exige que el encabezado contenga esas columnas.
+    """
+    try:
+        with open(ruta, 'rb') as f:
+            inicio = f.read(BYTES_ENCABEZADO)
+            resto = f.read()
+    except OSError as e:
+        return _diagnostico(ruta, ERROR_LECTURA, str(e))
+
+    # --- Revisión rápida: preámbulo y encabezado con las primeras líneas ---
+    completo = not resto
+    muestra = inicio if completo else inicio[:inicio.rfind(b'\n') + 1]
+    texto_muestra, error = _decodificar(ruta, muestra)
+    if error:
+        return error
+    lineas = texto_muestra.splitlines()
+    saltar = detectar_preambulo(lineas)
+    if saltar and not permitir_preambulo:
+        return _diagnostico(ruta, ERROR_PREAMBULO, "El archivo conserva el preámbulo de la exportación WoS",
+                            1, preambulo=True)
+
+    # El encabezado es la primera línea no vacía después del preámbulo
+    no_vacias = (linea for linea in lineas[saltar:] if linea.strip())
+    encabezado = next(csv.reader(no_vacias), None)
+    if not encabezado:
+        return _diagnostico(ruta, ERROR_VACIO, "Sin encabezado ni columnas", saltar + 1, preambulo=bool(saltar))
+    if columnas_esperadas:
+        faltantes = [col for col in columnas_esperadas if col not in encabezado]
+        if faltantes:
+            return _diagnostico(ruta, ERROR_ENCABEZADO, f"Faltan columnas: {faltantes}", saltar + 1,
+                                len(encabezado), bool(saltar))
+
+    # --- Revisión completa: comillas y número de columnas por fila ---
+    texto, error = (texto_muestra, None) if completo else _decodificar(ruta, inicio + resto)
+    if error:
+        return error
+    lector = csv.reader(io.StringIO(texto, newline=''), strict=True)
+    esperadas = None
+    vio_encabezado = False
+    try:
+        for numero, fila in enumerate(lector, start=1):
+            if numero <= saltar or not fila:
+                continue
+            if not vio_encabezado:
+                vio_encabezado = True
+                continue
+            if esperadas is None:
+                # Como pandas: si la primera fila trae columnas de más se usan como índice
+                esperadas = max(len(encabezado), len(fila))
+            elif len(fila) > esperadas:
+                return _diagnostico(ruta, ERROR_COLUMNAS,
+                                    f"Se esperaban {esperadas} columnas y la línea {lector.line_num} tiene {len(fila)}",
+                                    lector.line_num, len(encabezado), bool(saltar))
+    except csv.Error as e:
+        return _diagnostico(ruta, ERROR_COMILLAS, f"Comillas mal formadas: {e}", lector.line_num,
+                            len(encabezado), bool(saltar))
+
+    return _diagnostico(ruta, columnas=len(encabezado), preambulo=bool(saltar))
+
+def _diagnosticar_argumentos(argumentos):
+    ruta, permitir_preambulo, columnas_esperadas = argumentos
+    return diagnosticar_archivo(ruta, permitir_preambulo, columnas_esperadas)
+
+# Función para validar varios archivos en paralelo
+def diagnosticar_archivos(rutas, procesos=None, permitir_preambulo=False, columnas_esperadas=None):
+    """Valida una lista de archivos y devuelve sus diagnósticos en el mismo orden."""
+    argumentos = [(ruta, permitir_preambulo, columnas_esperadas) for ruta in rutas]
+    if len(argumentos) < MINIMO_PARALELO or procesos == 1:
+        return [_diagnosticar_argumentos(arg) for arg in argumentos]
+
+    procesos = procesos or os.cpu_count() or 1
+    tamaño_lote = max(1, len(argumentos) // (procesos * 4))
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return list(pool.map(_diagnosticar_argumentos, argumentos, chunksize=tamaño_lote))
+
+def diagnosticar_carpeta(carpeta, procesos=None, permitir_preambulo=False, columnas_esperadas=None):
+    """Valida todos los .txt de una carpeta."""
+    rutas = [os.path.join(carpeta, f) for f in sorted(os.listdir(carpeta)) if f.endswith(".txt")]
+    return diagnosticar_archivos(rutas, procesos, permitir_preambulo, columnas_esperadas)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valida una carpeta de exportaciones WoS.")
+    parser.add_argument('carpeta', help="Carpeta con los .txt exportados de WoS.")
+    parser.add_argument('--procesos', type=int, default=None, help="Número de procesos (por defecto, todos los núcleos).")
+    parser.add_argument('--preambulo', action='store_true', help="Aceptar exportaciones que conservan el preámbulo.")
+    args = parser.parse_args()
+
+    diagnosticos = diagnosticar_carpeta(args.carpeta, args.procesos, args.preambulo)
+    errores = [d for d in diagnosticos if not d['correcto']]
+    logging.info(f"Archivos correctos: {len(diagnosticos) - len(errores)}, con error: {len(errores)}")
+    for d in errores:
+        logging.warning(f"{d['archivo']} [{d['tipo']}] línea {d['linea']}: {d['detalle']}")
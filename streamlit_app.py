@@ -2,6 +2,8 @@
 from Menu.utilidades import RUTA_PUBLICACIONES, RUTA_ANALISIS
 from Menu.inicio import mostrar_inicio
 from Menu.buscarInvestigador import mostrar_buscar_investigador
+from Menu.compararInvestigadores import mostrar_comparar_investigadores
+from Menu.redCoautoria import mostrar_red_coautoria
 import time
 # Librerías de visualización
 import streamlit as st
@@ -17,8 +19,8 @@ with st.sidebar:
 
     selected = option_menu(
         "Menú",
-        options=["Inicio", "Información por Investigador"],
-        icons=['house', 'search'],
+        options=["Inicio", "Información por Investigador", "Comparar Investigadores", "Red de Coautoría"],
+        icons=['house', 'search', 'bar-chart-line', 'diagram-3'],
         menu_icon="clipboard-data-fill",
         default_index=0
     )
@@ -31,4 +33,10 @@ elif selected == "Información por Investigador":
     # Mostrar el mensaje en el contenedor
     st.toast("Has seleccionado Información por Investigador")
     mostrar_buscar_investigador(RUTA_PUBLICACIONES)
+elif selected == "Comparar Investigadores":
+    st.toast("Has seleccionado Comparar Investigadores")
+    mostrar_comparar_investigadores(RUTA_PUBLICACIONES)
+elif selected == "Red de Coautoría":
+    st.toast("Has seleccionado Red de Coautoría")
+    mostrar_red_coautoria(RUTA_PUBLICACIONES)
 # -------------------------------------------------------------------------------
\ No newline at end of file
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from rapidfuzz import fuzz
+from Limpieza import Agrupamiento
+
+NOMBRES = [
+    "GARCIA LOPEZ, JUAN", "GARCIA LOPES, JUAN", "GARCIA LOPEZ, JUAN CARLOS", "MARTINEZ RUIZ, ANA",
+    "MARTINES RUIZ, ANA", "MARTINEZ, ANA", "PEREZ SOTO, LUIS", "PERES SOTO, LUIS", "LOPEZ GARCIA, JUAN",
+    "HERNANDEZ, MARIA", "HERNANDES, MARIA", "HERNANDEZ DIAZ, MARIA", "GARCIA LOPEZ, JUAN",
+]
+
+
+def test_grafo_guardado_sirve_para_umbrales_mayores(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "grafo.parquet")
+    Agrupamiento.obtener_grafo(NOMBRES, 70, ruta, bloqueo=False)
+
+    def sin_construir(*args, **kwargs):
+        raise AssertionError("no debe reconstruirse el grafo")
+
+    construir = Agrupamiento.construir_grafo
+    monkeypatch.setattr(Agrupamiento, "construir_grafo", sin_construir)
+    for umbral in (70, 80, 90):
+        grafo = Agrupamiento.obtener_grafo(NOMBRES, umbral, ruta, bloqueo=False)
+        esperado = construir(NOMBRES, umbral, bloqueo=False)
+        pd.testing.assert_frame_equal(grafo, esperado)
+
+    # Un umbral menor, otros nombres u otro bloqueo sí reconstruyen
+    for argumentos in ((NOMBRES, 60, ruta, False), (NOMBRES[:-2], 80, ruta, False), (NOMBRES, 80, ruta, True)):
+        with pytest.raises(AssertionError):
+            Agrupamiento.obtener_grafo(*argumentos)
+
+
+def test_version_de_llaves_en_la_huella(monkeypatch):
+    huella = Agrupamiento._huella_nombres(NOMBRES, True)
+    assert Agrupamiento._huella_nombres(NOMBRES, False) != huella
+    monkeypatch.setattr(Agrupamiento, "VERSION_LLAVES", Agrupamiento.VERSION_LLAVES + 1)
+    assert Agrupamiento._huella_nombres(NOMBRES, True) != huella
+
+
+def agrupar_referencia(nombres, umbral):
+    """Regla original de LimpiezaNombresFinal: cada nombre se une a la primera clave con similitud >= umbral."""
+    claves, etiquetas = [], []
+    for nombre in nombres:
+        for etiqueta, clave in enumerate(claves):
+            if fuzz.ratio(nombre, clave) >= umbral:
+                etiquetas.append(etiqueta)
+                break
+        else:
+            etiquetas.append(len(claves))
+            claves.append(nombre)
+    return etiquetas
+
+
+def nombres_aleatorios(cantidad, semilla):
+    rng = np.random.default_rng(semilla)
+    apellidos = ["GARCIA", "GARSIA", "LOPEZ", "LOPES", "MARTINEZ", "MARTINES", "PEREZ", "RUIZ", "DIAZ", "SOTO"]
+    nombres = ["JUAN", "ANA", "LUIS", "MARIA", "JOSE", "CARLOS"]
+    return [f"{rng.choice(apellidos)} {rng.choice(apellidos)} {rng.choice(nombres)}"[:rng.integers(8, 30)]
+            for _ in range(cantidad)]
+
+
+@pytest.mark.parametrize("umbral", [70, 75, 85, 90])
+@pytest.mark.parametrize("nombres", [NOMBRES, nombres_aleatorios(150, 0), nombres_aleatorios(150, 1)])
+def test_agrupar_igual_a_la_regla_de_lideres(nombres, umbral):
+    etiquetas = Agrupamiento.agrupar(nombres, umbral)
+    assert list(etiquetas) == agrupar_referencia(nombres, umbral)
+
+
+def test_recall_de_aristas_con_bloqueo(caplog):
+    caplog.set_level("INFO")
+    nombres = nombres_aleatorios(150, 2)
+    unicos = list(dict.fromkeys(nombres))
+    reporte = Agrupamiento.registrar_recall_aristas(unicos, 75, Agrupamiento.IndiceBloqueo(unicos))
+    assert "Recall de las aristas" in caplog.text
+    # Con la muestra completa los pares exhaustivos son las aristas sin bloqueo (contadas desde los dos extremos)
+    assert reporte["pares_exhaustivos"] == 2 * len(Agrupamiento.aristas_similitud(unicos, 75))
+    assert reporte["pares_bloqueo"] == 2 * len(Agrupamiento.aristas_similitud(unicos, 75, bloqueo=True))
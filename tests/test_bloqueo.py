@@ -0,0 +1,59 @@
+from rapidfuzz import fuzz, process
+from Limpieza import Bloqueo
+
+CANDIDATOS = [
+    "GARCIA LOPEZ JUAN", "LOPEZ GARCIA JUAN", "MARTINEZ RUIZ ANA", "MARTINEZALEJANDRO",
+    "PEREZ SOTO LUIS", "HERNANDEZ DIAZ MARIA", "GARCIA LOPEZ JUANA", "RUIZ MARTINEZ ANA",
+]
+CONSULTAS = [
+    "GARCIA LOPES JUAN", "JUAN GARCIA LOPEZ", "MARTINEZ ALEJANDRO", "RUIS MARTINEZ ANA",
+    "PERES SOTO LUIS", "DIAZ HERNANDEZ MARIA", "XAVIER QUINTERO", "GARCIA LOPES JUAN",
+    # Con bloqueo encuentra otro candidato: no cuenta para el recall
+    "GARCIA MARTINEZ RUIZ",
+]
+
+
+def test_recall_cuenta_el_mismo_candidato():
+    umbral = 70
+    indice = Bloqueo.IndiceBloqueo(CANDIDATOS)
+    total = mismos = 0
+    for consulta in dict.fromkeys(CONSULTAS):
+        exhaustivo = process.extractOne(consulta, CANDIDATOS, scorer=fuzz.ratio, score_cutoff=umbral)
+        if exhaustivo is None:
+            continue
+        total += 1
+        posiciones = indice.candidatos_de(consulta)
+        bloqueado = process.extractOne(consulta, [CANDIDATOS[p] for p in posiciones], scorer=fuzz.ratio,
+                                       score_cutoff=umbral)
+        mismos += bloqueado is not None and posiciones[bloqueado[2]] == exhaustivo[2]
+
+    reporte = Bloqueo.reporte_recall(CONSULTAS, CANDIDATOS, umbral)
+    assert reporte["consultas"] == len(set(CONSULTAS))
+    assert reporte["coincidencias_exhaustivas"] == total
+    assert reporte["coincidencias_bloqueo"] == mismos
+    assert reporte["recall"] == mismos / total
+    assert 0 < mismos < total
+
+
+def test_cli_normaliza_como_limpieza_nombres(tmp_path):
+    ruta = tmp_path / "nombres.csv"
+    ruta.write_text("NOMBRE DEL INVESTIGADOR\n\"Garcia Lopez,Juan\"\n\n\" perez, ana \"\n", encoding="utf-8")
+    assert Bloqueo._leer_nombres(str(ruta)) == ["GARCIA LOPEZ JUAN", "PEREZ  ANA"]
+
+
+def test_buscar_coincidencias_con_bloqueo_registra_el_recall(caplog):
+    caplog.set_level("INFO")
+    exhaustivo = Bloqueo.buscar_coincidencias(CONSULTAS, CANDIDATOS, 70)
+    bloqueado = Bloqueo.buscar_coincidencias(CONSULTAS, CANDIDATOS, 70, bloqueo=True)
+    assert "Recall del bloqueo" in caplog.text
+    mismos = exhaustivo[0] == bloqueado[0]
+    # Solo la consulta sin bloque en común con su mejor candidato cambia
+    assert [consulta for consulta, igual in zip(CONSULTAS, mismos) if not igual] == ["GARCIA MARTINEZ RUIZ"]
+
+
+def test_muestra_de_consultas():
+    consultas = [f"N{i % 500}" for i in range(2000)]
+    muestra = Bloqueo.muestra_consultas(consultas, 100)
+    assert len(muestra) == len(set(muestra)) == 100
+    assert muestra[0] == "N0" and muestra[-1] == "N499"
+    assert Bloqueo.muestra_consultas(consultas[:10], 100) == consultas[:10]
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from rapidfuzz import fuzz, process
+from Limpieza import Coincidencias
+from Limpieza.Coincidencias import mejores_coincidencias, nombres_sin_coincidencia
+
+CANDIDATOS = ["GARCIA LOPEZ JUAN", "GARCIA LOPEZ JUAN", "LOPEZ GARCIA JUAN", "MARTINEZ RUIZ ANA",
+              "PEREZ SOTO LUIS", "HERNANDEZ DIAZ MARIA", "GARCIA LOPEZ JUANA"]
+CONSULTAS = ["GARCIA LOPES JUAN", "MARTINES RUIZ ANA", "XAVIER QUINTERO", "GARCIA LOPES JUAN",
+             "HERNANDEZ MARIA", "", "GARCIA LOPEZ JUANA"]
+
+
+@pytest.mark.parametrize("umbral", [0, 60, 85, 100])
+@pytest.mark.parametrize("lote", [Coincidencias.MAXIMO_CELDAS, len(CANDIDATOS) * 2])
+def test_igual_a_extract_one(umbral, lote, monkeypatch):
+    # Con un lote pequeño las consultas se reparten en varias matrices
+    monkeypatch.setattr(Coincidencias, "MAXIMO_CELDAS", lote)
+    indices, puntajes = mejores_coincidencias(CONSULTAS, CANDIDATOS, umbral)
+    for consulta, indice, puntaje in zip(CONSULTAS, indices, puntajes):
+        esperado = process.extractOne(consulta, CANDIDATOS, scorer=fuzz.ratio, score_cutoff=umbral)
+        if esperado is None:
+            assert indice == -1 and puntaje == 0
+        else:
+            assert indice == esperado[2]
+            assert np.isclose(puntaje, esperado[1])
+
+
+def test_sin_candidatos_y_sin_coincidencia():
+    indices, puntajes = mejores_coincidencias(CONSULTAS, [], 50)
+    assert (indices == -1).all() and (puntajes == 0).all()
+    assert nombres_sin_coincidencia(CONSULTAS, CANDIDATOS, 85) == [
+        consulta for consulta in CONSULTAS
+        if process.extractOne(consulta, CANDIDATOS, scorer=fuzz.ratio, score_cutoff=85) is None]
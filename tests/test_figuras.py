@@ -0,0 +1,31 @@
+import pandas as pd
+import plotly.graph_objs as go
+from Menu.figuras import CacheFiguras
+
+
+def perfil(puntos):
+    return {"tabla": pd.DataFrame({"x": range(puntos)}),
+            "figuras": {"citas": go.Figure(go.Bar(x=list(range(puntos)), y=list(range(puntos))))}}
+
+
+def test_guarda_las_figuras_construidas():
+    cache = CacheFiguras()
+    guardado = perfil(10)
+    cache.guardar(("A", 1), guardado)
+    # Se devuelve el mismo objeto: no se vuelve a procesar JSON en cada render
+    assert cache.obtener(("A", 1))["figuras"]["citas"] is guardado["figuras"]["citas"]
+    assert cache.obtener(("B", 1)) is None
+
+
+def test_desaloja_los_menos_usados():
+    tamaño = CacheFiguras._tamaño(perfil(50))
+    cache = CacheFiguras(maximo_bytes=int(tamaño * 2.5))
+    cache.guardar("a", perfil(50))
+    cache.guardar("b", perfil(50))
+    cache.obtener("a")
+    cache.guardar("c", perfil(50))
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.bytes == 2 * tamaño
+    # Reemplazar una entrada no cuenta su tamaño dos veces
+    cache.guardar("a", perfil(50))
+    assert len(cache) == 2 and cache.bytes == 2 * tamaño
@@ -0,0 +1,52 @@
+import os
+import glob
+from datetime import datetime
+import pytest
+from openpyxl import Workbook
+from Limpieza.LimpiezaColumnas import convertir_archivo, convertir_archivo_streaming
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _convertir_ambos(ruta_excel, año, carpeta):
+    """Convierte con pandas y en streaming; devuelve el contenido (bytes) de los dos CSV."""
+    ruta_pandas = os.path.join(carpeta, "pandas.csv")
+    ruta_streaming = os.path.join(carpeta, "streaming.csv")
+    convertir_archivo(ruta_excel, año, ruta_pandas)
+    convertir_archivo_streaming(ruta_excel, año, ruta_streaming)
+    with open(ruta_pandas, "rb") as f_pandas, open(ruta_streaming, "rb") as f_streaming:
+        return f_pandas.read(), f_streaming.read()
+
+
+def test_streaming_igual_a_pandas(tmp_path):
+    libro = Workbook()
+    hoja = libro.active
+    hoja.append(["CVU", "NOMBRE DEL INVESTIGADOR", "EMÉRITO", "FECHA DE INICIO DE VIGENCIA",
+                 "FECHA DE FIN DE VIGENCIA", "REGISTRO", "DISCIPLINA", "NIVEL"])
+    hoja.append([1, "PEREZ, ANA", "SI", datetime(2014, 1, 2), datetime(2028, 12, 31),
+                 datetime(2015, 3, 1, 10, 30), "FISICA", 1.0])
+    hoja.append([2, "LOPEZ, LUIS", None, datetime(2016, 1, 1), datetime(2999, 12, 31),
+                 datetime(2015, 3, 1), "NA", 2.5])
+    hoja.append([None] * 8)
+    hoja.append([3, "DIAZ, EVA", None, None, datetime(2024, 12, 31),
+                 datetime(2015, 3, 2, 8, 0, 0, 500000), "N/A", None])
+    hoja.append([None] * 8)
+    ruta = tmp_path / "Investigadores_vigentes_2016.xlsx"
+    libro.save(ruta)
+
+    pandas_csv, streaming_csv = _convertir_ambos(str(ruta), 2016, str(tmp_path))
+    assert streaming_csv == pandas_csv
+
+
+def _workbook_real():
+    """El padrón más pequeño del repositorio (si está descargado y no es un puntero de git-lfs)."""
+    archivos = [ruta for ruta in glob.glob(os.path.join(RAIZ, "dataset", "*.xlsx")) if os.path.getsize(ruta) > 1024]
+    return min(archivos, key=os.path.getsize) if archivos else None
+
+
+@pytest.mark.skipif(_workbook_real() is None, reason="No hay padrones en dataset/")
+def test_streaming_igual_a_pandas_en_padron_real(tmp_path):
+    ruta = _workbook_real()
+    año = int(os.path.basename(ruta).split("_")[-1].split(".")[0])
+    pandas_csv, streaming_csv = _convertir_ambos(ruta, año, str(tmp_path))
+    assert streaming_csv == pandas_csv
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+from Limpieza import LimpiezaDatos
+
+
+@pytest.fixture
+def rutas(tmp_path, monkeypatch):
+    carpeta = tmp_path / "datasetMD"
+    carpeta.mkdir()
+    monkeypatch.setitem(LimpiezaDatos.CONFIG, "directorio_datasets", str(carpeta))
+    monkeypatch.setitem(LimpiezaDatos.CONFIG, "archivo_salida", str(tmp_path / "datasetMD.parquet"))
+    return carpeta
+
+
+def test_columnas_fuera_del_esquema_se_conservan(rutas):
+    pd.DataFrame({"AÑO": ["2020"], "CVU": ["123"], "NOMBRE DEL INVESTIGADOR": ["GARCIA,JUAN"],
+                  "NIVEL": ["1"]}).to_csv(rutas / "2020.csv", index=False, encoding="utf-8-sig")
+    pd.DataFrame({"AÑO": ["2021", "2021"], "CVU": ["-", "456"], "NOMBRE DEL INVESTIGADOR": ["PEREZ,ANA", "GARCIA,JUAN"],
+                  "CORREO": ["ana@x.mx", None]}).to_csv(rutas / "2021.csv", index=False, encoding="utf-8-sig")
+
+    nombres = LimpiezaDatos.combinar_archivos()
+    assert sorted(nombres["NOMBRE DEL INVESTIGADOR"]) == ["GARCIA,JUAN", "PEREZ,ANA"]
+
+    combinado = LimpiezaDatos.leer_combinado()
+    assert list(combinado.columns) == LimpiezaDatos.ESQUEMA_COMBINADO.names + ["CORREO"]
+    assert combinado["CORREO"].tolist() == [None, "ana@x.mx", None]
+    assert combinado["CVU"].tolist() == [123, pd.NA, 456]
+    assert str(combinado["CVU"].dtype) == "Int64"
+
+
+def test_tipar_bloque_no_omite_columnas():
+    bloque = pd.DataFrame({"AÑO": ["2020"], "CORREO": ["a@x.mx"]})
+    with pytest.raises(ValueError):
+        LimpiezaDatos.tipar_bloque(bloque)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Menu.utilidades import calcular_indice_h
+from Menu.metricasAutores import calcular_metricas
+
+
+def indice_h_referencia(citas):
+    """Cálculo original: recorrer las citas ordenadas de mayor a menor (NaN al final)."""
+    h = 0
+    for i, c in enumerate(pd.Series(citas, dtype=float).sort_values(ascending=False).values):
+        if c >= i + 1:
+            h = i + 1
+        else:
+            break
+    return h
+
+
+@pytest.mark.parametrize("citas, esperado", [
+    ([10, np.nan, 5, 3], 3),
+    ([np.nan, np.nan], 0),
+    ([], 0),
+    ([0, 0, 1], 1),
+    ([25, 8, 5, 3, 3], 3),
+    ([4, 4, 4, 4, np.nan, 4], 4),
+])
+def test_indice_h(citas, esperado):
+    df = pd.DataFrame({"Total Citations": pd.Series(citas, dtype=float)})
+    assert calcular_indice_h(df) == esperado == indice_h_referencia(citas)
+
+
+def test_indice_h_por_lotes_igual_al_individual():
+    rng = np.random.default_rng(0)
+    filas = []
+    for autor in range(30):
+        for _ in range(rng.integers(0, 15)):
+            citas = float(rng.integers(0, 20)) if rng.random() > 0.15 else np.nan
+            filas.append({"Investigador": f"AUTOR {autor}", "Title": "T", "Publication Year": 2010,
+                          "Total de Citas": citas, "Promedio por año": 1.0})
+    df = pd.DataFrame(filas)
+    metricas = calcular_metricas(df)
+    for autor, grupo in df.groupby("Investigador"):
+        individual = calcular_indice_h(pd.DataFrame({"Total Citations": grupo["Total de Citas"]}))
+        assert metricas.loc[autor, "Índice h"] == individual == indice_h_referencia(grupo["Total de Citas"])
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Limpieza.Perfil import perfilar_columna
+
+
+def tipos_referencia(valores):
+    """Conteo de tipos celda por celda (sin nulos)."""
+    conteo = {}
+    for valor in valores:
+        if not pd.isna(valor):
+            conteo[type(valor).__name__] = conteo.get(type(valor).__name__, 0) + 1
+    return conteo
+
+
+@pytest.mark.parametrize("valores", [
+    [1, 1.0, True],
+    [1, 1.0, True, "1", 1, 1],
+    [0, False, 0.0, None, "0"],
+    ["a", "b", 3, np.nan],
+    [2.5, 1, 1, 2.5],
+])
+def test_tipos_mixtos_sin_colapsar(valores):
+    perfil = perfilar_columna(pd.Series(valores, dtype=object))
+    assert perfil["tipos"] == tipos_referencia(valores)
+    assert perfil["tipos_mixtos"]
+
+
+def test_columnas_homogeneas():
+    perfil = perfilar_columna(pd.Series(["1", "x", None, "2"], dtype=object))
+    assert perfil["tipos"] == {"str": 3}
+    assert not perfil["tipos_mixtos"]
+    assert perfil["numeros_en_texto"] == 2
+    assert perfil["nulos"] == 1
+
+    perfil = perfilar_columna(pd.Series([1, 2, 2, None], dtype="Int64"))
+    assert perfil["tipos"] == {"int": 3}
+    assert perfil["cardinalidad"] == 2
+
+
+def test_categorica_mixta():
+    serie = pd.Series(pd.Categorical([1, "1", 1, None]))
+    perfil = perfilar_columna(serie)
+    assert perfil["tipos"] == {"int": 2, "str": 1}
+    assert perfil["numeros_en_texto"] == 1
@@ -0,0 +1,129 @@
+import os
+import pytest
+from Limpieza.Pipeline import Etapa, seleccionar, planear, ejecutar, EJECUTAR, AL_DIA, PENDIENTE, NO_SELECCIONADA
+
+
+# Las funciones de las etapas se ejecutan en otro proceso: deben estar a nivel de módulo
+def copiar(entrada, salida, registro, nombre, fallar=False):
+    with open(registro, "a", encoding="utf-8") as f:
+        f.write(f"{nombre}\n")
+    if fallar:
+        raise RuntimeError("falla de prueba")
+    with open(entrada, encoding="utf-8") as f:
+        contenido = f.read()
+    with open(salida, "w", encoding="utf-8") as f:
+        f.write(contenido.upper())
+
+
+def no_escribir(entrada, salida, registro, nombre):
+    with open(registro, "a", encoding="utf-8") as f:
+        f.write(f"{nombre}\n")
+
+
+@pytest.fixture
+def carpeta(tmp_path):
+    (tmp_path / "entrada.txt").write_text("hola", encoding="utf-8")
+    return tmp_path
+
+
+def etapas(carpeta, fallar=None, funcion_c=copiar):
+    """a: entrada → a; b: a → b; c: entrada → c (independiente de a y b)."""
+    ruta = lambda nombre: str(carpeta / nombre)
+    definicion = [("a", "entrada.txt", "a.txt", copiar), ("b", "a.txt", "b.txt", copiar),
+                  ("c", "entrada.txt", "c.txt", funcion_c)]
+    resultado = []
+    for nombre, entrada, salida, funcion in definicion:
+        parametros = {"entrada": ruta(entrada), "salida": ruta(salida), "registro": ruta("registro.txt"), "nombre": nombre}
+        if nombre == fallar:
+            parametros["fallar"] = True
+        resultado.append(Etapa(nombre, funcion, entradas=[ruta(entrada)], salidas=[ruta(salida)], parametros=parametros))
+    return resultado
+
+
+def ejecutadas(carpeta):
+    """Etapas ejecutadas desde la última llamada (y vacía el registro)."""
+    registro = carpeta / "registro.txt"
+    if not registro.exists():
+        return []
+    nombres = registro.read_text(encoding="utf-8").split()
+    registro.unlink()
+    return sorted(nombres)
+
+
+def correr(carpeta, seleccion=None, forzar=False, **kwargs):
+    lista = etapas(carpeta, **kwargs)
+    seleccion = seleccionar(lista) if seleccion is None else seleccion
+    return ejecutar(lista, seleccion, jobs=2, forzar=forzar, ruta_manifiesto=str(carpeta / "manifiesto.json"))
+
+
+def test_omite_etapas_al_dia(carpeta):
+    assert correr(carpeta) == []
+    assert ejecutadas(carpeta) == ["a", "b", "c"]
+    assert (carpeta / "b.txt").read_text(encoding="utf-8") == "HOLA"
+
+    manifiesto = str(carpeta / "manifiesto.json")
+    assert set(planear(etapas(carpeta), {"a", "b", "c"}, ruta_manifiesto=manifiesto).values()) == {AL_DIA}
+    assert correr(carpeta) == []
+    assert ejecutadas(carpeta) == []
+
+    # Si cambia la entrada se ejecutan todas; si cambia una salida, solo su etapa
+    (carpeta / "entrada.txt").write_text("adiós", encoding="utf-8")
+    assert planear(etapas(carpeta), {"a", "b", "c"}, ruta_manifiesto=manifiesto) == {
+        "a": EJECUTAR, "b": PENDIENTE, "c": EJECUTAR}
+    assert correr(carpeta) == []
+    assert ejecutadas(carpeta) == ["a", "b", "c"]
+    (carpeta / "b.txt").write_text("editado", encoding="utf-8")
+    assert correr(carpeta) == []
+    assert ejecutadas(carpeta) == ["b"]
+
+    # Si una etapa se ejecuta pero su salida no cambia, las siguientes se omiten
+    assert correr(carpeta, seleccion={"a"}, forzar=True) == []
+    assert ejecutadas(carpeta) == ["a"]
+    assert correr(carpeta) == []
+    assert ejecutadas(carpeta) == []
+
+
+def test_desde_selecciona_la_etapa_y_sus_dependientes(carpeta):
+    lista = etapas(carpeta)
+    assert seleccionar(lista, desde="a") == {"a", "b"}
+    assert seleccionar(lista, desde="b") == {"b"}
+    assert seleccionar(lista, solo=["a", "c"], desde="a") == {"a"}
+    with pytest.raises(ValueError):
+        seleccionar(lista, desde="z")
+
+    correr(carpeta)
+    ejecutadas(carpeta)
+    manifiesto = str(carpeta / "manifiesto.json")
+    assert planear(lista, seleccionar(lista, desde="a"), forzar=True, ruta_manifiesto=manifiesto) == {
+        "a": EJECUTAR, "b": PENDIENTE, "c": NO_SELECCIONADA}
+    assert correr(carpeta, seleccion=seleccionar(lista, desde="a"), forzar=True) == []
+    assert ejecutadas(carpeta) == ["a", "b"]
+
+
+def test_una_falla_detiene_sus_dependientes(carpeta):
+    assert correr(carpeta, fallar="a") == ["a", "b"]
+    # b no se ejecuta; c no depende de a y sí se ejecuta
+    assert ejecutadas(carpeta) == ["a", "c"]
+    assert not (carpeta / "b.txt").exists()
+
+    # Las etapas con error no quedan en el manifiesto: se vuelven a ejecutar
+    assert correr(carpeta) == []
+    assert ejecutadas(carpeta) == ["a", "b"]
+
+
+def test_salidas_faltantes_son_error(carpeta):
+    assert correr(carpeta, funcion_c=no_escribir) == ["c"]
+    assert ejecutadas(carpeta) == ["a", "b", "c"]
+    assert correr(carpeta, funcion_c=no_escribir) == ["c"]
+    assert ejecutadas(carpeta) == ["c"]
+
+
+def test_bloqueo_en_las_etapas_de_comparacion():
+    from Menu.mainLimpieza import crear_etapas
+    comparacion = {"nombres", "nombres_final", "union_preliminar", "union_final"}
+    for bloqueo in (None, True, False):
+        for etapa in crear_etapas(bloqueo):
+            if bloqueo is None or etapa.nombre not in comparacion:
+                assert "bloqueo" not in etapa.parametros
+            else:
+                assert etapa.parametros["bloqueo"] is bloqueo
@@ -0,0 +1,54 @@
+import os
+import time
+import pytest
+from Menu import resultados
+
+
+@pytest.fixture
+def carpeta(tmp_path, monkeypatch):
+    monkeypatch.setattr(resultados, "CARPETA_RESULTADOS", str(tmp_path))
+    monkeypatch.setattr(resultados, "_fallidos", {})
+    monkeypatch.setattr(resultados, "_en_curso", set())
+    return tmp_path
+
+
+def test_borrar_anteriores_tolera_archivos_ya_borrados(carpeta, monkeypatch):
+    resultados._guardar_resultado("kmeans", {"k": 3}, "a" * 64, {"v": 1})
+    borrado = str(carpeta / "kmeans_borrado.json")
+    glob_original = resultados.glob.glob
+    monkeypatch.setattr(resultados.glob, "glob", lambda patron: glob_original(patron) + [borrado])
+    resultados._guardar_resultado("kmeans", {"k": 3}, "b" * 64, {"v": 2})
+    assert [os.path.basename(r) for r in glob_original(str(carpeta / "*.json"))] == [
+        os.path.basename(resultados._ruta_resultado("kmeans", {"k": 3}, "b" * 64))]
+
+
+def test_recalculo_fallido_espera_antes_de_reintentar(carpeta, monkeypatch):
+    resultados._guardar_resultado("kmeans", {}, "a" * 64, {"v": 1})
+    monkeypatch.setattr(resultados, "hash_archivo", lambda ruta: "b" * 64)
+    monkeypatch.setattr(resultados, "leer_tabla", lambda ruta: None)
+    llamadas = []
+
+    def calcular(df):
+        llamadas.append(1)
+        raise RuntimeError("falla de prueba")
+
+    def esperar_hilos():
+        for _ in range(200):
+            if not resultados._en_curso:
+                return
+            time.sleep(0.01)
+
+    for _ in range(3):
+        assert resultados.obtener_resultado("kmeans", calcular, "datos.csv") == ({"v": 1}, False)
+        esperar_hilos()
+    assert len(llamadas) == 1
+    llave = ("kmeans", resultados._llave_parametros({}), "b" * 64)
+    assert resultados._fallidos[llave][0] == 1
+
+    # Pasada la espera se reintenta y la siguiente espera es el doble
+    resultados._fallidos[llave] = (1, 0.0)
+    resultados.obtener_resultado("kmeans", calcular, "datos.csv")
+    esperar_hilos()
+    fallas, reintento = resultados._fallidos[llave]
+    assert len(llamadas) == 2 and fallas == 2
+    assert reintento - time.monotonic() > resultados.ESPERA_REINTENTO
@@ -0,0 +1,25 @@
+import pandas as pd
+import pytest
+from Menu import snapshots
+from Menu.indices import normalizar_llave
+
+
+@pytest.mark.skipif(snapshots.pa is None, reason="pyarrow no está instalado")
+def test_cvu_entero_en_snapshot_y_csv(tmp_path):
+    ruta = tmp_path / "Nombres_PxS.csv"
+    pd.DataFrame({
+        "NOMBRE DEL INVESTIGADOR": ["A", "B", "C"],
+        "NOMBRE SNII": ["A", "B", "C"],
+        "CVU": [123.0, None, 456.0],
+    }).to_csv(ruta, index=False)
+
+    desde_csv = snapshots.leer_tabla(str(ruta))
+    snapshots.construir_snapshot(str(ruta))
+    assert snapshots.snapshot_vigente(str(ruta))
+    desde_snapshot = snapshots.leer_tabla(str(ruta))
+
+    for df in (desde_csv, desde_snapshot):
+        assert isinstance(df["CVU"].dtype, pd.Int64Dtype)
+    # Las llaves de búsqueda son las mismas sin importar de dónde se leyó la tabla
+    assert normalizar_llave(desde_csv["CVU"]).tolist() == normalizar_llave(desde_snapshot["CVU"]).tolist()
+    assert normalizar_llave(desde_csv["CVU"]).tolist()[0] == "123"
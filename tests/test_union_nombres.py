@@ -0,0 +1,14 @@
+import pandas as pd
+import pytest
+from Limpieza.UnionNombres import asignar_investigadores
+
+
+@pytest.mark.parametrize("bloqueo", [False, True])
+@pytest.mark.parametrize("dtype", [object, "category"])
+def test_asignar_investigadores(dtype, bloqueo):
+    dataset = pd.DataFrame({"NOMBRE DEL INVESTIGADOR": pd.Series(
+        ["GARCIA LOPEZ, JUAN", "GARCIA LOPES, JUAN", None, "PEREZ, ANA", "GARCIA LOPEZ, JUAN"], dtype=dtype)})
+    limpios = pd.DataFrame({"NOMBRE DEL INVESTIGADOR": ["GARCIA LOPEZ, JUAN", "MARTINEZ, LUIS"]})
+    resultado = asignar_investigadores(dataset, limpios, bloqueo=bloqueo)
+    assert resultado["INVESTIGADOR"].tolist() == [
+        "GARCIA LOPEZ, JUAN", "GARCIA LOPEZ, JUAN", "", "", "GARCIA LOPEZ, JUAN"]